@@ -1,15 +1,333 @@
 #!/usr/bin/env python3
 
 import os
+import re
 import json
+import time
+import filecmp
+import hashlib
+import importlib
+import zipfile
+import shutil
+import sqlite3
 import subprocess
+import unicodedata
 import argparse
 from pathlib import Path
 from enum import Enum
+from typing import Any
+from collections import defaultdict
+from xml.etree import ElementTree
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 HOME_USER = os.path.expanduser("~")
 BIBLIOTECA_JSON = os.path.join(HOME_USER, ".config", "biblioteca_cli_config", "biblioteca_cli.json")
 CONFIG_FILE_PATH = os.path.join(HOME_USER, ".config", "biblioteca_cli_config", "biblioteca_cli_config.json")
+BIBLIOTECA_DB = os.path.join(HOME_USER, ".config", "biblioteca_cli_config", "biblioteca_cli.db")
+
+# Columnas de la tabla libros, con los mismos nombres que Libro.convertir_a_dict
+COLUMNAS_LIBRO = ["titulo", "autor", "genero", "anio_publicacion", "idioma", "estado", "abspath", "descripcion", "lo_leo_por", "prioridad"]
+
+# Columnas con los datos del archivo de cada libro (ver datos_archivo)
+COLUMNAS_ARCHIVO = ["tamano", "mtime", "hash"]
+
+# Migraciones del esquema en orden; PRAGMA user_version guarda cuántas se aplicaron
+MIGRACIONES = [
+    # 1: tabla de libros con índices para los filtros de `listar` (sin distinguir mayúsculas)
+    """
+    CREATE TABLE libros (
+        id INTEGER PRIMARY KEY,
+        titulo TEXT NOT NULL COLLATE NOCASE,
+        autor TEXT COLLATE NOCASE,
+        genero TEXT COLLATE NOCASE,
+        anio_publicacion TEXT,
+        idioma TEXT,
+        estado TEXT COLLATE NOCASE,
+        abspath TEXT,
+        descripcion TEXT,
+        lo_leo_por TEXT,
+        prioridad TEXT COLLATE NOCASE
+    );
+    CREATE INDEX idx_libros_titulo ON libros (titulo);
+    CREATE INDEX idx_libros_autor ON libros (autor);
+    CREATE INDEX idx_libros_genero ON libros (genero);
+    CREATE INDEX idx_libros_estado ON libros (estado);
+    CREATE INDEX idx_libros_prioridad ON libros (prioridad);
+    """,
+    # 2: clave normalizada del título (sin mayúsculas ni tildes) para buscar un libro en una sola consulta
+    """
+    ALTER TABLE libros ADD COLUMN titulo_clave TEXT;
+    UPDATE libros SET titulo_clave = normalizar_titulo(titulo);
+    DROP INDEX idx_libros_titulo;
+    CREATE INDEX idx_libros_titulo_clave ON libros (titulo_clave);
+    """,
+    # 3: índice invertido (FTS5) de los campos de texto y del contenido de cada PDF
+    """
+    CREATE VIRTUAL TABLE libros_fts USING fts5(
+        titulo, autor, descripcion, lo_leo_por, contenido,
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+    INSERT INTO libros_fts (rowid, titulo, autor, descripcion, lo_leo_por, contenido)
+        SELECT id, titulo, autor, descripcion, lo_leo_por, '' FROM libros;
+
+    -- Archivo del que salió el texto indexado de cada libro, para no extraerlo dos veces
+    CREATE TABLE textos_pdf (
+        libro_id INTEGER PRIMARY KEY,
+        ruta TEXT NOT NULL,
+        mtime REAL NOT NULL,
+        tamano INTEGER NOT NULL,
+        extractor TEXT NOT NULL
+    );
+
+    CREATE TRIGGER libros_fts_insertar AFTER INSERT ON libros BEGIN
+        INSERT INTO libros_fts (rowid, titulo, autor, descripcion, lo_leo_por, contenido)
+            VALUES (new.id, new.titulo, new.autor, new.descripcion, new.lo_leo_por, '');
+    END;
+    CREATE TRIGGER libros_fts_modificar AFTER UPDATE OF titulo, autor, descripcion, lo_leo_por ON libros BEGIN
+        UPDATE libros_fts SET titulo = new.titulo, autor = new.autor,
+            descripcion = new.descripcion, lo_leo_por = new.lo_leo_por
+            WHERE rowid = new.id;
+    END;
+    CREATE TRIGGER libros_fts_eliminar AFTER DELETE ON libros BEGIN
+        DELETE FROM libros_fts WHERE rowid = old.id;
+        DELETE FROM textos_pdf WHERE libro_id = old.id;
+    END;
+    """,
+    # 4: tamaño, fecha de modificación y huella de cada archivo, para detectar duplicados
+    """
+    ALTER TABLE libros ADD COLUMN tamano INTEGER;
+    ALTER TABLE libros ADD COLUMN mtime REAL;
+    ALTER TABLE libros ADD COLUMN hash TEXT;
+    CREATE INDEX idx_libros_hash ON libros (hash);
+    CREATE INDEX idx_libros_abspath ON libros (abspath);
+    """,
+    # 5: directorios que revisa `verificar` y la huella de cada archivo encontrado en ellos
+    """
+    CREATE TABLE raices (
+        ruta TEXT PRIMARY KEY
+    );
+    CREATE TABLE archivos (
+        ruta TEXT PRIMARY KEY,
+        tamano INTEGER NOT NULL,
+        mtime REAL NOT NULL,
+        hash TEXT NOT NULL
+    );
+    """,
+    # 6: autor y género plegados en Python; COLLATE NOCASE solo ignora mayúsculas ASCII ("Ángel" != "ángel")
+    """
+    ALTER TABLE libros ADD COLUMN autor_clave TEXT;
+    ALTER TABLE libros ADD COLUMN genero_clave TEXT;
+    UPDATE libros SET autor_clave = plegar(autor), genero_clave = plegar(genero);
+    DROP INDEX idx_libros_autor;
+    DROP INDEX idx_libros_genero;
+    CREATE INDEX idx_libros_autor_clave ON libros (autor_clave);
+    CREATE INDEX idx_libros_genero_clave ON libros (genero_clave);
+    """,
+]
+
+# Columnas de filtro que se comparan por su clave plegada (ver plegar)
+COLUMNAS_PLEGADAS = {"autor": "autor_clave", "genero": "genero_clave"}
+
+# Peso de cada columna de libros_fts en el ranking BM25 (titulo, autor, descripcion, lo_leo_por, contenido)
+PESOS_BUSQUEDA = (10.0, 5.0, 3.0, 3.0, 1.0)
+
+# Extracciones de texto de PDF simultáneas (cada una es un proceso pdftotext)
+HILOS_EXTRACCION = os.cpu_count() or 4
+
+# Formatos que `importar` reconoce
+EXTENSIONES_LIBRO = (".pdf", ".epub")
+
+# La huella de un archivo lee tres bloques (inicio, mitad y final) en lugar del archivo entero
+BLOQUE_HUELLA = 64 * 1024
+
+# Espacios de nombres del paquete OPF de un EPUB
+NS_EPUB = {
+    "container": "urn:oasis:names:tc:opendocument:xmlns:container",
+    "opf": "http://www.idpf.org/2007/opf",
+    "dc": "http://purl.org/dc/elements/1.1/",
+}
+
+def normalizar_titulo(titulo: str) -> str:
+    """
+    Clave de búsqueda de un título: sin tildes, sin mayúsculas y con los
+    espacios como guiones bajos, igual que los guarda `agregar`.
+    "Cien Años de Soledad" -> "cien_anos_de_soledad"
+    """
+    descompuesto = unicodedata.normalize("NFKD", titulo)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return "_".join(sin_tildes.casefold().replace("_", " ").split())
+
+def plegar(texto: str | None) -> str | None:
+    """
+    Clave de un filtro sin mayúsculas en cualquier alfabeto, como el .lower()
+    que usaba la biblioteca en JSON. Las tildes sí cuentan: "Ángel" -> "ángel".
+    """
+    return texto.casefold() if texto is not None else None
+
+def modulo_pypdf():
+    """ Módulo pypdf si está instalado, o None: es una dependencia opcional. """
+    try:
+        return importlib.import_module("pypdf")
+    except ImportError:
+        return None
+
+def extraer_texto_pdf(ruta: str) -> tuple[str, str] | None:
+    """
+    Extrae el texto de un PDF con `pdftotext` (poppler) o, si no está
+    instalado, con la librería pypdf. Devuelve (texto, extractor), o None si
+    no hay ningún extractor disponible.
+    """
+    if shutil.which("pdftotext"):
+        resultado = subprocess.run(["pdftotext", "-q", "-enc", "UTF-8", ruta, "-"], capture_output=True, stdin=subprocess.DEVNULL)
+        if resultado.returncode == 0:
+            return resultado.stdout.decode("utf-8", errors="replace"), "pdftotext"
+        return "", "error"
+
+    pypdf = modulo_pypdf()
+    if pypdf is None:
+        return None
+
+    try:
+        lector = pypdf.PdfReader(ruta)
+        return "\n".join(pagina.extract_text() or "" for pagina in lector.pages), "pypdf"
+    except Exception:
+        return "", "error"
+
+def hay_extractor_pdf() -> bool:
+    """ Indica si está instalado pdftotext o pypdf. """
+    return shutil.which("pdftotext") is not None or modulo_pypdf() is not None
+
+def huella_archivo(ruta: str, tamano: int) -> str:
+    """
+    Huella BLAKE2 del contenido de un archivo a partir de tres bloques de
+    muestra y del tamaño: distingue libros distintos sin leer cientos de MB.
+    Los archivos pequeños se leen enteros.
+    """
+    huella = hashlib.blake2b(str(tamano).encode(), digest_size=16)
+    with open(ruta, "rb") as archivo:
+        if tamano <= 3 * BLOQUE_HUELLA:
+            huella.update(archivo.read())
+        else:
+            for posicion in (0, tamano // 2, tamano - BLOQUE_HUELLA):
+                archivo.seek(posicion)
+                huella.update(archivo.read(BLOQUE_HUELLA))
+    return huella.hexdigest()
+
+def mismo_contenido(ruta: str, otras: list[str], tamano: int) -> bool:
+    """
+    Confirma byte a byte que `ruta` es igual a alguno de los archivos con su
+    misma huella. Si la huella se calculó con el archivo entero no hace falta
+    releerlo; si ninguno de los otros se puede leer, no se da por duplicado.
+    """
+    if tamano <= 3 * BLOQUE_HUELLA:
+        return True
+    for otra in otras:
+        try:
+            if filecmp.cmp(ruta, otra, shallow=False):
+                return True
+        except OSError:
+            continue
+    return False
+
+def agrupar_por_contenido(rutas: list[str], tamano: int) -> list[list[str]]:
+    """
+    Reparte archivos con la misma huella en grupos de contenido idéntico,
+    confirmado byte a byte con `mismo_contenido`. Un archivo que no se puede
+    leer queda en un grupo propio.
+    """
+    grupos: list[list[str]] = []
+    for ruta in rutas:
+        for grupo in grupos:
+            if mismo_contenido(ruta, grupo[:1], tamano):
+                grupo.append(ruta)
+                break
+        else:
+            grupos.append([ruta])
+    return grupos
+
+def datos_archivo(ruta: str) -> dict[str, int | float | str]:
+    """ Tamaño, fecha de modificación y huella de un archivo (columnas COLUMNAS_ARCHIVO). """
+    datos = os.stat(ruta)
+    return {"tamano": datos.st_size, "mtime": datos.st_mtime, "hash": huella_archivo(ruta, datos.st_size)}
+
+def anio_de(texto: str | None) -> str | None:
+    """ Primer año plausible dentro de una fecha de metadatos ("D:20170912...", "2017-09-12"). """
+    encontrado = re.search(r"(1[5-9]\d\d|20\d\d)", texto or "")
+    return encontrado.group(1) if encontrado else None
+
+def metadatos_pdf(ruta: str) -> dict[str, str | None]:
+    """ Título, autor, año e idioma de un PDF con pypdf o, si no está instalado, con `pdfinfo`. """
+    pypdf = modulo_pypdf()
+    if pypdf is not None:
+        lector = pypdf.PdfReader(ruta)
+        info = lector.metadata or {}
+        idioma = lector.trailer["/Root"].get("/Lang")
+        return {
+            "titulo": str(info.get("/Title") or ""),
+            "autor": str(info.get("/Author") or "") or None,
+            "anio_publicacion": anio_de(str(info.get("/CreationDate") or "")),
+            "idioma": str(idioma) if idioma else None,
+        }
+
+    if shutil.which("pdfinfo"):
+        resultado = subprocess.run(["pdfinfo", "-enc", "UTF-8", ruta], capture_output=True, stdin=subprocess.DEVNULL)
+        campos = {}
+        for linea in resultado.stdout.decode("utf-8", errors="replace").splitlines():
+            clave, _, valor = linea.partition(":")
+            campos[clave.strip()] = valor.strip()
+        return {
+            "titulo": campos.get("Title"),
+            "autor": campos.get("Author") or None,
+            "anio_publicacion": anio_de(campos.get("CreationDate")),
+            "idioma": None,
+        }
+
+    return {}
+
+def metadatos_epub(ruta: str) -> dict[str, str | None]:
+    """ Título, autor, año e idioma del paquete OPF de un EPUB (solo biblioteca estándar). """
+    with zipfile.ZipFile(ruta) as epub:
+        contenedor = ElementTree.fromstring(epub.read("META-INF/container.xml"))
+        raiz = contenedor.find(".//container:rootfile", NS_EPUB)
+        opf = raiz.get("full-path") if raiz is not None else None
+        if not opf:
+            raise ValueError(f"{ruta}: META-INF/container.xml no indica el paquete OPF")
+        metadatos = ElementTree.fromstring(epub.read(opf)).find("opf:metadata", NS_EPUB)
+
+    def campo(nombre: str) -> str | None:
+        elemento = metadatos.find(f"dc:{nombre}", NS_EPUB) if metadatos is not None else None
+        return elemento.text.strip() if elemento is not None and elemento.text else None
+
+    return {
+        "titulo": campo("title"),
+        "autor": campo("creator"),
+        "anio_publicacion": anio_de(campo("date")),
+        "idioma": campo("language"),
+    }
+
+def leer_archivo_libro(ruta: str) -> dict[str, Any]:
+    """
+    Datos de un archivo para `importar`: metadatos del PDF/EPUB y huella.
+    Se ejecuta en un proceso aparte; un archivo dañado no detiene la importación.
+    Los campos que el archivo no trae quedan vacíos ("") y no None, que
+    `listar` e `info` mostrarían tal cual.
+    """
+    libro: dict[str, Any] = {columna: "" for columna in COLUMNAS_LIBRO}
+    libro.update(abspath=ruta, **datos_archivo(ruta))
+    try:
+        metadatos = metadatos_epub(ruta) if ruta.lower().endswith(".epub") else metadatos_pdf(ruta)
+    except Exception:
+        metadatos = {}
+
+    titulo = (metadatos.get("titulo") or "").strip() or Path(ruta).stem
+    libro.update({clave: valor for clave, valor in metadatos.items() if valor})
+    libro["titulo"] = titulo.lower().replace(" ", "_")
+    return libro
+
+def consulta_fts(texto: str) -> str:
+    """ Convierte lo que escribe el usuario en una consulta FTS5 segura: todas las palabras, entre comillas. """
+    palabras = [palabra.replace('"', '""') for palabra in texto.split()]
+    return " ".join(f'"{palabra}"' for palabra in palabras)
 
 class EstadoLibro(Enum):
     LEIDO = "leido"
@@ -83,13 +401,75 @@ class Libro:
         }
 
 class Biblioteca:
+    """
+    Colección de libros guardada en SQLite.
+
+    Cada libro es una fila de la tabla `libros`, con índices sobre titulo,
+    autor, genero, estado y prioridad: agregar, modificar o eliminar toca solo
+    una fila y los filtros de `listar` son búsquedas en índice, en lugar de
+    leer y reescribir un JSON con toda la biblioteca en cada comando.
+    """
 
-    def __init__(self, nombre: str):
+    def __init__(self, nombre: str, ruta_db: str = BIBLIOTECA_DB):
         self._nombre = nombre
-        self._libros: list[dict[str, str]] = self.cargar_libros()
+        self._ruta_db = ruta_db
+        self._conexion: sqlite3.Connection | None = None
+
+    @property
+    def conexion(self) -> sqlite3.Connection:
+        # La base de datos se abre la primera vez que se usa, no al importar
+        if self._conexion is None:
+            self._conexion = self.abrir_base_de_datos()
+        return self._conexion
+
+    def abrir_base_de_datos(self) -> sqlite3.Connection:
+        """ Abre la base de datos, aplica las migraciones y migra el JSON antiguo una sola vez. """
+        es_nueva = not os.path.exists(self._ruta_db)
+        os.makedirs(os.path.dirname(self._ruta_db), exist_ok=True)
+
+        conexion = sqlite3.connect(self._ruta_db)
+        conexion.row_factory = sqlite3.Row
+        conexion.create_function("normalizar_titulo", 1, normalizar_titulo, deterministic=True)
+        conexion.create_function("plegar", 1, plegar, deterministic=True)
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        self.aplicar_migraciones(conexion)
+
+        if es_nueva and os.path.exists(BIBLIOTECA_JSON):
+            self.migrar_desde_json(conexion, BIBLIOTECA_JSON)
+
+        return conexion
+
+    def aplicar_migraciones(self, conexion: sqlite3.Connection):
+        """ Aplica las migraciones pendientes; PRAGMA user_version guarda las ya aplicadas. """
+        version = conexion.execute("PRAGMA user_version").fetchone()[0]
+        for numero, script in enumerate(MIGRACIONES[version:], start=version + 1):
+            conexion.executescript(f"BEGIN; {script} PRAGMA user_version = {numero}; COMMIT;")
+
+    def migrar_desde_json(self, conexion: sqlite3.Connection, ruta_json: str):
+        """ Copia los libros de biblioteca_cli.json a SQLite y deja el JSON como respaldo. """
+        with open(ruta_json, "r", encoding='utf-8') as f:
+            libros = [libro for libro in json.load(f) if libro]
+
+        with conexion:
+            self._insertar_libros(conexion, libros)
+
+        os.replace(ruta_json, ruta_json + ".migrado")
+        print(f"Biblioteca migrada a SQLite: {len(libros)} libros (respaldo en {ruta_json}.migrado)")
+
+    def _insertar_libros(self, conexion: sqlite3.Connection, libros: list[dict[str, str]]):
+        columnas = COLUMNAS_LIBRO + COLUMNAS_ARCHIVO
+        claves = ["titulo_clave", *COLUMNAS_PLEGADAS.values()]
+        marcadores = ", ".join("?" for _ in columnas + claves)
+        conexion.executemany(
+            f"INSERT INTO libros ({', '.join(columnas + claves)}) VALUES ({marcadores})",
+            ([*(libro.get(columna) for columna in columnas), normalizar_titulo(libro["titulo"]),
+              *(plegar(libro.get(columna)) for columna in COLUMNAS_PLEGADAS)] for libro in libros)
+        )
 
     def agregar_libro(self, libro: dict[str, str]):
-        self._libros.append(libro)
+        with self.conexion:
+            self._insertar_libros(self.conexion, [libro])
 
     # def buscar_libros_por_autor(self, autor):
     #     for libro in self._libros:
@@ -101,27 +481,347 @@ class Biblioteca:
     #         if libro.genero.lower() == genero.lower():
     #             self.mostrar_libro(libro)
 
+    def buscar_libro(self, titulo: str) -> dict[str, Any] | None:
+        """
+        Único camino para encontrar un libro por título: una consulta al índice
+        de la clave normalizada, sin recorrer la biblioteca.
+        """
+        fila = self.conexion.execute(
+            "SELECT * FROM libros WHERE titulo_clave = ? ORDER BY id LIMIT 1",
+            (normalizar_titulo(titulo),)
+        ).fetchone()
+        return dict(fila) if fila else None
+
     def buscar_libros_por_titulo(self, titulo: str) -> str | None:
-        for libro in self._libros:
-            if libro["titulo"].lower() == titulo.lower():
-                return libro["abspath"]
+        libro = self.buscar_libro(titulo)
+        return libro["abspath"] if libro else None
+
+    def filtrar_libros(self, autor: str | None = None, genero: str | None = None, estado: str | None = None, prioridad: str | None = None, ordenar_por_prioridad: bool = False) -> list[dict[str, str]]:
+        """ Filtra por igualdad sin distinguir mayúsculas, usando los índices de cada columna. """
+        condiciones = []
+        valores = []
+        for columna, valor in (("autor", autor), ("genero", genero), ("estado", estado), ("prioridad", prioridad)):
+            if not valor:
+                continue
+            # Estado y prioridad son valores ASCII de los Enum: les basta COLLATE NOCASE
+            if columna in COLUMNAS_PLEGADAS:
+                columna, valor = COLUMNAS_PLEGADAS[columna], plegar(valor)
+            condiciones.append(f"{columna} = ?")
+            valores.append(valor)
+
+        consulta = "SELECT * FROM libros"
+        if condiciones:
+            consulta += " WHERE " + " AND ".join(condiciones)
+
+        if ordenar_por_prioridad:
+            casos = " ".join(f"WHEN '{p.value}' THEN {i}" for i, p in enumerate(Prioridad))
+            consulta += f" ORDER BY CASE prioridad {casos} ELSE {len(Prioridad)} END, id"
+        else:
+            consulta += " ORDER BY id"
+
+        return [dict(fila) for fila in self.conexion.execute(consulta, valores)]
+
+    def actualizar_libro(self, libro_id: int, cambios: dict[str, str]):
+        """ Modifica solo la fila del libro, ya encontrado con buscar_libro. """
+        valores: dict[str, str | None] = dict(cambios)
+        if "titulo" in cambios:
+            valores["titulo_clave"] = normalizar_titulo(cambios["titulo"])
+        for columna, clave in COLUMNAS_PLEGADAS.items():
+            if columna in cambios:
+                valores[clave] = plegar(cambios[columna])
+
+        asignaciones = ", ".join(f"{columna} = ?" for columna in valores)
+        with self.conexion:
+            self.conexion.execute(f"UPDATE libros SET {asignaciones} WHERE id = ?", [*valores.values(), libro_id])
+
+    def eliminar_libro(self, libro_id: int):
+        """ Elimina la fila del libro, ya encontrado con buscar_libro. """
+        with self.conexion:
+            self.conexion.execute("DELETE FROM libros WHERE id = ?", (libro_id,))
+
+    def actualizar_indice_de_texto(self, forzar: bool = False) -> tuple[int, bool]:
+        """
+        Extrae el texto de los PDFs nuevos o modificados y lo guarda en el índice.
+
+        Solo se procesan los archivos cuya ruta, fecha de modificación o tamaño
+        cambió desde la última extracción. Devuelve (PDFs procesados, si había
+        algún extractor disponible).
+        """
+        ya_indexados = {
+            fila["libro_id"]: (fila["ruta"], fila["mtime"], fila["tamano"])
+            for fila in self.conexion.execute("SELECT * FROM textos_pdf")
+        }
+
+        pendientes = []
+        for fila in self.conexion.execute("SELECT id, abspath FROM libros WHERE abspath LIKE '%.pdf'"):
+            try:
+                datos = os.stat(fila["abspath"])
+            except OSError:
+                continue
+            firma = (fila["abspath"], datos.st_mtime, datos.st_size)
+            if forzar or ya_indexados.get(fila["id"]) != firma:
+                pendientes.append((fila["id"], firma))
+
+        if not pendientes:
+            return 0, True
+        if not hay_extractor_pdf():
+            return 0, False
+
+        print(f"Extrayendo el texto de {len(pendientes)} PDF(s)...")
+        with ThreadPoolExecutor(max_workers=HILOS_EXTRACCION) as ejecutor:
+            textos = list(ejecutor.map(extraer_texto_pdf, [ruta for _, (ruta, _, _) in pendientes]))
+
+        with self.conexion:
+            for (libro_id, (ruta, mtime, tamano)), texto in zip(pendientes, textos):
+                if texto is None:
+                    continue
+                contenido, extractor = texto
+                self.conexion.execute("UPDATE libros_fts SET contenido = ? WHERE rowid = ?", (contenido, libro_id))
+                self.conexion.execute(
+                    "INSERT OR REPLACE INTO textos_pdf (libro_id, ruta, mtime, tamano, extractor) VALUES (?, ?, ?, ?, ?)",
+                    (libro_id, ruta, mtime, tamano, extractor)
+                )
+
+        return len(pendientes), True
+
+    def buscar(self, texto: str, limite: int = 20) -> list[dict[str, str]]:
+        """ Busca en títulos, autores, descripciones y contenido, ordenado por relevancia (BM25). """
+        consulta = consulta_fts(texto)
+        if not consulta:
+            return []
+
+        filas = self.conexion.execute(
+            f"""
+            SELECT libros.*,
+                   bm25(libros_fts, {", ".join(map(str, PESOS_BUSQUEDA))}) AS puntuacion,
+                   snippet(libros_fts, -1, '[', ']', '…', 12) AS fragmento
+            FROM libros_fts
+            JOIN libros ON libros.id = libros_fts.rowid
+            WHERE libros_fts MATCH ?
+            ORDER BY puntuacion
+            LIMIT ?
+            """,
+            (consulta, limite)
+        )
+        return [dict(fila) for fila in filas]
+
+    def importar_libros(self, archivos: list[str], procesos: int | None = None) -> dict[str, int]:
+        """
+        Agrega muchos archivos a la vez: los metadatos y huellas se leen en
+        paralelo y todos los libros nuevos se guardan en una sola transacción.
+
+        Se omiten las rutas que ya están en la biblioteca y los archivos cuyo
+        contenido ya existe, aunque tengan otro nombre. La huella solo muestrea
+        el archivo, así que cada coincidencia se confirma comparando el contenido.
+        """
+        conocidas = {fila[0] for fila in self.conexion.execute("SELECT abspath FROM libros WHERE abspath IS NOT NULL")}
+        nuevos = [ruta for ruta in archivos if ruta not in conocidas]
+
+        # Libros agregados antes de guardar huellas: se calculan ahora para poder comparar
+        sin_huella = [
+            (fila["id"], fila["abspath"])
+            for fila in self.conexion.execute("SELECT id, abspath FROM libros WHERE hash IS NULL AND abspath IS NOT NULL")
+            if os.path.isfile(fila["abspath"])
+        ]
+
+        resumen = {"importados": 0, "duplicados": 0, "colisiones": 0, "ya_existian": len(archivos) - len(nuevos),
+                   "errores": 0, "sin_huella": 0}
+        libros = []
+        huellas = []
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros_existentes = [(libro_id, ejecutor.submit(datos_archivo, ruta)) for libro_id, ruta in sin_huella]
+            futuros = [ejecutor.submit(leer_archivo_libro, ruta) for ruta in nuevos]
+            # Un libro ya registrado que no se puede leer se queda sin huella, sin detener la importación
+            for libro_id, futuro in futuros_existentes:
+                try:
+                    datos = futuro.result()
+                except OSError:
+                    resumen["sin_huella"] += 1
+                    continue
+                huellas.append((datos["tamano"], datos["mtime"], datos["hash"], libro_id))
+            for futuro in futuros:
+                try:
+                    libros.append(futuro.result())
+                except OSError:
+                    resumen["errores"] += 1
+
+        with self.conexion:
+            self.conexion.executemany("UPDATE libros SET tamano = ?, mtime = ?, hash = ? WHERE id = ?", huellas)
+
+            rutas_por_huella = defaultdict(list)
+            for fila in self.conexion.execute("SELECT hash, abspath FROM libros WHERE hash IS NOT NULL"):
+                rutas_por_huella[fila["hash"]].append(fila["abspath"])
+
+            a_insertar = []
+            for libro in libros:
+                iguales = rutas_por_huella.get(libro["hash"])
+                if iguales:
+                    if mismo_contenido(libro["abspath"], iguales, libro["tamano"]):
+                        resumen["duplicados"] += 1
+                        continue
+                    resumen["colisiones"] += 1
+                rutas_por_huella[libro["hash"]].append(libro["abspath"])
+                libro.update(estado=EstadoLibro.NO_LEIDO.value, prioridad=Prioridad.BAJA.value)
+                a_insertar.append(libro)
+
+            self._insertar_libros(self.conexion, a_insertar)
+            resumen["importados"] = len(a_insertar)
+
+        return resumen
+
+    def agregar_raices(self, raices: list[str]):
+        """ Guarda directorios para que `verificar` los revise en busca de libros movidos. """
+        with self.conexion:
+            self.conexion.executemany("INSERT OR IGNORE INTO raices (ruta) VALUES (?)", ((raiz,) for raiz in raices))
+
+    def raices(self) -> list[str]:
+        return [fila[0] for fila in self.conexion.execute("SELECT ruta FROM raices ORDER BY ruta")]
+
+    def escanear_raices(self, procesos: int | None = None) -> tuple[dict[str, dict], int]:
+        """
+        Recorre las raíces y devuelve ruta -> datos_archivo de cada PDF/EPUB.
+
+        La huella solo se calcula para los archivos nuevos o cuyo tamaño o
+        fecha de modificación cambió desde el último escaneo; el resto se
+        toma de la tabla `archivos`. Devuelve también cuántas huellas se calcularon.
+        """
+        anteriores = {fila["ruta"]: dict(fila) for fila in self.conexion.execute("SELECT * FROM archivos")}
+        encontrados = {}
+        pendientes = []
+        for raiz in self.raices():
+            for ruta in Path(raiz).rglob("*"):
+                if ruta.suffix.lower() not in EXTENSIONES_LIBRO or not ruta.is_file():
+                    continue
+                datos = ruta.stat()
+                anterior = anteriores.get(str(ruta))
+                if anterior and (anterior["tamano"], anterior["mtime"]) == (datos.st_size, datos.st_mtime):
+                    encontrados[str(ruta)] = anterior
+                else:
+                    pendientes.append(str(ruta))
+
+        if pendientes:
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                futuros = {ruta: ejecutor.submit(datos_archivo, ruta) for ruta in pendientes}
+                for ruta, futuro in futuros.items():
+                    try:
+                        encontrados[ruta] = {"ruta": ruta, **futuro.result()}
+                    except OSError:
+                        continue
+
+        with self.conexion:
+            self.conexion.execute("DELETE FROM archivos")
+            self.conexion.executemany(
+                "INSERT INTO archivos (ruta, tamano, mtime, hash) VALUES (?, ?, ?, ?)",
+                ((ruta, datos["tamano"], datos["mtime"], datos["hash"]) for ruta, datos in encontrados.items())
+            )
+
+        return encontrados, len(pendientes)
+
+    def verificar(self, procesos: int | None = None) -> dict:
+        """
+        Comprueba que el archivo de cada libro sigue en su sitio.
+
+        Un libro cuyo archivo ya no existe se vuelve a enlazar con el archivo de
+        las raíces que tenga la misma huella; si no hay ninguno, o si los que la
+        tienen no son iguales entre sí, su ruta se da por perdida. También
+        actualiza la huella de los archivos modificados y devuelve los grupos de
+        libros con el mismo contenido, confirmado byte a byte.
+        """
+        archivos, huellas_calculadas = self.escanear_raices(procesos)
+        rutas_por_huella = defaultdict(list)
+        for ruta, datos in archivos.items():
+            rutas_por_huella[datos["hash"]].append(ruta)
+
+        libros = self.conexion.execute("SELECT id, titulo, abspath, tamano, mtime, hash FROM libros ORDER BY id").fetchall()
+        en_uso = {libro["abspath"] for libro in libros}
+        cambios = []
+        reenlazados = []
+        trasladados = []
+        perdidos = []
+
+        for libro in libros:
+            ruta = libro["abspath"]
+            datos = archivos.get(ruta)
+            if datos is None and ruta and os.path.isfile(ruta):
+                # Libro fuera de las raíces: solo se recalcula la huella si el archivo cambió
+                estado = os.stat(ruta)
+                if libro["hash"] and (libro["tamano"], libro["mtime"]) == (estado.st_size, estado.st_mtime):
+                    continue
+                datos = datos_archivo(ruta)
+                huellas_calculadas += 1
+
+            if datos is not None:
+                if (datos["tamano"], datos["mtime"], datos["hash"]) != (libro["tamano"], libro["mtime"], libro["hash"]):
+                    cambios.append((ruta, datos["tamano"], datos["mtime"], datos["hash"], libro["id"]))
+                continue
+
+            # El archivo original ya no está para compararlo: solo se reenlaza si todos
+            # los archivos con su huella tienen el mismo contenido, comprobado byte a byte
+            grupos = agrupar_por_contenido(rutas_por_huella.get(libro["hash"], []), libro["tamano"] or 0)
+            candidatas = [r for r in grupos[0] if r not in en_uso] if len(grupos) == 1 else []
+            if not candidatas:
+                perdidos.append((libro["titulo"], ruta))
+                continue
+
+            nueva = candidatas[0]
+            en_uso.add(nueva)
+            datos = archivos[nueva]
+            cambios.append((nueva, datos["tamano"], datos["mtime"], datos["hash"], libro["id"]))
+            reenlazados.append((libro["titulo"], ruta, nueva))
+            trasladados.append((nueva, datos["mtime"], libro["id"], datos["tamano"]))
+
+        with self.conexion:
+            self.conexion.executemany("UPDATE libros SET abspath = ?, tamano = ?, mtime = ?, hash = ? WHERE id = ?", cambios)
+            # Solo los reenlazados tienen el mismo contenido: su texto ya indexado sigue
+            # valiendo con la ruta nueva. Los modificados se vuelven a extraer al buscar.
+            self.conexion.executemany(
+                "UPDATE textos_pdf SET ruta = ?, mtime = ? WHERE libro_id = ? AND tamano = ?",
+                trasladados
+            )
+
+        mismas_huellas = defaultdict(lambda: defaultdict(list))
+        for fila in self.conexion.execute(
+            """
+            SELECT hash, tamano, titulo, abspath FROM libros
+            WHERE hash IN (SELECT hash FROM libros WHERE hash IS NOT NULL GROUP BY hash HAVING COUNT(*) > 1)
+            ORDER BY hash, id
+            """
+        ):
+            mismas_huellas[fila["hash"], fila["tamano"]][fila["abspath"]].append(fila["titulo"])
+
+        # La huella solo muestrea el archivo: los duplicados se confirman byte a byte
+        duplicados = []
+        for (_, tamano), titulos_por_ruta in mismas_huellas.items():
+            for rutas in agrupar_por_contenido(list(titulos_por_ruta), tamano):
+                grupo = [(titulo, ruta) for ruta in rutas for titulo in titulos_por_ruta[ruta]]
+                if len(grupo) > 1:
+                    duplicados.append(grupo)
+
+        return {
+            "archivos": len(archivos),
+            "huellas_calculadas": huellas_calculadas,
+            "reenlazados": reenlazados,
+            "perdidos": perdidos,
+            "duplicados": duplicados,
+        }
+
+    def contar_libros(self) -> int:
+        return self.conexion.execute("SELECT COUNT(*) FROM libros").fetchone()[0]
 
     def mostrar_todos_los_libros(self):
         print(f'Todos los libros de la biblioteca {self._nombre}'.center(70, "="))
-        # Bug: Hay un None en la lista de libros
-        for libro in self._libros:
+        for libro in self.filtrar_libros():
             self.mostrar_libros(libro)
 
     def mostrar_todos_los_libros_disponibles(self):
         print(f'Libros disponibles en la biblioteca {self._nombre}'.center(70, "="))
-        for libro in self._libros:
+        for libro in self.filtrar_libros():
             self.mostrar_libros(libro)
 
     def mostrar_todos_los_libros_no_leidos(self):
         print(f'Libros disponibles en la biblioteca {self._nombre}'.center(70, "="))
-        for libro in self._libros:
-            if libro.get("estado") == EstadoLibro.NO_LEIDO.value:
-                self.mostrar_libros(libro)
+        for libro in self.filtrar_libros(estado=EstadoLibro.NO_LEIDO.value):
+            self.mostrar_libros(libro)
 
     def mostrar_libros(self, libro: dict[str, str]):
         print(f'Libro -> Título: {libro["titulo"]}, Autor: {libro["autor"]}, '
@@ -129,18 +829,16 @@ class Biblioteca:
 
     # Lógica de la app
     def cargar_libros(self) -> list[dict[str, str]]:
-        with open(BIBLIOTECA_JSON, "r", encoding='utf-8') as f:
-            return json.load(f)
+        return self.filtrar_libros()
 
     def guardar_libros(self, libros: list[dict[str, str]]):
-        with open(BIBLIOTECA_JSON, "w", encoding='utf-8') as f:
-            json.dump(libros, f, indent=4, ensure_ascii=False)
+        # Reemplaza la biblioteca completa en una sola transacción
+        with self.conexion:
+            self.conexion.execute("DELETE FROM libros")
+            self._insertar_libros(self.conexion, libros)
 
     def guardar_libro(self, libro: dict[str, str]):
-        libros = self.cargar_libros()
-        # print(libros)
-        libros.append(libro)
-        self.guardar_libros(libros)
+        self.agregar_libro(libro)
 
     @property
     def nombre(self):
@@ -148,7 +846,7 @@ class Biblioteca:
 
     @property
     def libros(self):
-        return self._libros
+        return self.cargar_libros()
 
 def cargar_configuracion() -> dict[str, str]:
     with open(CONFIG_FILE_PATH, "r", encoding='utf-8') as archivo:
@@ -208,13 +906,17 @@ def agregar_libro(file: str | None = None, titulo: str | None = None, autor: str
         path_libro = os.path.join(current_path, file)
 
         current_libro = Libro(titulo=titulo, autor=autor, genero=genero, anio_publicacion=anio_publicacion, path_absoluto=path_libro, idioma=idioma, estado=estado, descripcion=descripcion, lo_leo_por=lo_leo_por, prioridad=prioridad)
-        BIBLIOTECA_PRINCIPAL.guardar_libro(current_libro.convertir_a_dict())
+        libro: dict[str, Any] = current_libro.convertir_a_dict()
+        if os.path.isfile(path_libro):
+            libro.update(datos_archivo(path_libro))
+        BIBLIOTECA_PRINCIPAL.guardar_libro(libro)
 
 def abrir_libro(libro: str):
     if libro:
         current_libro = BIBLIOTECA_PRINCIPAL.buscar_libros_por_titulo(libro)
         if not current_libro:
             print(f"No se encontró el libro: {libro}")
+            return
 
         subprocess.run(["zathura", str(current_libro)], check=True)
 
@@ -224,8 +926,7 @@ def listar_libros(autor: str | None = None, genero: str | None = None, estado: s
     - Por defecto, lista todos los libros disponibles.
     - Permite filtrar por autor, género o estado.
     """
-    libros = BIBLIOTECA_PRINCIPAL.cargar_libros()
-    if not libros:
+    if not BIBLIOTECA_PRINCIPAL.contar_libros():
         print("No hay libros en la biblioteca.")
         return
 
@@ -234,24 +935,8 @@ def listar_libros(autor: str | None = None, genero: str | None = None, estado: s
         BIBLIOTECA_PRINCIPAL.mostrar_todos_los_libros_disponibles()
         return
 
-    # Aplicar filtros si se proporcionan
-    libros_a_mostrar = libros
-
-    if autor:
-        libros_a_mostrar = [libro for libro in libros_a_mostrar if libro.get("autor", "").lower() == autor.lower()]
-
-    if genero:
-        libros_a_mostrar = [libro for libro in libros_a_mostrar if libro.get("genero", "").lower() == genero.lower()]
-
-    if estado:
-        libros_a_mostrar = [libro for libro in libros_a_mostrar if libro.get("estado", "").lower() == estado.lower()]
-
-    if prioridad:
-        libros_a_mostrar = [libro for libro in libros_a_mostrar if libro.get("prioridad", "").lower() == prioridad.lower()]
-
-    if ordenar_por_prioridad:
-        prioridad_orden = {p.value: i for i, p in enumerate(Prioridad)}
-        libros_a_mostrar = sorted(libros_a_mostrar, key=lambda x: prioridad_orden.get(x.get("prioridad"), len(prioridad_orden))) # type: ignore
+    # Los filtros se resuelven en SQLite con los índices de cada columna
+    libros_a_mostrar = BIBLIOTECA_PRINCIPAL.filtrar_libros(autor, genero, estado, prioridad, ordenar_por_prioridad)
 
     if not libros_a_mostrar:
         print("No se encontraron libros con los criterios especificados.")
@@ -262,66 +947,53 @@ def listar_libros(autor: str | None = None, genero: str | None = None, estado: s
 
 def eliminar_libro(libro: str):
     if libro:
-        current_libro = BIBLIOTECA_PRINCIPAL.buscar_libros_por_titulo(libro)
-        if not current_libro:
+        libro_encontrado = BIBLIOTECA_PRINCIPAL.buscar_libro(libro)
+        if not libro_encontrado:
             print(f"No se encontró el libro: {libro}")
             return
 
-        # Eliminar el libro del archivo JSON
-        libros = BIBLIOTECA_PRINCIPAL.cargar_libros()
-        libros = [l for l in libros if l["titulo"].lower() != libro.lower()]
-        BIBLIOTECA_PRINCIPAL.guardar_libros(libros)
+        BIBLIOTECA_PRINCIPAL.eliminar_libro(libro_encontrado["id"])
         print(f"Libro '{libro}' eliminado de la biblioteca.")
 
 def modificar_libro(titulo_actual: str, nuevo_titulo: str | None = None, nuevo_autor: str | None = None, nuevo_genero: str | None = None, nuevo_anio: str | None = None, nuevo_idioma: str | None = None, nuevo_estado: str | None = None, nueva_descripcion: str | None = None, lo_leo_por: str | None = None, nueva_prioridad: str | None = None):
     """ Modifica los atributos de un libro existente. """
-    libros = BIBLIOTECA_PRINCIPAL.cargar_libros()
-    libro_encontrado = None
-    libro_modificado = False
-
-    for libro in libros:
-        if libro["titulo"].lower() == titulo_actual.lower():
-            libro_encontrado = libro
-            print(f"Libro encontrado: '{libro['titulo']}'. Modificando atributos...")
-            if nuevo_titulo:
-                libro["titulo"] = nuevo_titulo
-                libro_modificado = True
-            if nuevo_autor:
-                libro["autor"] = nuevo_autor
-                libro_modificado = True
-            if nuevo_anio:
-                libro["anio_publicacion"] = nuevo_anio
-                libro_modificado = True
-            if nueva_descripcion:
-                libro["descripcion"] = nueva_descripcion
-                libro_modificado = True
-            if nuevo_genero:
-                libro["genero"] = nuevo_genero
-                libro_modificado = True
-            if nuevo_estado:
-                try:
-                    estado = EstadoLibro(nuevo_estado.lower())
-                    libro["estado"] = estado.value
-                    libro_modificado = True
-                except ValueError:
-                    print(f"Error: El estado del libro debe ser uno de los siguientes: {', '.join([e.value for e in EstadoLibro])}")
-                    return
-            if nueva_prioridad:
-                try:
-                    prioridad = Prioridad(nueva_prioridad.lower())
-                    libro["prioridad"] = prioridad.value
-                    libro_modificado = True
-                except ValueError:
-                    print(f"Error: La prioridad del libro debe ser una de las siguientes: {', '.join([p.value for p in Prioridad])}")
-                    return
-            break
-
+    libro_encontrado = BIBLIOTECA_PRINCIPAL.buscar_libro(titulo_actual)
     if not libro_encontrado:
         print(f"Error: No se encontró el libro con el título '{titulo_actual}'.")
         return
 
-    if libro_modificado:
-        BIBLIOTECA_PRINCIPAL.guardar_libros(libros)
+    print(f"Libro encontrado: '{libro_encontrado['titulo']}'. Modificando atributos...")
+    cambios = {}
+    if nuevo_titulo:
+        cambios["titulo"] = nuevo_titulo
+    if nuevo_autor:
+        cambios["autor"] = nuevo_autor
+    if nuevo_anio:
+        cambios["anio_publicacion"] = nuevo_anio
+    if nuevo_idioma:
+        cambios["idioma"] = nuevo_idioma
+    if nueva_descripcion:
+        cambios["descripcion"] = nueva_descripcion
+    if lo_leo_por:
+        cambios["lo_leo_por"] = lo_leo_por
+    if nuevo_genero:
+        cambios["genero"] = nuevo_genero
+    if nuevo_estado:
+        try:
+            cambios["estado"] = EstadoLibro(nuevo_estado.lower()).value
+        except ValueError:
+            print(f"Error: El estado del libro debe ser uno de los siguientes: {', '.join([e.value for e in EstadoLibro])}")
+            return
+    if nueva_prioridad:
+        try:
+            cambios["prioridad"] = Prioridad(nueva_prioridad.lower()).value
+        except ValueError:
+            print(f"Error: La prioridad del libro debe ser una de las siguientes: {', '.join([p.value for p in Prioridad])}")
+            return
+
+    if cambios:
+        # Solo se actualiza la fila del libro
+        BIBLIOTECA_PRINCIPAL.actualizar_libro(libro_encontrado["id"], cambios)
         print(f"El libro '{titulo_actual}' ha sido modificado exitosamente.")
     else:
         print("No se especificó ningún atributo para modificar.")
@@ -333,12 +1005,7 @@ def mostrar_version():
 
 def mostrar_info_libro(titulo: str):
     """ Muestra la información detallada de un libro. """
-    libros = BIBLIOTECA_PRINCIPAL.cargar_libros()
-    libro_encontrado = None
-    for libro in libros:
-        if libro["titulo"].lower() == titulo.lower():
-            libro_encontrado = libro
-            break
+    libro_encontrado = BIBLIOTECA_PRINCIPAL.buscar_libro(titulo)
 
     if libro_encontrado:
         print(f"Información de '{libro_encontrado['titulo']}'".center(70, '='))
@@ -356,6 +1023,98 @@ def mostrar_info_libro(titulo: str):
         print(f"Error: No se encontró el libro con el título '{titulo}'.")
 
 
+def importar_libros(directorio: str, recursivo: bool = False, procesos: int | None = None):
+    """ Importa todos los PDF y EPUB de un directorio (y sus subdirectorios con --recursive). """
+    raiz = Path(directorio).expanduser().resolve()
+    if not raiz.is_dir():
+        print(f"Error: '{directorio}' no es un directorio.")
+        return
+
+    patron = raiz.rglob("*") if recursivo else raiz.glob("*")
+    archivos = sorted(str(ruta) for ruta in patron if ruta.suffix.lower() in EXTENSIONES_LIBRO and ruta.is_file())
+    if not archivos:
+        print(f"No se encontraron archivos PDF o EPUB en {raiz}.")
+        return
+
+    print(f"Importando {len(archivos)} archivo(s) de {raiz}...")
+    inicio = time.perf_counter()
+    resumen = BIBLIOTECA_PRINCIPAL.importar_libros(archivos, procesos)
+    BIBLIOTECA_PRINCIPAL.agregar_raices([str(raiz)])
+    segundos = time.perf_counter() - inicio
+
+    print(f"- Importados: {resumen['importados']}")
+    print(f"- Duplicados (mismo contenido): {resumen['duplicados']}")
+    if resumen["colisiones"]:
+        print(f"- Importados con la huella de otro libro pero contenido distinto: {resumen['colisiones']}")
+    print(f"- Ya estaban en la biblioteca: {resumen['ya_existian']}")
+    if resumen["errores"]:
+        print(f"- No se pudieron leer: {resumen['errores']}")
+    if resumen["sin_huella"]:
+        print(f"- Libros ya registrados que no se pudieron leer para compararlos: {resumen['sin_huella']}")
+    print(f"Listo en {segundos:.1f} s")
+
+def verificar_biblioteca(raices: list[str] | None = None, procesos: int | None = None):
+    """ Reenlaza los libros movidos e informa de rutas perdidas y duplicados. """
+    nuevas = [str(Path(raiz).expanduser().resolve()) for raiz in raices or []]
+    for raiz in nuevas:
+        if not os.path.isdir(raiz):
+            print(f"Error: '{raiz}' no es un directorio.")
+            return
+    BIBLIOTECA_PRINCIPAL.agregar_raices(nuevas)
+
+    raices_configuradas = BIBLIOTECA_PRINCIPAL.raices()
+    if not raices_configuradas:
+        print("Aviso: no hay directorios para buscar libros movidos; agrega uno con --raiz o usa `importar`.")
+
+    inicio = time.perf_counter()
+    informe = BIBLIOTECA_PRINCIPAL.verificar(procesos)
+    segundos = time.perf_counter() - inicio
+
+    print("Verificación de la biblioteca".center(70, "="))
+    print(f"- Archivos en {len(raices_configuradas)} directorio(s): {informe['archivos']} "
+          f"({informe['huellas_calculadas']} huella(s) calculada(s))")
+
+    if informe["reenlazados"]:
+        print(f"Libros reenlazados ({len(informe['reenlazados'])}):")
+        for titulo, anterior, nueva in informe["reenlazados"]:
+            print(f"    {titulo}: {anterior} -> {nueva}")
+
+    if informe["perdidos"]:
+        print(f"Rutas perdidas ({len(informe['perdidos'])}):")
+        for titulo, ruta in informe["perdidos"]:
+            print(f"    {titulo}: {ruta}")
+
+    if informe["duplicados"]:
+        print(f"Libros duplicados ({len(informe['duplicados'])} grupo(s) con el mismo contenido):")
+        for grupo in informe["duplicados"]:
+            print("    " + ", ".join(f"{titulo} ({ruta})" for titulo, ruta in grupo))
+
+    if not (informe["reenlazados"] or informe["perdidos"] or informe["duplicados"]):
+        print("Todos los libros están en su sitio y no hay duplicados.")
+    print(f"Listo en {segundos:.1f} s")
+
+def buscar_libros(texto: str, limite: int = 20, reindexar: bool = False):
+    """ Búsqueda de texto completo, incluido el contenido de los PDFs. """
+    procesados, hay_extractor = BIBLIOTECA_PRINCIPAL.actualizar_indice_de_texto(forzar=reindexar)
+    if not hay_extractor:
+        print("Aviso: instala pdftotext (poppler-utils) o pypdf para buscar dentro de los PDFs.")
+    elif procesados:
+        print(f"Índice actualizado: {procesados} PDF(s).")
+
+    inicio = time.perf_counter()
+    resultados = BIBLIOTECA_PRINCIPAL.buscar(texto, limite)
+    milisegundos = (time.perf_counter() - inicio) * 1000
+
+    if not resultados:
+        print(f"No se encontraron libros para '{texto}'.")
+        return
+
+    print(f"Resultados para '{texto}'".center(70, "="))
+    for libro in resultados:
+        BIBLIOTECA_PRINCIPAL.mostrar_libros(libro)
+        print(f"    {' '.join(libro['fragmento'].split())}")
+    print(f"{len(resultados)} resultado(s) en {milisegundos:.1f} ms")
+
 def main():
     parser = argparse.ArgumentParser(
         description='Biblioteca CLI - Sistema para gestionar libros desde la Terminal',
@@ -622,6 +1381,78 @@ def main():
         type=str
     )
 
+    # Comando para buscar texto en la biblioteca
+    buscar_parser = subparsers.add_parser(
+        "buscar",
+        help='Busca libros por palabras en título, autor, descripción o contenido del PDF',
+        description='Búsqueda de texto completo ordenada por relevancia. El texto de los PDFs se extrae una vez y se actualiza solo si el archivo cambia.'
+    )
+    buscar_parser.add_argument(
+        'texto',
+        help='Palabras a buscar (ej: "arquitectura limpia")',
+        metavar='TEXTO',
+        type=str
+    )
+    buscar_parser.add_argument(
+        '-n', '--limite',
+        help='Número máximo de resultados (por defecto: 20)',
+        metavar='N',
+        default=20,
+        type=int
+    )
+    buscar_parser.add_argument(
+        '--reindexar',
+        help='Vuelve a extraer el texto de todos los PDFs',
+        action='store_true'
+    )
+
+    # Comando para importar un directorio completo
+    importar_parser = subparsers.add_parser(
+        "importar",
+        help='Importa todos los PDF y EPUB de un directorio',
+        description='Lee título, autor, año e idioma de los metadatos de cada archivo y omite los duplicados por contenido.'
+    )
+    importar_parser.add_argument(
+        'directorio',
+        help='Directorio con los libros',
+        metavar='DIRECTORIO',
+        type=str
+    )
+    importar_parser.add_argument(
+        '-r', '--recursive',
+        help='Incluye los subdirectorios',
+        action='store_true'
+    )
+    importar_parser.add_argument(
+        '-j', '--procesos',
+        help='Procesos para leer los archivos (por defecto: uno por núcleo)',
+        metavar='N',
+        default=None,
+        type=int
+    )
+
+    # Comando para verificar los archivos de la biblioteca
+    verificar_parser = subparsers.add_parser(
+        "verificar",
+        help='Reenlaza libros movidos y muestra rutas perdidas y duplicados',
+        description='Busca en los directorios configurados (los de `importar` y --raiz) los archivos de los libros que cambiaron de sitio, comparando su contenido.'
+    )
+    verificar_parser.add_argument(
+        '--raiz',
+        help='Directorio donde buscar libros movidos; se guarda para las próximas verificaciones (se puede repetir)',
+        metavar='DIRECTORIO',
+        action='append',
+        default=None,
+        type=str
+    )
+    verificar_parser.add_argument(
+        '-j', '--procesos',
+        help='Procesos para calcular huellas (por defecto: uno por núcleo)',
+        metavar='N',
+        default=None,
+        type=int
+    )
+
     args = parser.parse_args()
 
     if args.comando == "agregar":
@@ -636,6 +1467,12 @@ def main():
         modificar_libro(args.titulo, args.nombre, args.autor, args.genero, args.anio_publicacion, args.idioma, args.estado, args.descripcion, args.lo_leo_por, args.prioridad)
     elif args.comando == "info":
         mostrar_info_libro(args.titulo)
+    elif args.comando == "buscar":
+        buscar_libros(args.texto, args.limite, args.reindexar)
+    elif args.comando == "importar":
+        importar_libros(args.directorio, args.recursive, args.procesos)
+    elif args.comando == "verificar":
+        verificar_biblioteca(args.raiz, args.procesos)
     elif args.comando == "version":
         mostrar_version()
     elif args.comando is None:
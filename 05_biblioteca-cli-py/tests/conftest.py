@@ -0,0 +1,52 @@
+"""
+Configuración común de las pruebas de la biblioteca.
+
+Cada prueba usa una base de datos SQLite en un directorio temporal y un
+biblioteca_cli.json que no existe, así que nunca se toca ~/.config.
+"""
+
+import sys
+from typing import Any
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app  # noqa: E402
+
+@pytest.fixture(autouse=True)
+def json_temporal(monkeypatch, tmp_path):
+    """ Ruta del JSON antiguo dentro de tmp_path (no existe salvo que la prueba lo cree). """
+    ruta = tmp_path / "biblioteca_cli.json"
+    monkeypatch.setattr(app, "BIBLIOTECA_JSON", str(ruta))
+    return ruta
+
+@pytest.fixture
+def ruta_db(tmp_path):
+    return str(tmp_path / "config" / "biblioteca_cli.db")
+
+@pytest.fixture
+def biblioteca(ruta_db):
+    biblioteca = app.Biblioteca("pruebas", ruta_db)
+    yield biblioteca
+    biblioteca.conexion.close()
+
+@pytest.fixture
+def nuevo_libro():
+    """ Crea libros con los mismos campos que guarda `agregar`. """
+    def crear(titulo: str, **campos) -> dict[str, Any]:
+        return {
+            "titulo": titulo,
+            "autor": None,
+            "genero": None,
+            "anio_publicacion": None,
+            "idioma": None,
+            "estado": app.EstadoLibro.NO_LEIDO.value,
+            "abspath": None,
+            "descripcion": None,
+            "lo_leo_por": None,
+            "prioridad": app.Prioridad.BAJA.value,
+            **campos,
+        }
+    return crear
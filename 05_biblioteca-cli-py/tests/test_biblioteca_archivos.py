@@ -0,0 +1,340 @@
+"""Pruebas de las huellas de archivo, `importar` y `verificar`."""
+
+import os
+import sys
+import zipfile
+import multiprocessing
+
+import pytest
+
+import app
+
+TAMANO_GRANDE = 4 * app.BLOQUE_HUELLA
+
+def contenido_grande() -> bytes:
+    """ Contenido mayor que los tres bloques de muestra de la huella. """
+    return os.urandom(16) * (TAMANO_GRANDE // 16)
+
+def cambiar_fuera_de_la_muestra(datos: bytes) -> bytes:
+    """ Mismo contenido con un byte cambiado entre el bloque inicial y el central. """
+    cambiado = bytearray(datos)
+    cambiado[app.BLOQUE_HUELLA + 10] ^= 0xFF
+    return bytes(cambiado)
+
+def escribir(ruta, datos: bytes):
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_bytes(datos)
+    return ruta
+
+def encontrar(biblioteca: app.Biblioteca, titulo: str) -> dict:
+    libro = biblioteca.buscar_libro(titulo)
+    assert libro is not None, f"no se encontró {titulo!r}"
+    return libro
+
+def escribir_epub(ruta, titulo: str, autor: str, fecha: str, idioma: str):
+    opf = f"""<?xml version="1.0"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:title>{titulo}</dc:title>
+    <dc:creator>{autor}</dc:creator>
+    <dc:date>{fecha}</dc:date>
+    <dc:language>{idioma}</dc:language>
+  </metadata>
+</package>"""
+    contenedor = """<?xml version="1.0"?>
+<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" version="1.0">
+  <rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>"""
+    with zipfile.ZipFile(ruta, "w") as epub:
+        epub.writestr("mimetype", "application/epub+zip")
+        epub.writestr("META-INF/container.xml", contenedor)
+        epub.writestr("OEBPS/content.opf", opf)
+    return ruta
+
+# =============================================================================
+# HUELLAS
+# =============================================================================
+
+def test_huella_de_archivo_pequeno_lee_todo(tmp_path):
+    a = escribir(tmp_path / "a.pdf", b"x" * 1000)
+    b = escribir(tmp_path / "b.pdf", b"x" * 999 + b"y")
+
+    assert app.huella_archivo(str(a), 1000) != app.huella_archivo(str(b), 1000)
+    assert app.mismo_contenido(str(a), [str(b)], 1000)
+
+def test_huella_de_archivo_grande_solo_muestrea(tmp_path):
+    datos = contenido_grande()
+    a = escribir(tmp_path / "a.pdf", datos)
+    b = escribir(tmp_path / "b.pdf", cambiar_fuera_de_la_muestra(datos))
+    c = escribir(tmp_path / "c.pdf", datos)
+
+    assert app.huella_archivo(str(a), TAMANO_GRANDE) == app.huella_archivo(str(b), TAMANO_GRANDE)
+    assert not app.mismo_contenido(str(a), [str(b)], TAMANO_GRANDE)
+    assert app.mismo_contenido(str(a), [str(tmp_path / "no_existe.pdf"), str(b), str(c)], TAMANO_GRANDE)
+
+def test_datos_archivo(tmp_path):
+    ruta = escribir(tmp_path / "a.pdf", b"hola")
+    datos = app.datos_archivo(str(ruta))
+
+    assert datos["tamano"] == 4
+    assert datos["mtime"] == ruta.stat().st_mtime
+    assert datos["hash"] == app.huella_archivo(str(ruta), 4)
+
+@pytest.mark.parametrize("texto, anio", [
+    ("D:20170912103000Z", "2017"),
+    ("2001-05-01", "2001"),
+    ("sin fecha", None),
+    (None, None),
+])
+def test_anio_de(texto, anio):
+    assert app.anio_de(texto) == anio
+
+def test_modulo_pypdf_es_opcional(monkeypatch):
+    # Un None en sys.modules hace que el import falle como si no estuviera instalado
+    monkeypatch.setitem(sys.modules, "pypdf", None)
+    monkeypatch.setenv("PATH", "")
+
+    assert app.modulo_pypdf() is None
+    assert not app.hay_extractor_pdf()
+    assert app.extraer_texto_pdf("libro.pdf") is None
+
+def test_metadatos_epub(tmp_path):
+    ruta = escribir_epub(tmp_path / "libro.epub", "Rayuela", "Julio Cortázar", "1963-06-28", "es")
+
+    assert app.metadatos_epub(str(ruta)) == {
+        "titulo": "Rayuela",
+        "autor": "Julio Cortázar",
+        "anio_publicacion": "1963",
+        "idioma": "es",
+    }
+
+# =============================================================================
+# IMPORTAR
+# =============================================================================
+
+def test_importar_omite_rutas_conocidas_y_duplicados(biblioteca, tmp_path):
+    libros = tmp_path / "libros"
+    datos = contenido_grande()
+    escribir(libros / "original.pdf", datos)
+    escribir(libros / "copia.pdf", datos)
+    escribir_epub(libros / "rayuela.epub", "Rayuela", "Julio Cortázar", "1963", "es")
+
+    archivos = sorted(str(ruta) for ruta in libros.iterdir())
+    resumen = biblioteca.importar_libros(archivos, procesos=2)
+
+    assert resumen == {"importados": 2, "duplicados": 1, "colisiones": 0, "ya_existian": 0, "errores": 0, "sin_huella": 0}
+    rayuela = encontrar(biblioteca, "rayuela")
+    assert (rayuela["autor"], rayuela["anio_publicacion"], rayuela["idioma"]) == ("Julio Cortázar", "1963", "es")
+    assert rayuela["estado"] == app.EstadoLibro.NO_LEIDO.value
+
+    # Repetir la importación no agrega nada
+    resumen = biblioteca.importar_libros(archivos, procesos=2)
+    assert resumen == {"importados": 0, "duplicados": 1, "colisiones": 0, "ya_existian": 2, "errores": 0, "sin_huella": 0}
+    assert biblioteca.contar_libros() == 2
+
+def test_importar_confirma_las_huellas_iguales(biblioteca, tmp_path):
+    datos = contenido_grande()
+    a = escribir(tmp_path / "a.pdf", datos)
+    b = escribir(tmp_path / "b.pdf", cambiar_fuera_de_la_muestra(datos))
+
+    resumen = biblioteca.importar_libros([str(a), str(b)], procesos=2)
+
+    # Misma huella pero distinto contenido: se importan los dos
+    assert (resumen["importados"], resumen["duplicados"], resumen["colisiones"]) == (2, 0, 1)
+
+def test_importar_calcula_huellas_de_libros_antiguos(biblioteca, nuevo_libro, tmp_path):
+    viejo = escribir(tmp_path / "viejo.pdf", b"contenido")
+    biblioteca.agregar_libro(nuevo_libro("viejo", abspath=str(viejo)))
+    copia = escribir(tmp_path / "nuevo" / "copia.pdf", b"contenido")
+
+    resumen = biblioteca.importar_libros([str(copia)], procesos=2)
+
+    assert resumen["duplicados"] == 1
+    assert encontrar(biblioteca, "viejo")["hash"] == app.huella_archivo(str(viejo), 9)
+
+def test_metadatos_epub_sin_paquete_opf(tmp_path):
+    ruta = tmp_path / "roto.epub"
+    with zipfile.ZipFile(ruta, "w") as epub:
+        epub.writestr("META-INF/container.xml", "<container/>")
+
+    with pytest.raises(ValueError, match="OPF"):
+        app.metadatos_epub(str(ruta))
+    # Al importar, un EPUB sin metadatos usa el nombre del archivo
+    assert app.leer_archivo_libro(str(ruta))["titulo"] == "roto"
+
+def test_importar_deja_vacios_los_campos_sin_datos(monkeypatch, biblioteca, tmp_path):
+    monkeypatch.setattr(app, "metadatos_pdf", lambda ruta: {"titulo": None, "autor": None})
+    ruta = escribir(tmp_path / "Sin Metadatos.pdf", b"%PDF-1.4")
+
+    biblioteca.importar_libros([str(ruta)], procesos=1)
+    libro = encontrar(biblioteca, "sin metadatos")
+
+    assert libro["titulo"] == "sin_metadatos"
+    assert [libro[columna] for columna in ("autor", "genero", "descripcion", "lo_leo_por", "idioma")] == [""] * 5
+
+DATOS_ARCHIVO_REAL = app.datos_archivo
+
+def huella_fallida(ruta: str):
+    """ datos_archivo de un libro antiguo que ya no se puede leer (a nivel de módulo para enviarla al proceso). """
+    if ruta.endswith("protegido.pdf"):
+        raise PermissionError(13, "Permission denied", ruta)
+    return DATOS_ARCHIVO_REAL(ruta)
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="el proceso hijo necesita heredar el monkeypatch")
+def test_importar_informa_de_libros_antiguos_ilegibles(monkeypatch, biblioteca, nuevo_libro, tmp_path):
+    monkeypatch.setattr(app, "datos_archivo", huella_fallida)
+    protegido = escribir(tmp_path / "protegido.pdf", b"viejo")
+    legible = escribir(tmp_path / "legible.pdf", b"otro")
+    biblioteca.agregar_libro(nuevo_libro("protegido", abspath=str(protegido)))
+    biblioteca.agregar_libro(nuevo_libro("legible", abspath=str(legible)))
+    nuevo = escribir(tmp_path / "nuevo" / "nuevo.pdf", b"nuevo")
+
+    resumen = biblioteca.importar_libros([str(nuevo)], procesos=2)
+
+    assert (resumen["importados"], resumen["sin_huella"], resumen["errores"]) == (1, 1, 0)
+    assert encontrar(biblioteca, "protegido")["hash"] is None
+    assert encontrar(biblioteca, "legible")["hash"] is not None
+
+# =============================================================================
+# VERIFICAR
+# =============================================================================
+
+@pytest.fixture
+def biblioteca_con_raiz(biblioteca, tmp_path):
+    raiz = tmp_path / "raiz"
+    raiz.mkdir()
+    biblioteca.agregar_raices([str(raiz)])
+    return biblioteca, raiz
+
+def indexar(biblioteca, libro_id: int, ruta):
+    """ Simula un texto ya extraído del PDF del libro. """
+    datos = os.stat(ruta)
+    biblioteca.conexion.execute(
+        "INSERT OR REPLACE INTO textos_pdf (libro_id, ruta, mtime, tamano, extractor) VALUES (?, ?, ?, ?, 'prueba')",
+        (libro_id, str(ruta), datos.st_mtime, datos.st_size)
+    )
+    biblioteca.conexion.commit()
+
+def test_verificar_reenlaza_archivos_movidos(biblioteca_con_raiz):
+    biblioteca, raiz = biblioteca_con_raiz
+    ruta = escribir(raiz / "a" / "libro.pdf", b"contenido del libro")
+    biblioteca.importar_libros([str(ruta)], procesos=2)
+    libro = encontrar(biblioteca, "libro")
+    indexar(biblioteca, libro["id"], ruta)
+
+    nueva = raiz / "b" / "renombrado.pdf"
+    nueva.parent.mkdir()
+    ruta.rename(nueva)
+    resultado = biblioteca.verificar(procesos=2)
+
+    assert resultado["reenlazados"] == [("libro", str(ruta), str(nueva))]
+    assert resultado["perdidos"] == []
+    assert encontrar(biblioteca, "libro")["abspath"] == str(nueva)
+    # El texto ya extraído sigue valiendo: no se vuelve a extraer
+    texto = biblioteca.conexion.execute("SELECT ruta, mtime FROM textos_pdf").fetchone()
+    assert (texto["ruta"], texto["mtime"]) == (str(nueva), nueva.stat().st_mtime)
+
+def test_verificar_vuelve_a_extraer_los_modificados(monkeypatch, biblioteca_con_raiz):
+    biblioteca, raiz = biblioteca_con_raiz
+    ruta = escribir(raiz / "libro.pdf", b"primera version")
+    biblioteca.importar_libros([str(ruta)], procesos=2)
+    libro = encontrar(biblioteca, "libro")
+    indexar(biblioteca, libro["id"], ruta)
+
+    ruta.write_bytes(b"segunda version, mas larga")
+    resultado = biblioteca.verificar(procesos=2)
+
+    assert resultado["reenlazados"] == []
+    assert encontrar(biblioteca, "libro")["hash"] == app.huella_archivo(str(ruta), ruta.stat().st_size)
+    extraidos = []
+    monkeypatch.setattr(app, "hay_extractor_pdf", lambda: True)
+    monkeypatch.setattr(app, "extraer_texto_pdf", lambda r: extraidos.append(r) or ("", "prueba"))
+    assert biblioteca.actualizar_indice_de_texto() == (1, True)
+    assert extraidos == [str(ruta)]
+
+def test_verificar_perdidos_y_duplicados(biblioteca_con_raiz, nuevo_libro, tmp_path):
+    biblioteca, raiz = biblioteca_con_raiz
+    a = escribir(raiz / "a.pdf", b"igual")
+    b = escribir(tmp_path / "fuera" / "b.pdf", b"igual")
+    borrado = escribir(raiz / "borrado.pdf", b"unico")
+    for titulo, ruta in (("a", a), ("b", b), ("borrado", borrado)):
+        biblioteca.agregar_libro(nuevo_libro(titulo, abspath=str(ruta), **app.datos_archivo(str(ruta))))
+    borrado.unlink()
+
+    resultado = biblioteca.verificar(procesos=2)
+
+    assert resultado["archivos"] == 1
+    assert resultado["perdidos"] == [("borrado", str(borrado))]
+    assert resultado["duplicados"] == [[("a", str(a)), ("b", str(b))]]
+
+def test_verificar_solo_calcula_huellas_de_archivos_cambiados(biblioteca_con_raiz):
+    biblioteca, raiz = biblioteca_con_raiz
+    escribir(raiz / "a.pdf", b"uno")
+    escribir(raiz / "b.epub", b"dos")
+    escribir(raiz / "notas.txt", b"no es un libro")
+
+    assert biblioteca.verificar(procesos=2)["huellas_calculadas"] == 2
+    assert biblioteca.verificar(procesos=2)["huellas_calculadas"] == 0
+
+    escribir(raiz / "a.pdf", b"uno modificado")
+    resultado = biblioteca.verificar(procesos=2)
+    assert (resultado["archivos"], resultado["huellas_calculadas"]) == (2, 1)
+
+def test_agrupar_por_contenido(tmp_path):
+    datos = contenido_grande()
+    a = escribir(tmp_path / "a.pdf", datos)
+    b = escribir(tmp_path / "b.pdf", datos)
+    distinto = escribir(tmp_path / "distinto.pdf", cambiar_fuera_de_la_muestra(datos))
+
+    grupos = app.agrupar_por_contenido([str(a), str(distinto), str(tmp_path / "no_existe.pdf"), str(b)], TAMANO_GRANDE)
+
+    assert grupos == [[str(a), str(b)], [str(distinto)], [str(tmp_path / "no_existe.pdf")]]
+
+def test_verificar_no_reenlaza_si_la_huella_es_ambigua(biblioteca_con_raiz, nuevo_libro, tmp_path):
+    biblioteca, raiz = biblioteca_con_raiz
+    datos = contenido_grande()
+    borrado = escribir(tmp_path / "fuera" / "libro.pdf", datos)
+    biblioteca.agregar_libro(nuevo_libro("libro", abspath=str(borrado), **app.datos_archivo(str(borrado))))
+    borrado.unlink()
+    escribir(raiz / "copia.pdf", datos)
+    escribir(raiz / "parecido.pdf", cambiar_fuera_de_la_muestra(datos))
+
+    resultado = biblioteca.verificar(procesos=2)
+
+    # Dos archivos distintos con la misma huella: no se puede saber cuál era el libro
+    assert resultado["reenlazados"] == []
+    assert resultado["perdidos"] == [("libro", str(borrado))]
+
+def test_verificar_reenlaza_archivos_grandes_iguales(biblioteca_con_raiz, nuevo_libro, tmp_path):
+    biblioteca, raiz = biblioteca_con_raiz
+    datos = contenido_grande()
+    borrado = escribir(tmp_path / "fuera" / "libro.pdf", datos)
+    biblioteca.agregar_libro(nuevo_libro("libro", abspath=str(borrado), **app.datos_archivo(str(borrado))))
+    borrado.unlink()
+    copia = escribir(raiz / "copia.pdf", datos)
+    escribir(raiz / "otra_copia.pdf", datos)
+
+    resultado = biblioteca.verificar(procesos=2)
+
+    assert resultado["reenlazados"] == [("libro", str(borrado), str(copia))]
+
+def test_verificar_confirma_los_duplicados_byte_a_byte(biblioteca_con_raiz, nuevo_libro, tmp_path):
+    biblioteca, _ = biblioteca_con_raiz
+    datos = contenido_grande()
+    a = escribir(tmp_path / "a.pdf", datos)
+    b = escribir(tmp_path / "b.pdf", cambiar_fuera_de_la_muestra(datos))
+    c = escribir(tmp_path / "c.pdf", datos)
+    for titulo, ruta in (("a", a), ("b", b), ("c", c)):
+        biblioteca.agregar_libro(nuevo_libro(titulo, abspath=str(ruta), **app.datos_archivo(str(ruta))))
+
+    resultado = biblioteca.verificar(procesos=2)
+
+    assert len({encontrar(biblioteca, titulo)["hash"] for titulo in "abc"}) == 1
+    assert resultado["duplicados"] == [[("a", str(a)), ("c", str(c))]]
+
+def test_verificar_agrupa_libros_con_la_misma_ruta(biblioteca, nuevo_libro, tmp_path):
+    ruta = escribir(tmp_path / "libro.pdf", contenido_grande())
+    for titulo in ("original", "repetido"):
+        biblioteca.agregar_libro(nuevo_libro(titulo, abspath=str(ruta), **app.datos_archivo(str(ruta))))
+
+    assert biblioteca.verificar(procesos=2)["duplicados"] == [[("original", str(ruta)), ("repetido", str(ruta))]]
@@ -0,0 +1,116 @@
+"""Pruebas de la búsqueda de texto completo (FTS5) y del índice del contenido de los PDFs."""
+
+import sqlite3
+
+import app
+
+def titulos(resultados: list) -> list[str]:
+    return [fila["titulo"] for fila in resultados]
+
+def test_consulta_fts_entrecomilla_cada_palabra():
+    assert app.consulta_fts('  python "avanzado" NOT ') == '"python" """avanzado""" "NOT"'
+    assert app.consulta_fts("   ") == ""
+
+def test_buscar_ordena_por_relevancia(biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("cocina", descripcion="recetas con python de fondo"))
+    biblioteca.agregar_libro(nuevo_libro("python_avanzado", autor="Ramalho"))
+
+    resultados = biblioteca.buscar("Python")
+
+    # Una coincidencia en el título pesa más que una en la descripción
+    assert titulos(resultados) == ["python_avanzado", "cocina"]
+    assert "[python]" in resultados[1]["fragmento"]
+
+def test_buscar_exige_todas_las_palabras_y_no_distingue_tildes(biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("a", descripcion="programación en Rust"))
+    biblioteca.agregar_libro(nuevo_libro("b", descripcion="programacion en C"))
+
+    assert titulos(biblioteca.buscar("programacion rust")) == ["a"]
+    assert biblioteca.buscar('"') == []
+    assert biblioteca.buscar("") == []
+
+def test_buscar_respeta_el_limite(biblioteca, nuevo_libro):
+    for numero in range(5):
+        biblioteca.agregar_libro(nuevo_libro(f"libro_{numero}", descripcion="ballenas"))
+
+    assert len(biblioteca.buscar("ballenas", limite=3)) == 3
+
+def test_el_indice_sigue_a_la_tabla_de_libros(biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("dune", descripcion="arrakis"))
+    libro = biblioteca.buscar_libro("dune")
+    assert libro is not None
+    biblioteca.conexion.execute(
+        "INSERT INTO textos_pdf (libro_id, ruta, mtime, tamano, extractor) VALUES (?, 'x.pdf', 0, 0, 'pdftotext')",
+        (libro["id"],)
+    )
+
+    biblioteca.actualizar_libro(libro["id"], {"descripcion": "especia"})
+    assert biblioteca.buscar("arrakis") == []
+    assert titulos(biblioteca.buscar("especia")) == ["dune"]
+
+    biblioteca.eliminar_libro(libro["id"])
+    assert biblioteca.buscar("especia") == []
+    assert biblioteca.conexion.execute("SELECT COUNT(*) FROM textos_pdf").fetchone()[0] == 0
+
+def test_la_migracion_indexa_los_libros_existentes(ruta_db, tmp_path):
+    (tmp_path / "config").mkdir()
+    conexion = sqlite3.connect(ruta_db)
+    conexion.create_function("normalizar_titulo", 1, app.normalizar_titulo)
+    conexion.executescript(f"{app.MIGRACIONES[0]} {app.MIGRACIONES[1]} PRAGMA user_version = 2;")
+    conexion.execute("INSERT INTO libros (titulo, descripcion) VALUES ('cien_años', 'Macondo')")
+    conexion.commit()
+    conexion.close()
+
+    biblioteca = app.Biblioteca("pruebas", ruta_db)
+
+    assert titulos(biblioteca.buscar("macondo")) == ["cien_años"]
+    biblioteca.conexion.close()
+
+# =============================================================================
+# TEXTO DE LOS PDFS
+# =============================================================================
+
+def test_indice_de_texto_solo_extrae_pdfs_nuevos_o_modificados(monkeypatch, biblioteca, nuevo_libro, tmp_path):
+    extraidos = []
+
+    def extraer(ruta):
+        extraidos.append(ruta)
+        return open(ruta).read(), "prueba"
+
+    monkeypatch.setattr(app, "extraer_texto_pdf", extraer)
+    monkeypatch.setattr(app, "hay_extractor_pdf", lambda: True)
+    pdf = tmp_path / "libro.pdf"
+    pdf.write_text("capitulo sobre ballenas")
+    biblioteca.agregar_libro(nuevo_libro("moby", abspath=str(pdf)))
+    biblioteca.agregar_libro(nuevo_libro("perdido", abspath=str(tmp_path / "no_existe.pdf")))
+
+    assert biblioteca.actualizar_indice_de_texto() == (1, True)
+    assert titulos(biblioteca.buscar("ballenas")) == ["moby"]
+
+    # Sin cambios en el archivo no se vuelve a extraer
+    assert biblioteca.actualizar_indice_de_texto() == (0, True)
+    assert biblioteca.actualizar_indice_de_texto(forzar=True) == (1, True)
+
+    pdf.write_text("capitulo sobre calamares gigantes")
+    assert biblioteca.actualizar_indice_de_texto() == (1, True)
+    assert biblioteca.buscar("ballenas") == []
+    assert len(extraidos) == 3
+
+def test_indice_de_texto_sin_extractor(monkeypatch, biblioteca, nuevo_libro, tmp_path):
+    monkeypatch.setattr(app, "hay_extractor_pdf", lambda: False)
+    pdf = tmp_path / "libro.pdf"
+    pdf.write_text("x")
+    biblioteca.agregar_libro(nuevo_libro("moby", abspath=str(pdf)))
+
+    assert biblioteca.actualizar_indice_de_texto() == (0, False)
+
+def test_pdf_sin_texto_se_reintenta(monkeypatch, biblioteca, nuevo_libro, tmp_path):
+    monkeypatch.setattr(app, "extraer_texto_pdf", lambda ruta: None)
+    monkeypatch.setattr(app, "hay_extractor_pdf", lambda: True)
+    pdf = tmp_path / "escaneado.pdf"
+    pdf.write_text("x")
+    biblioteca.agregar_libro(nuevo_libro("escaneado", abspath=str(pdf)))
+
+    # Si la extracción falla no se guarda la firma: se vuelve a intentar la próxima vez
+    assert biblioteca.actualizar_indice_de_texto() == (1, True)
+    assert biblioteca.actualizar_indice_de_texto() == (1, True)
@@ -0,0 +1,166 @@
+"""Pruebas del almacenamiento en SQLite: migraciones, JSON antiguo, filtros de `listar` y búsqueda por título."""
+
+import json
+import sqlite3
+
+import pytest
+
+import app
+
+def encontrar(biblioteca: app.Biblioteca, titulo: str) -> dict:
+    libro = biblioteca.buscar_libro(titulo)
+    assert libro is not None, f"no se encontró {titulo!r}"
+    return libro
+
+# =============================================================================
+# MIGRACIONES
+# =============================================================================
+
+def test_base_nueva_llega_a_la_ultima_version(biblioteca):
+    conexion = biblioteca.conexion
+    tablas = {fila[0] for fila in conexion.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")}
+
+    assert conexion.execute("PRAGMA user_version").fetchone()[0] == len(app.MIGRACIONES)
+    assert {"libros", "idx_libros_autor_clave", "idx_libros_genero_clave", "idx_libros_estado"} <= tablas
+
+def test_migracion_desde_la_version_1(ruta_db, tmp_path):
+    # Base de datos creada por una versión anterior: solo la migración 1
+    (tmp_path / "config").mkdir()
+    conexion = sqlite3.connect(ruta_db)
+    conexion.executescript(f"{app.MIGRACIONES[0]} PRAGMA user_version = 1;")
+    conexion.execute("INSERT INTO libros (titulo, autor, genero) VALUES (?, ?, ?)",
+                     ("Cien_Años_de_Soledad", "Ángel García", "Novela"))
+    conexion.commit()
+    conexion.close()
+
+    biblioteca = app.Biblioteca("pruebas", ruta_db)
+    libro = encontrar(biblioteca, "cien años de soledad")
+
+    assert biblioteca.conexion.execute("PRAGMA user_version").fetchone()[0] == len(app.MIGRACIONES)
+    assert libro["titulo_clave"] == "cien_anos_de_soledad"
+    assert (libro["autor_clave"], libro["genero_clave"]) == ("ángel garcía", "novela")
+    assert libro["hash"] is None
+    biblioteca.conexion.close()
+
+def test_aplicar_migraciones_dos_veces_no_hace_nada(biblioteca):
+    biblioteca.aplicar_migraciones(biblioteca.conexion)
+
+    assert biblioteca.conexion.execute("PRAGMA user_version").fetchone()[0] == len(app.MIGRACIONES)
+
+def test_migracion_desde_json(json_temporal, ruta_db, nuevo_libro):
+    json_temporal.write_text(json.dumps([nuevo_libro("dune", autor="Herbert"), {}, nuevo_libro("solaris")]))
+
+    biblioteca = app.Biblioteca("pruebas", ruta_db)
+
+    assert biblioteca.contar_libros() == 2
+    assert encontrar(biblioteca, "dune")["autor"] == "Herbert"
+    assert not json_temporal.exists()
+    assert json_temporal.with_name("biblioteca_cli.json.migrado").exists()
+    biblioteca.conexion.close()
+
+def test_el_json_no_se_migra_sobre_una_base_existente(json_temporal, biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("dune"))
+    biblioteca.conexion.close()
+    json_temporal.write_text(json.dumps([nuevo_libro("solaris")]))
+
+    otra = app.Biblioteca("pruebas", biblioteca._ruta_db)
+
+    assert otra.contar_libros() == 1
+    assert json_temporal.exists()
+    otra.conexion.close()
+
+# =============================================================================
+# FILTROS
+# =============================================================================
+
+def test_plegar():
+    assert app.plegar("Ángel") == "ángel"
+    assert app.plegar("STRASSE") == app.plegar("Straße")
+    assert app.plegar(None) is None
+
+def test_filtrar_libros_sin_distinguir_mayusculas(biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("a", autor="Le Guin", prioridad="baja"))
+    biblioteca.agregar_libro(nuevo_libro("b", autor="le guin", prioridad="importante"))
+    biblioteca.agregar_libro(nuevo_libro("c", autor="Lem", prioridad="media"))
+
+    assert [l["titulo"] for l in biblioteca.filtrar_libros(autor="LE GUIN")] == ["a", "b"]
+    assert [l["titulo"] for l in biblioteca.filtrar_libros(prioridad="MEDIA")] == ["c"]
+    assert [l["titulo"] for l in biblioteca.filtrar_libros(ordenar_por_prioridad=True)] == ["b", "c", "a"]
+
+def test_filtrar_libros_pliega_mayusculas_fuera_de_ascii(biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("a", autor="Ángel González", genero="Poesía"))
+    biblioteca.agregar_libro(nuevo_libro("b", autor="ÁNGEL GONZÁLEZ", genero="POESÍA"))
+    biblioteca.agregar_libro(nuevo_libro("c", autor="Angel Gonzalez"))
+
+    assert [l["titulo"] for l in biblioteca.filtrar_libros(autor="ángel gonzález")] == ["a", "b"]
+    assert [l["titulo"] for l in biblioteca.filtrar_libros(genero="poesía")] == ["a", "b"]
+    # Las tildes sí cuentan, como con el .lower() de la versión en JSON
+    assert [l["titulo"] for l in biblioteca.filtrar_libros(autor="angel gonzalez")] == ["c"]
+
+def test_actualizar_libro_mantiene_las_claves_de_filtro(biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("dune", autor="Herbert"))
+    libro = encontrar(biblioteca, "dune")
+
+    biblioteca.actualizar_libro(libro["id"], {"autor": "Émile Zola", "genero": "Ñu"})
+
+    assert [l["titulo"] for l in biblioteca.filtrar_libros(autor="ÉMILE ZOLA", genero="ñu")] == ["dune"]
+    assert biblioteca.filtrar_libros(autor="herbert") == []
+
+# =============================================================================
+# BÚSQUEDA POR TÍTULO
+# =============================================================================
+
+@pytest.mark.parametrize("titulo, clave", [
+    ("Cien Años de Soledad", "cien_anos_de_soledad"),
+    ("cien_años_de_soledad", "cien_anos_de_soledad"),
+    ("  El   Señor  de los Anillos ", "el_senor_de_los_anillos"),
+    ("STRASSE", "strasse"),
+    ("", ""),
+])
+def test_normalizar_titulo(titulo, clave):
+    assert app.normalizar_titulo(titulo) == clave
+
+def test_buscar_libro_ignora_mayusculas_tildes_y_espacios(biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("el_señor_de_los_anillos"))
+
+    assert encontrar(biblioteca, "El Senor de los Anillos")["titulo"] == "el_señor_de_los_anillos"
+    assert biblioteca.buscar_libro("el hobbit") is None
+    assert biblioteca.buscar_libros_por_titulo("el hobbit") is None
+
+def test_buscar_libro_usa_el_indice(biblioteca):
+    plan = biblioteca.conexion.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM libros WHERE titulo_clave = ? ORDER BY id LIMIT 1", ("x",)
+    ).fetchall()
+
+    assert any("idx_libros_titulo_clave" in fila["detail"] for fila in plan)
+
+def test_actualizar_libro_por_id(biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("dune"))
+    # Otro libro con el mismo título: solo se modifica el indicado
+    biblioteca.agregar_libro(nuevo_libro("dune"))
+    primero, segundo = biblioteca.filtrar_libros()
+
+    biblioteca.actualizar_libro(segundo["id"], {"titulo": "Dune Mesías"})
+
+    assert encontrar(biblioteca, "dune")["id"] == primero["id"]
+    assert encontrar(biblioteca, "dune mesias")["id"] == segundo["id"]
+
+def test_eliminar_libro_por_id(biblioteca, nuevo_libro):
+    biblioteca.agregar_libro(nuevo_libro("dune"))
+    biblioteca.agregar_libro(nuevo_libro("dune"))
+    primero, segundo = biblioteca.filtrar_libros()
+
+    biblioteca.eliminar_libro(primero["id"])
+
+    assert biblioteca.contar_libros() == 1
+    assert encontrar(biblioteca, "dune")["id"] == segundo["id"]
+
+def test_modificar_libro_desde_el_cli(monkeypatch, biblioteca, nuevo_libro):
+    monkeypatch.setattr(app, "BIBLIOTECA_PRINCIPAL", biblioteca)
+    biblioteca.agregar_libro(nuevo_libro("cien_años_de_soledad"))
+
+    app.modificar_libro("Cien Años de Soledad", nuevo_autor="García Márquez", nuevo_estado="LEIDO")
+
+    libro = encontrar(biblioteca, "cien anos de soledad")
+    assert libro["autor"] == "García Márquez"
+    assert libro["estado"] == "leido"
@@ -0,0 +1,175 @@
+"""
+Creación de proyectos en lote a partir de un manifiesto (matrices de CI).
+
+Un manifiesto YAML describe todos los proyectos de una ejecución:
+
+    prefix: ci                # opcional, por defecto el nombre del archivo
+    password: secreto         # opcional, contraseña del usuario en todos
+    ttl: 2h                   # opcional, como `harbor new --ttl`
+    fast: true                # opcional, valor por defecto de cada proyecto
+
+    matrix:                   # producto imagen x versión
+      image: [postgres, mysql]
+      version: ["15", "16"]   # entre comillas: 16.10 en YAML es el número 16.1
+
+    projects:                 # proyectos sueltos, además de la matriz
+      - name: legado
+        image: postgres
+        version: "12"
+        memory: 512m
+
+Los proyectos de la matriz se llaman <prefix>-<imagen>-<versión>
+(ej: ci-postgres-16); los sueltos usan su `name`.
+"""
+
+import re
+import itertools
+from typing import Optional
+from pathlib import Path
+from dataclasses import dataclass
+
+from engines import get_profile
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+# Claves admitidas en cada proyecto de `projects`
+PROJECT_KEYS = {"name", "image", "version", "port", "fast", "memory", "cpus"}
+
+# Claves de proyecto que también valen como valor por defecto en la raíz
+DEFAULT_KEYS = {"fast", "memory", "cpus"}
+
+# Claves admitidas en la raíz del manifiesto
+TOP_LEVEL_KEYS = {"prefix", "password", "ttl", "matrix", "projects"} | DEFAULT_KEYS
+
+# Caracteres válidos en un nombre de proyecto generado
+NAME_UNSAFE_PATTERN = re.compile(r"[^A-Za-z0-9_-]+")
+
+class BatchError(Exception):
+    """Error en la definición de un manifiesto de lote."""
+
+@dataclass
+class BatchProject:
+    """Un proyecto a crear dentro del lote."""
+    name: str
+    image: str
+    version: str = "latest"
+    port: Optional[int] = None
+    fast: bool = False
+    memory: Optional[str] = None
+    cpus: Optional[float] = None
+
+    @property
+    def preferred_port(self) -> int:
+        """Puerto del host con el que empieza la búsqueda."""
+        return self.port or get_profile(self.image).default_port
+
+@dataclass
+class BatchSpec:
+    """Manifiesto completo, ya expandido."""
+    projects: list[BatchProject]
+    password: str = "password"
+    ttl: Optional[str] = None
+
+# =============================================================================
+# LECTURA DEL MANIFIESTO
+# =============================================================================
+
+def matrix_project_name(prefix: str, image: str, version: str) -> str:
+    """Nombre de un proyecto de la matriz (ej: ci-postgres-16)."""
+    return NAME_UNSAFE_PATTERN.sub("-", f"{prefix}-{image.rsplit('/', 1)[-1]}-{version}").strip("-")
+
+def _as_list(value, key: str) -> list[str]:
+    """Acepta un valor suelto o una lista en un eje de la matriz."""
+    values = value if isinstance(value, list) else [value]
+    if not values or any(item is None or isinstance(item, (dict, list)) for item in values):
+        raise BatchError(f"matrix.{key} debe ser un valor o una lista de valores")
+    return [str(item) for item in values]
+
+def _build_project(options: dict, defaults: dict, where: str) -> BatchProject:
+    """Valida las claves de un proyecto y aplica los valores por defecto."""
+    unknown = set(options) - PROJECT_KEYS
+    if unknown:
+        raise BatchError(f"Claves desconocidas en {where}: {', '.join(sorted(unknown))}")
+    if not options.get("image"):
+        raise BatchError(f"{where} necesita una clave image")
+
+    fields = {**defaults, **options}
+    fields["version"] = str(fields.get("version", "latest"))
+    project = BatchProject(**fields)
+
+    if not project.preferred_port:
+        raise BatchError(f"{where} usa {project.image}, sin puerto conocido: indica port")
+    return project
+
+def load_batch(path: Path) -> BatchSpec:
+    """
+    Lee, valida y expande un manifiesto de lote.
+
+    Args:
+        path: Archivo YAML con la matriz y/o la lista de proyectos
+
+    Returns:
+        BatchSpec: Proyectos de la matriz seguidos de los sueltos
+
+    Raises:
+        BatchError: Si el archivo no existe, no es YAML válido, le faltan datos
+                    o dos proyectos acaban con el mismo nombre
+    """
+    # PyYAML solo hace falta con --batch; no se carga en cada arranque
+    import yaml
+
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f)
+    except OSError as e:
+        raise BatchError(f"No se pudo leer {path}: {e.strerror}") from e
+    except yaml.YAMLError as e:
+        raise BatchError(f"{path} no es YAML válido: {e}") from e
+
+    if not isinstance(data, dict):
+        raise BatchError(f"{path} debe ser un mapa con matrix y/o projects")
+
+    unknown = set(data) - TOP_LEVEL_KEYS
+    if unknown:
+        raise BatchError(f"Claves desconocidas en {path}: {', '.join(sorted(unknown))}")
+
+    prefix = str(data.get("prefix") or path.stem)
+    defaults = {key: data[key] for key in DEFAULT_KEYS if key in data}
+    projects = []
+
+    matrix = data.get("matrix")
+    if matrix is not None:
+        if not isinstance(matrix, dict) or not matrix.get("image"):
+            raise BatchError("matrix necesita al menos una lista image")
+        if set(matrix) - {"image", "version"}:
+            raise BatchError("matrix solo admite los ejes image y version")
+
+        images = _as_list(matrix["image"], "image")
+        versions = _as_list(matrix.get("version", "latest"), "version")
+        for image, version in itertools.product(images, versions):
+            name = matrix_project_name(prefix, image, version)
+            projects.append(_build_project(
+                {"name": name, "image": image, "version": version}, defaults, f"matrix ({image}:{version})"
+            ))
+
+    for index, options in enumerate(data.get("projects") or []):
+        if not isinstance(options, dict) or not options.get("name"):
+            raise BatchError(f"projects[{index}] necesita una clave name")
+        projects.append(_build_project(dict(options, name=str(options["name"])), defaults, f"'{options['name']}'"))
+
+    if not projects:
+        raise BatchError(f"{path} no define ningún proyecto (usa matrix o projects)")
+
+    seen = set()
+    for project in projects:
+        if project.name in seen:
+            raise BatchError(f"El proyecto '{project.name}' aparece dos veces en el manifiesto")
+        seen.add(project.name)
+
+    return BatchSpec(
+        projects=projects,
+        password=str(data.get("password", "password")),
+        ttl=data.get("ttl"),
+    )
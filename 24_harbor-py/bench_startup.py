@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque de Harbor basado en `python -X importtime`.
+
+Ejecuta los comandos de la vía rápida (y uno del CLI completo como
+referencia) varias veces, mide el tiempo de pared y el tiempo total de
+importación, y falla si algún comando rápido supera el presupuesto o
+carga módulos pesados (typer, rich, yaml). Pensado para correr a mano o en
+CI antes de un release:
+
+    python bench_startup.py
+    python bench_startup.py --runs 20 --budget-scale 2 --top 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+HARBOR_SCRIPT = Path(__file__).resolve().parent / "harbor.py"
+
+# Comando -> presupuesto de importación en ms (None: CLI completo, solo referencia)
+CASES = {
+    "--version": 25,
+    "list --json": 50,
+    "ports": 100,
+    "--help": None,
+}
+
+# Módulos que la vía rápida nunca debe importar
+FORBIDDEN_MODULES = ("typer", "rich", "yaml", "click")
+
+def run_importtime(args: list[str]) -> tuple[int, dict[str, int], set[str]]:
+    """
+    Ejecuta harbor con -X importtime.
+
+    Returns:
+        tuple: (µs de importación acumulados, µs por módulo de primer nivel, módulos cargados)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(HARBOR_SCRIPT), *args],
+        capture_output=True, text=True, env={**os.environ, "COLUMNS": "120"}
+    )
+
+    top_level = {}
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        module = name.strip()
+        modules.add(module.split(".")[0])
+        # Los módulos de primer nivel no llevan sangría; su acumulado incluye a sus hijos
+        if not name[1:].startswith(" "):
+            top_level[module] = int(cumulative_us)
+
+    return sum(top_level.values()), top_level, modules
+
+def run_wall(args: list[str]) -> float:
+    """Tiempo de pared de una ejecución, en milisegundos."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(HARBOR_SCRIPT), *args], capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Mide el arranque de los comandos de Harbor")
+    parser.add_argument("--runs", type=int, default=10, help="Ejecuciones por comando (se toma la mediana)")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiplica los presupuestos (máquinas lentas)")
+    parser.add_argument("--top", type=int, default=3, help="Módulos más pesados a mostrar por comando")
+    options = parser.parse_args()
+
+    failures = []
+    print(f"{'comando':<14} {'pared (ms)':>11} {'imports (ms)':>13}  más pesados")
+
+    for command, budget in CASES.items():
+        args = command.split()
+        walls = [run_wall(args) for _ in range(options.runs)]
+        samples = [run_importtime(args) for _ in range(options.runs)]
+
+        import_ms = statistics.median(total for total, _, _ in samples) / 1000
+        _, top_level, modules = samples[-1]
+        heaviest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:options.top]
+        heaviest_text = ", ".join(f"{name} {us / 1000:.1f}" for name, us in heaviest)
+
+        print(f"{command:<14} {statistics.median(walls):>11.1f} {import_ms:>13.1f}  {heaviest_text}")
+
+        if budget is None:
+            continue
+        budget *= options.budget_scale
+        if import_ms > budget:
+            failures.append(f"'{command}' importa en {import_ms:.1f} ms (presupuesto {budget:.0f} ms)")
+        loaded = sorted(set(FORBIDDEN_MODULES) & modules)
+        if loaded:
+            failures.append(f"'{command}' carga {', '.join(loaded)} aunque debería ir por la vía rápida")
+
+    for failure in failures:
+        print(f"❌ {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
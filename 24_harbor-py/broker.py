@@ -0,0 +1,396 @@
+"""
+Broker de conexiones persistentes para `harbor query` y `harbor shell`.
+
+Un proceso en segundo plano escucha en un socket Unix y mantiene abierta
+una sesión por contenedor, que sobrevive a las invocaciones del CLI:
+
+- Postgres, MySQL/MariaDB y MongoDB: un único `docker exec -i` con el
+  cliente del motor (psql, mysql, mongosh). Tras cada consulta se envía un
+  comando que imprime un marcador único; la salida hasta el marcador es el
+  resultado. Así cada consulta se ahorra lanzar docker exec, el cliente y
+  la conexión.
+- Redis: una conexión TCP directa al puerto publicado, hablando RESP.
+
+El protocolo entre CLI y broker es una línea JSON por petición y otra por
+respuesta. El broker se apaga solo tras un rato sin peticiones.
+"""
+
+import os
+import json
+import time
+import uuid
+import shlex
+import socket
+import select
+import threading
+import subprocess
+import socketserver
+from typing import BinaryIO, Optional, Protocol
+from pathlib import Path
+
+from settings import BROKER_IDLE_TIMEOUT, QUERY_TIMEOUT
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+BROKER_SOCKET = ".broker.sock"
+
+# Segundos de espera a que arranque un broker recién lanzado
+BROKER_START_TIMEOUT = 5
+
+# Prefijos de línea que indican error en la salida de los clientes
+ERROR_PREFIXES = ("ERROR", "FATAL", "MongoServerError", "MongoshInvalidInputError", "SyntaxError", "ReferenceError")
+
+# Campos del registro de un proyecto que necesita una sesión
+CONNECTION_FIELDS = ("image", "container_name", "port", "database", "system_user", "root_password")
+
+class BrokerError(Exception):
+    """Error al hablar con el broker o al ejecutar una consulta."""
+
+# =============================================================================
+# SESIONES POR MOTOR
+# =============================================================================
+
+class Session(Protocol):
+    """Lo que el servidor necesita de una sesión, sea cual sea el motor."""
+    record: dict
+
+    def execute(self, query: str, timeout: float = QUERY_TIMEOUT) -> str: ...
+
+    def close(self): ...
+
+class ExecSession:
+    """Cliente del motor corriendo dentro del contenedor con `docker exec -i`."""
+
+    def __init__(self, record: dict):
+        self.record = record
+        self.engine = record.get("image", "")
+        self.process: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()
+
+    def command(self) -> list[str]:
+        """Comando docker exec que abre el cliente interactivo del motor."""
+        container = self.record["container_name"]
+        database = self.record.get("database", "")
+
+        if self.engine == "postgres":
+            client = ["psql", "-X", "-q", "-P", "pager=off",
+                      "-U", self.record.get("system_user", "postgres"), "-d", database]
+            # psql usa stdio con buffer completo en una tubería: stdbuf lo fuerza por líneas si existe
+            wrapper = ["sh", "-c", 'command -v stdbuf >/dev/null && exec stdbuf -oL "$@" || exec "$@"', "sh"]
+            return ["docker", "exec", "-i", container, *wrapper, *client]
+
+        if self.engine in ("mysql", "mariadb"):
+            client = "mariadb" if self.engine == "mariadb" else "mysql"
+            return ["docker", "exec", "-i", "-e", f"MYSQL_PWD={self.record.get('root_password', '')}",
+                    container, client, "-uroot", "--batch", "--unbuffered", "--force", database]
+
+        if self.engine == "mongo":
+            return ["docker", "exec", "-i", container, "mongosh", "--quiet", "--norc",
+                    "-u", "root", "-p", self.record.get("root_password", ""),
+                    "--authenticationDatabase", "admin", database]
+
+        raise BrokerError(f"{self.engine or 'imagen desconocida'} no admite consultas")
+
+    def _sentinel(self, marker: str) -> str:
+        """Comando del cliente que imprime el marcador de fin de resultado."""
+        if self.engine == "postgres":
+            return f"\\echo {marker}\n"
+        if self.engine in ("mysql", "mariadb"):
+            return f"SELECT '{marker}' AS harbor_sentinel;\n"
+        return f"print('{marker}')\n"
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                self.command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+            )
+        return self.process
+
+    def execute(self, query: str, timeout: float = QUERY_TIMEOUT) -> str:
+        """
+        Ejecuta una consulta en la sesión y devuelve su salida.
+
+        Raises:
+            BrokerError: Si el cliente termina o no responde a tiempo
+        """
+        query = query.strip()
+        if self.engine != "mongo" and not query.endswith(";") and not query.startswith("\\"):
+            # Sin ';' el cliente esperaría más líneas y el marcador quedaría dentro de la consulta
+            query += ";"
+
+        marker = f"__HARBOR_DONE_{uuid.uuid4().hex}__"
+        with self.lock:
+            process = self._ensure_started()
+            assert process.stdin is not None and process.stdout is not None
+            try:
+                process.stdin.write(f"{query}\n{self._sentinel(marker)}".encode())
+                process.stdin.flush()
+            except BrokenPipeError as e:
+                raise BrokerError(self._exit_message()) from e
+            return self._read_until(process.stdout.fileno(), marker, timeout)
+
+    def _read_until(self, fd: int, marker: str, timeout: float) -> str:
+        deadline = time.monotonic() + timeout
+        buffer = b""
+        needle = marker.encode()
+
+        while needle not in buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                raise BrokerError(f"La consulta superó {timeout:.0f}s; se reinicia la sesión")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise BrokerError(self._exit_message(buffer))
+            buffer += chunk
+
+        lines = buffer.split(needle, 1)[0].decode(errors="replace").splitlines()
+        if self.engine in ("mysql", "mariadb") and lines and lines[-1] == "harbor_sentinel":
+            lines.pop()
+        return "\n".join(lines)
+
+    def _exit_message(self, output: bytes = b"") -> str:
+        code = self.process.wait() if self.process else None
+        detail = output.decode(errors="replace").strip().splitlines()
+        return detail[-1] if detail else f"El cliente terminó con código {code}"
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+class RedisSession:
+    """Conexión TCP persistente a Redis usando el protocolo RESP."""
+
+    def __init__(self, record: dict):
+        self.record = record
+        self.sock: Optional[socket.socket] = None
+        self.reader: Optional[BinaryIO] = None
+        self.lock = threading.Lock()
+
+    def _ensure_connected(self) -> tuple[socket.socket, BinaryIO]:
+        if self.sock is None or self.reader is None:
+            self.sock = socket.create_connection(("127.0.0.1", int(self.record["port"])), timeout=QUERY_TIMEOUT)
+            self.reader = self.sock.makefile("rb")
+        return self.sock, self.reader
+
+    def execute(self, query: str, timeout: float = QUERY_TIMEOUT) -> str:
+        try:
+            args = shlex.split(query)
+        except ValueError as e:
+            raise BrokerError(f"Comando inválido: {e}") from e
+        if not args:
+            return ""
+
+        payload = f"*{len(args)}\r\n".encode()
+        for arg in args:
+            data = arg.encode()
+            payload += b"$%d\r\n%s\r\n" % (len(data), data)
+
+        with self.lock:
+            try:
+                sock, reader = self._ensure_connected()
+                sock.settimeout(timeout)
+                sock.sendall(payload)
+                return _format_resp(self._read_reply(reader))
+            except OSError as e:
+                self.close()
+                raise BrokerError(f"Conexión con Redis perdida: {e}") from e
+
+    def _read_reply(self, reader: BinaryIO):
+        line = reader.readline()
+        if not line:
+            raise ConnectionResetError("Redis cerró la conexión")
+        kind, body = line[:1], line[1:-2].decode(errors="replace")
+        if kind == b"+":
+            return RedisStatusReply(body)
+        if kind == b"-":
+            return RedisErrorReply(body)
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            size = int(body)
+            return None if size < 0 else reader.read(size + 2)[:-2].decode(errors="replace")
+        if kind == b"*":
+            size = int(body)
+            return None if size < 0 else [self._read_reply(reader) for _ in range(size)]
+        raise ConnectionResetError(f"Respuesta RESP inesperada: {line!r}")
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+        self.sock = None
+        self.reader = None
+
+class RedisStatusReply(str):
+    """Respuesta de estado de Redis (+OK), que redis-cli muestra sin comillas."""
+
+class RedisErrorReply(str):
+    """Respuesta de error de Redis."""
+
+def _format_resp(reply, indent: str = "") -> str:
+    """Formatea una respuesta RESP como lo hace redis-cli."""
+    if isinstance(reply, RedisErrorReply):
+        return f"(error) {reply}"
+    if reply is None:
+        return "(nil)"
+    if isinstance(reply, int):
+        return f"(integer) {reply}"
+    if isinstance(reply, list):
+        if not reply:
+            return "(empty array)"
+        return "\n".join(f"{indent}{i}) {_format_resp(item, indent + '   ')}" for i, item in enumerate(reply, 1))
+    if isinstance(reply, RedisStatusReply):
+        return reply
+    return json.dumps(reply, ensure_ascii=False)
+
+def create_session(record: dict) -> Session:
+    """Crea la sesión adecuada para el motor del proyecto."""
+    if record.get("image") == "redis":
+        return RedisSession(record)
+    return ExecSession(record)
+
+def output_has_error(output: str) -> bool:
+    """Indica si la salida de una consulta contiene un error del motor."""
+    return any(line.lstrip().startswith(ERROR_PREFIXES) or line.startswith("(error)") for line in output.splitlines())
+
+# =============================================================================
+# SERVIDOR
+# =============================================================================
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "BrokerServer"
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        response = self.server.dispatch(request)
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+class BrokerServer(socketserver.ThreadingUnixStreamServer):
+    """Servidor del broker: una sesión por contenedor, compartida entre peticiones."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, idle_timeout: float = BROKER_IDLE_TIMEOUT):
+        socket_path.unlink(missing_ok=True)
+        super().__init__(str(socket_path), _Handler)
+        os.chmod(socket_path, 0o600)
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.sessions: dict[str, Session] = {}
+        self.sessions_lock = threading.Lock()
+        self.last_activity = time.monotonic()
+
+    def dispatch(self, request: dict) -> dict:
+        self.last_activity = time.monotonic()
+
+        if request.get("op") == "ping":
+            return {"ok": True, "output": "", "sessions": len(self.sessions)}
+
+        if request.get("op") == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True, "output": "", "sessions": len(self.sessions)}
+
+        record = request.get("record") or {}
+        key = record.get("container_name") or f"{record.get('image')}:{record.get('port')}"
+        with self.sessions_lock:
+            session = self.sessions.get(key)
+            if session is None or session.record != record:
+                if session is not None:
+                    session.close()
+                session = self.sessions[key] = create_session(record)
+
+        start = time.monotonic()
+        try:
+            output = session.execute(request.get("query", ""), float(request.get("timeout", QUERY_TIMEOUT)))
+        except BrokerError as e:
+            return {"ok": False, "output": "", "error": str(e), "seconds": time.monotonic() - start}
+
+        self.last_activity = time.monotonic()
+        return {"ok": not output_has_error(output), "output": output, "error": "", "seconds": time.monotonic() - start}
+
+    def _watch_idle(self):
+        while True:
+            time.sleep(min(30, self.idle_timeout))
+            if time.monotonic() - self.last_activity >= self.idle_timeout:
+                self.shutdown()
+                return
+
+    def serve(self):
+        """Atiende peticiones hasta el apagado y cierra todas las sesiones."""
+        threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            self.serve_forever()
+        finally:
+            for session in self.sessions.values():
+                session.close()
+            self.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+# =============================================================================
+# CLIENTE
+# =============================================================================
+
+def send_request(socket_path: Path, request: dict, timeout: float = QUERY_TIMEOUT + 5) -> dict:
+    """
+    Envía una petición al broker y devuelve su respuesta.
+
+    Raises:
+        ConnectionError / FileNotFoundError: Si el broker no está escuchando
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise BrokerError("El broker cerró la conexión sin responder")
+    return json.loads(line)
+
+def connection_record(record: dict) -> dict:
+    """Campos del registro que identifican una sesión; si cambian, el broker la reabre."""
+    return {key: record.get(key) for key in CONNECTION_FIELDS}
+
+def run_query(socket_path: Path, record: dict, query: str, spawn_command: list[str], timeout: float = QUERY_TIMEOUT) -> dict:
+    """
+    Ejecuta una consulta a través del broker, arrancándolo si no está corriendo.
+
+    Args:
+        socket_path: Socket Unix del broker
+        record: Registro del proyecto (motor, contenedor, credenciales, puerto)
+        query: Consulta SQL, expresión de mongosh o comando de Redis
+        spawn_command: Comando que arranca el broker en segundo plano
+        timeout: Segundos máximos de la consulta
+
+    Returns:
+        dict: {"ok", "output", "error", "seconds"}
+
+    Raises:
+        BrokerError: Si el broker no arranca
+    """
+    request = {"op": "query", "record": connection_record(record), "query": query, "timeout": timeout}
+    try:
+        return send_request(socket_path, request, timeout + 5)
+    except (FileNotFoundError, ConnectionRefusedError):
+        pass
+
+    subprocess.Popen(spawn_command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+
+    deadline = time.monotonic() + BROKER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            return send_request(socket_path, request, timeout + 5)
+        except (FileNotFoundError, ConnectionRefusedError):
+            time.sleep(0.05)
+    raise BrokerError(f"El broker no arrancó en {BROKER_START_TIMEOUT}s ({socket_path})")
@@ -0,0 +1,476 @@
+"""
+Cliente mínimo de la API de Docker Engine para Harbor.
+
+Habla HTTP directamente sobre el socket Unix del daemon, de modo que una
+sola petición reemplaza a los `docker ps` repetidos. Si el socket no está
+accesible, se recurre a una única llamada a `docker ps -a --format json`.
+"""
+
+import os
+import re
+import json
+import socket
+import subprocess
+import http.client
+from typing import Optional
+from datetime import datetime
+from dataclasses import dataclass, field, asdict
+from urllib.parse import urlencode
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+# Socket por defecto del daemon de Docker en Linux
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+
+# Segundos máximos de espera para una petición a la API
+API_TIMEOUT = 10
+
+# Segundos máximos sin datos en un endpoint de streaming (stats llega cada ~1s)
+STREAM_TIMEOUT = 30
+
+# Formato de puertos de `docker ps`: "0.0.0.0:5432->5432/tcp" o rangos "8000-8001->8000-8001/tcp"
+CLI_PORT_PATTERN = re.compile(r":(\d+)(?:-(\d+))?->(\d+)(?:-(\d+))?/(\w+)")
+
+class DockerUnavailableError(Exception):
+    """Docker no responde ni por el socket ni por la CLI."""
+
+# =============================================================================
+# TRANSPORTE HTTP SOBRE SOCKET UNIX
+# =============================================================================
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """Conexión HTTP que usa un socket Unix en lugar de TCP."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = API_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+def get_docker_socket() -> str:
+    """Devuelve la ruta del socket del daemon respetando DOCKER_HOST=unix://..."""
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://"):]
+    return DEFAULT_DOCKER_SOCKET
+
+def api_request(method: str, path: str, params: Optional[dict] = None, timeout: Optional[float] = API_TIMEOUT):
+    """
+    Realiza una petición a la API de Docker Engine y devuelve el JSON decodificado.
+
+    Args:
+        method: Método HTTP (GET, POST, DELETE)
+        path: Ruta del endpoint (ej: /containers/json)
+        params: Parámetros de query string opcionales
+        timeout: Segundos de espera antes de abortar
+
+    Returns:
+        El cuerpo de la respuesta decodificado, o None si viene vacío
+
+    Raises:
+        DockerUnavailableError: Si el socket no existe o la API responde con error
+    """
+    if params:
+        path = f"{path}?{urlencode(params)}"
+
+    conn = UnixHTTPConnection(get_docker_socket(), timeout=timeout)
+    try:
+        conn.request(method, path)
+        response = conn.getresponse()
+        body = response.read()
+    except OSError as e:
+        raise DockerUnavailableError(f"No se pudo contactar el socket de Docker: {e}") from e
+    finally:
+        conn.close()
+
+    if response.status >= 400:
+        raise DockerUnavailableError(f"La API de Docker respondió {response.status}: {body.decode(errors='replace')}")
+
+    return json.loads(body) if body else None
+
+def api_stream(method: str, path: str, params: Optional[dict] = None, timeout: Optional[float] = STREAM_TIMEOUT):
+    """
+    Abre un endpoint de streaming de la API y devuelve cada objeto JSON recibido.
+
+    La conexión se mantiene abierta mientras se consuma el generador; Docker
+    envía un objeto por línea (stats, events).
+
+    Args:
+        method: Método HTTP
+        path: Ruta del endpoint (ej: /containers/<id>/stats)
+        params: Parámetros de query string opcionales
+        timeout: Segundos máximos sin recibir datos
+
+    Yields:
+        dict: Cada objeto JSON del flujo
+
+    Raises:
+        DockerUnavailableError: Si el socket no existe o la API responde con error
+    """
+    if params:
+        path = f"{path}?{urlencode(params)}"
+
+    conn = UnixHTTPConnection(get_docker_socket(), timeout=timeout)
+    try:
+        try:
+            conn.request(method, path)
+            response = conn.getresponse()
+        except OSError as e:
+            raise DockerUnavailableError(f"No se pudo contactar el socket de Docker: {e}") from e
+
+        if response.status >= 400:
+            body = response.read().decode(errors="replace")
+            raise DockerUnavailableError(f"La API de Docker respondió {response.status}: {body}")
+
+        while True:
+            try:
+                line = response.readline()
+            except OSError as e:
+                raise DockerUnavailableError(f"Se perdió la conexión con Docker: {e}") from e
+            if not line:
+                return
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        conn.close()
+
+# =============================================================================
+# SNAPSHOT DE CONTENEDORES
+# =============================================================================
+
+@dataclass
+class PortMapping:
+    """Puerto publicado por un contenedor en el host."""
+    host_port: int
+    container_port: int
+    protocol: str = "tcp"
+
+@dataclass
+class ContainerInfo:
+    """Datos de un contenedor tal y como los reporta Docker."""
+    id: str
+    name: str
+    image: str
+    state: str
+    status: str
+    created: str = ""
+    ports: list[PortMapping] = field(default_factory=list)
+    labels: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def running(self) -> bool:
+        return self.state == "running"
+
+    @property
+    def ports_text(self) -> str:
+        """Puertos en formato legible, al estilo de `docker ps`."""
+        return ", ".join(f"{p.host_port}->{p.container_port}/{p.protocol}" for p in self.ports)
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        """Fecha de creación como datetime local, o None si no se conoce."""
+        try:
+            return datetime.fromisoformat(self.created)
+        except ValueError:
+            return None
+
+    def to_dict(self) -> dict:
+        """Representación serializable a JSON."""
+        return asdict(self)
+
+@dataclass
+class DockerSnapshot:
+    """
+    Fotografía en memoria de los contenedores del host.
+
+    Se construye con una sola consulta y la comparten la selección de
+    puertos, `list` y `clean`, evitando lanzar un proceso por cada consulta.
+    """
+    containers: list[ContainerInfo]
+    source: str = "api"
+
+    def __post_init__(self):
+        self.used_ports = {
+            mapping.host_port
+            for container in self.containers
+            for mapping in container.ports
+        }
+
+    def is_port_used(self, port: int) -> bool:
+        """Indica si algún contenedor publica el puerto dado en el host."""
+        return port in self.used_ports
+
+    @property
+    def running(self) -> list[ContainerInfo]:
+        return [c for c in self.containers if c.running]
+
+    @property
+    def stopped(self) -> list[ContainerInfo]:
+        return [c for c in self.containers if not c.running]
+
+    def filter(self, image: Optional[str] = None, status: Optional[str] = None) -> list[ContainerInfo]:
+        """
+        Filtra los contenedores del snapshot.
+
+        Args:
+            image: Texto contenido en el nombre de la imagen (ej: postgres)
+            status: Estado exacto de Docker (running, exited, paused, created...)
+
+        Returns:
+            list[ContainerInfo]: Contenedores que cumplen todos los filtros
+        """
+        return [
+            c for c in self.containers
+            if (image is None or image in c.image)
+            and (status is None or c.state == status)
+        ]
+
+def _container_from_api(data: dict) -> ContainerInfo:
+    """Convierte un elemento de /containers/json en ContainerInfo."""
+    ports = []
+    seen = set()
+    for port in data.get("Ports") or []:
+        if "PublicPort" not in port:
+            continue
+        # Docker repite cada puerto para IPv4 e IPv6
+        key = (port["PublicPort"], port["PrivatePort"], port.get("Type", "tcp"))
+        if key not in seen:
+            seen.add(key)
+            ports.append(PortMapping(*key))
+
+    names = data.get("Names") or [""]
+    return ContainerInfo(
+        id=data.get("Id", ""),
+        name=names[0].lstrip("/"),
+        image=data.get("Image", ""),
+        state=data.get("State", ""),
+        status=data.get("Status", ""),
+        created=datetime.fromtimestamp(data["Created"]).isoformat(timespec="seconds") if data.get("Created") else "",
+        ports=ports,
+        labels=data.get("Labels") or {},
+    )
+
+def parse_cli_ports(ports_text: str) -> list[PortMapping]:
+    """
+    Interpreta la columna Ports de `docker ps`.
+
+    Args:
+        ports_text: Texto como "0.0.0.0:5432->5432/tcp, :::5432->5432/tcp"
+
+    Returns:
+        list[PortMapping]: Puertos publicados, sin duplicados IPv4/IPv6
+    """
+    mappings = []
+    seen = set()
+    for match in CLI_PORT_PATTERN.finditer(ports_text):
+        host_start, host_end, cont_start, _, protocol = match.groups()
+        host_start, cont_start = int(host_start), int(cont_start)
+        host_end = int(host_end) if host_end else host_start
+        for offset in range(host_end - host_start + 1):
+            key = (host_start + offset, cont_start + offset, protocol)
+            if key not in seen:
+                seen.add(key)
+                mappings.append(PortMapping(*key))
+    return mappings
+
+def parse_cli_labels(labels_text: str) -> dict[str, str]:
+    """Interpreta la columna Labels de `docker ps` ("a=1,b=2")."""
+    labels = {}
+    for item in labels_text.split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            labels[key.strip()] = value.strip()
+    return labels
+
+def parse_cli_created(created_text: str) -> str:
+    """
+    Convierte el CreatedAt de `docker ps` a ISO en hora local.
+
+    Args:
+        created_text: Texto como "2024-01-01 10:00:00 +0000 UTC"
+
+    Returns:
+        str: Fecha en ISO ("2024-01-01T10:00:00"), o el texto original si no se reconoce
+    """
+    try:
+        created = datetime.strptime(" ".join(created_text.split()[:3]), "%Y-%m-%d %H:%M:%S %z")
+    except ValueError:
+        return created_text
+    return created.astimezone().replace(tzinfo=None).isoformat(timespec="seconds")
+
+def _container_from_cli(data: dict) -> ContainerInfo:
+    """Convierte una línea de `docker ps --format '{{json .}}'` en ContainerInfo."""
+    return ContainerInfo(
+        id=data.get("ID", ""),
+        name=data.get("Names", ""),
+        image=data.get("Image", ""),
+        state=data.get("State", ""),
+        status=data.get("Status", ""),
+        created=parse_cli_created(data.get("CreatedAt", "")),
+        ports=parse_cli_ports(data.get("Ports", "")),
+        labels=parse_cli_labels(data.get("Labels", "")),
+    )
+
+def _snapshot_from_api() -> DockerSnapshot:
+    containers = api_request("GET", "/containers/json", {"all": "1"}) or []
+    return DockerSnapshot([_container_from_api(c) for c in containers], source="api")
+
+def _snapshot_from_cli() -> DockerSnapshot:
+    try:
+        result = subprocess.run(
+            ["docker", "ps", "-a", "--no-trunc", "--format", "{{json .}}"],
+            capture_output=True, text=True, check=True
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        raise DockerUnavailableError(f"No se pudo ejecutar docker ps: {e}") from e
+
+    containers = [
+        _container_from_cli(json.loads(line))
+        for line in result.stdout.splitlines() if line.strip()
+    ]
+    return DockerSnapshot(containers, source="cli")
+
+# Snapshot compartido durante la ejecución de un comando
+_snapshot_cache: Optional[DockerSnapshot] = None
+
+def get_snapshot(refresh: bool = False) -> DockerSnapshot:
+    """
+    Obtiene el snapshot de contenedores, consultando a Docker una sola vez.
+
+    Args:
+        refresh: Fuerza una nueva consulta ignorando el snapshot en memoria
+
+    Returns:
+        DockerSnapshot: Contenedores del host con sus puertos publicados
+
+    Raises:
+        DockerUnavailableError: Si ni el socket ni la CLI de Docker responden
+    """
+    global _snapshot_cache
+
+    if _snapshot_cache is None or refresh:
+        try:
+            _snapshot_cache = _snapshot_from_api()
+        except DockerUnavailableError:
+            _snapshot_cache = _snapshot_from_cli()
+
+    return _snapshot_cache
+
+# =============================================================================
+# CONSUMO DE RECURSOS
+# =============================================================================
+
+def get_volume_sizes() -> dict[str, int]:
+    """
+    Obtiene el tamaño en disco de todos los volúmenes con una sola petición.
+
+    Returns:
+        dict[str, int]: Nombre del volumen -> bytes usados (-1 si Docker no lo calculó)
+
+    Raises:
+        DockerUnavailableError: Si la API no responde
+    """
+    data = api_request("GET", "/system/df", {"type": "volume"}, timeout=60) or {}
+    return {
+        volume["Name"]: (volume.get("UsageData") or {}).get("Size", -1)
+        for volume in data.get("Volumes") or []
+    }
+
+def get_container_memory(container_id: str) -> int:
+    """
+    Memoria en uso por un contenedor, sin contar la caché de páginas.
+
+    Returns:
+        int: Bytes en uso, o 0 si el contenedor no está corriendo
+
+    Raises:
+        DockerUnavailableError: Si la API no responde
+    """
+    stats = api_request("GET", f"/containers/{container_id}/stats", {"stream": "false", "one-shot": "true"}) or {}
+    return _memory_usage(stats.get("memory_stats") or {})
+
+def _memory_usage(memory: dict) -> int:
+    """
+    Memoria en uso a partir de memory_stats, descontando la caché inactiva (como `docker stats`).
+
+    cgroup v1 informa la caché como total_inactive_file e inactive_file es solo
+    la del propio cgroup; cgroup v2 solo tiene inactive_file.
+    """
+    stats = memory.get("stats") or {}
+    usage = memory.get("usage", 0)
+    cache = stats["total_inactive_file"] if "total_inactive_file" in stats else stats.get("inactive_file", 0)
+    return usage - cache if cache < usage else usage
+
+@dataclass
+class ContainerStats:
+    """Una muestra de consumo de un contenedor."""
+    container_id: str
+    name: str
+    cpu_percent: float
+    memory: int
+    memory_limit: int
+    block_read: int
+    block_write: int
+    net_rx: int
+    net_tx: int
+    read_at: str = ""
+
+    @property
+    def memory_percent(self) -> float:
+        return self.memory / self.memory_limit * 100 if self.memory_limit else 0.0
+
+def parse_stats(data: dict) -> ContainerStats:
+    """
+    Convierte un objeto del endpoint /containers/<id>/stats en una muestra.
+
+    El porcentaje de CPU se calcula como `docker stats`: tiempo de CPU del
+    contenedor entre dos lecturas sobre el tiempo total del sistema, por el
+    número de CPUs.
+    """
+    cpu = data.get("cpu_stats") or {}
+    precpu = data.get("precpu_stats") or {}
+    cpu_delta = (cpu.get("cpu_usage") or {}).get("total_usage", 0) - (precpu.get("cpu_usage") or {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online_cpus = cpu.get("online_cpus") or len((cpu.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+    cpu_percent = cpu_delta / system_delta * online_cpus * 100 if cpu_delta > 0 and system_delta > 0 else 0.0
+
+    # cgroup v1 usa "Read"/"Write" y cgroup v2 "read"/"write"
+    block_read = block_write = 0
+    for entry in (data.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []:
+        op = entry.get("op", "").lower()
+        if op == "read":
+            block_read += entry.get("value", 0)
+        elif op == "write":
+            block_write += entry.get("value", 0)
+
+    networks = (data.get("networks") or {}).values()
+    memory = data.get("memory_stats") or {}
+
+    return ContainerStats(
+        container_id=data.get("id", ""),
+        name=data.get("name", "").lstrip("/"),
+        cpu_percent=cpu_percent,
+        memory=_memory_usage(memory),
+        memory_limit=memory.get("limit", 0),
+        block_read=block_read,
+        block_write=block_write,
+        net_rx=sum(network.get("rx_bytes", 0) for network in networks),
+        net_tx=sum(network.get("tx_bytes", 0) for network in networks),
+        read_at=data.get("read", ""),
+    )
+
+def format_bytes(size: float) -> str:
+    """Formatea bytes en unidades legibles (KB, MB, GB...)."""
+    if abs(size) < 1024:
+        return f"{int(size)} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} TB"
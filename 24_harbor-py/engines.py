@@ -0,0 +1,250 @@
+"""
+Perfiles de motores de base de datos para Harbor.
+
+Cada motor se describe de forma declarativa: puerto dentro del contenedor,
+puerto preferido en el host, variables de entorno de cada credencial,
+directorio de datos, healthcheck y flags del modo rápido. El
+docker-compose.yml se genera a partir del perfil con un serializador YAML
+real, así que añadir un motor nuevo es añadir una entrada a ENGINES.
+"""
+
+from typing import Optional
+from dataclasses import dataclass, field
+
+# =============================================================================
+# PERFILES
+# =============================================================================
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Descripción declarativa de un motor de base de datos."""
+    name: str
+    container_port: int
+    default_port: int
+    data_dir: str
+    # Credencial -> variable de entorno (root_password, database, user, user_password)
+    env: dict[str, str] = field(default_factory=dict)
+    healthcheck: Optional[list[str]] = None
+    # Argumentos de `command` que desactivan la durabilidad en modo --fast
+    fast_flags: list[str] = field(default_factory=list)
+    # Esquema y usuarios para las URLs de conexión
+    url_scheme: Optional[str] = None
+    root_user: Optional[str] = None
+    has_app_user: bool = False
+
+ENGINES: dict[str, EngineProfile] = {
+    "mysql": EngineProfile(
+        name="mysql",
+        container_port=3306,
+        default_port=3306,
+        data_dir="/var/lib/mysql",
+        env={
+            "root_password": "MYSQL_ROOT_PASSWORD",
+            "database": "MYSQL_DATABASE",
+            "user": "MYSQL_USER",
+            "user_password": "MYSQL_PASSWORD",
+        },
+        healthcheck=["CMD-SHELL", "mysqladmin ping -h 127.0.0.1 -uroot -p$${MYSQL_ROOT_PASSWORD} --silent"],
+        fast_flags=["--innodb-flush-log-at-trx-commit=0", "--sync-binlog=0", "--innodb-doublewrite=0", "--skip-log-bin"],
+        url_scheme="mysql",
+        root_user="root",
+        has_app_user=True,
+    ),
+    "mariadb": EngineProfile(
+        name="mariadb",
+        container_port=3306,
+        default_port=3307,
+        data_dir="/var/lib/mysql",
+        env={
+            "root_password": "MARIADB_ROOT_PASSWORD",
+            "database": "MARIADB_DATABASE",
+            "user": "MARIADB_USER",
+            "user_password": "MARIADB_PASSWORD",
+        },
+        healthcheck=["CMD", "healthcheck.sh", "--connect", "--innodb_initialized"],
+        fast_flags=["--innodb-flush-log-at-trx-commit=0", "--sync-binlog=0", "--skip-log-bin"],
+        url_scheme="mysql",
+        root_user="root",
+        has_app_user=True,
+    ),
+    "postgres": EngineProfile(
+        name="postgres",
+        container_port=5432,
+        default_port=5432,
+        data_dir="/var/lib/postgresql/data",
+        # POSTGRES_USER es el superusuario: no hay un root aparte
+        env={
+            "database": "POSTGRES_DB",
+            "user": "POSTGRES_USER",
+            "user_password": "POSTGRES_PASSWORD",
+        },
+        healthcheck=["CMD-SHELL", "pg_isready -U $${POSTGRES_USER} -d $${POSTGRES_DB}"],
+        fast_flags=["postgres", "-c", "fsync=off", "-c", "synchronous_commit=off", "-c", "full_page_writes=off"],
+        url_scheme="postgresql",
+        has_app_user=True,
+    ),
+    "mongo": EngineProfile(
+        name="mongo",
+        container_port=27017,
+        default_port=27017,
+        data_dir="/data/db",
+        env={
+            "root_password": "MONGO_INITDB_ROOT_PASSWORD",
+            "database": "MONGO_INITDB_DATABASE",
+            "root_user": "MONGO_INITDB_ROOT_USERNAME",
+        },
+        healthcheck=["CMD", "mongosh", "--quiet", "--eval", "db.adminCommand('ping')"],
+        url_scheme="mongodb",
+        root_user="root",
+    ),
+    "redis": EngineProfile(
+        name="redis",
+        container_port=6379,
+        default_port=6379,
+        data_dir="/data",
+        healthcheck=["CMD", "redis-cli", "ping"],
+        fast_flags=["redis-server", "--save", "", "--appendonly", "no"],
+        url_scheme="redis",
+    ),
+}
+
+# Intervalos del healthcheck de Docker
+HEALTHCHECK_TIMING = {"interval": "5s", "timeout": "3s", "retries": 20}
+
+def get_profile(image: str, port: Optional[int] = None) -> EngineProfile:
+    """
+    Devuelve el perfil de un motor conocido, o uno genérico para otras imágenes.
+
+    Args:
+        image: Nombre de la imagen (ej: postgres)
+        port: Puerto indicado por el usuario, usado como puerto del contenedor
+              en imágenes sin perfil
+
+    Returns:
+        EngineProfile: Perfil del motor
+    """
+    if image in ENGINES:
+        return ENGINES[image]
+    return EngineProfile(
+        name=image,
+        container_port=port or 0,
+        default_port=port or 0,
+        data_dir=f"/var/lib/{image}",
+    )
+
+# =============================================================================
+# GENERACIÓN DE COMPOSE Y URLS
+# =============================================================================
+
+def build_service(
+    profile: EngineProfile,
+    version: str,
+    container_name: str,
+    credentials: dict[str, str],
+    host_port: int,
+    labels: dict[str, str],
+    volume_name: Optional[str] = None,
+    fast: bool = False,
+    memory: Optional[str] = None,
+    cpus: Optional[float] = None
+) -> dict:
+    """
+    Construye la definición de un servicio de compose a partir de un perfil.
+
+    Args:
+        profile: Perfil del motor
+        version: Tag de la imagen
+        container_name: Nombre del contenedor
+        credentials: Valores de root_password, database, user, user_password, root_user
+        host_port: Puerto del host (puede diferir del puerto del contenedor)
+        labels: Etiquetas del contenedor
+        volume_name: Volumen con nombre para los datos (ignorado con fast=True)
+        fast: Datos en tmpfs y durabilidad desactivada
+        memory: Límite de memoria (ej: 512m)
+        cpus: Límite de CPUs
+
+    Returns:
+        dict: Servicio listo para serializar
+    """
+    service = {
+        "image": f"{profile.name}:{version}",
+        "container_name": container_name,
+        "restart": "always",
+        "labels": dict(labels),
+    }
+
+    environment = {
+        variable: credentials[role]
+        for role, variable in profile.env.items()
+        if credentials.get(role) is not None
+    }
+    if environment:
+        service["environment"] = environment
+
+    service["ports"] = [f"{host_port}:{profile.container_port}"]
+
+    if profile.healthcheck:
+        service["healthcheck"] = {"test": list(profile.healthcheck), **HEALTHCHECK_TIMING}
+    if memory:
+        service["mem_limit"] = memory
+    if cpus:
+        service["cpus"] = cpus
+
+    if fast:
+        if profile.fast_flags:
+            service["command"] = list(profile.fast_flags)
+        service["tmpfs"] = [profile.data_dir]
+    elif volume_name:
+        service["volumes"] = [f"{volume_name}:{profile.data_dir}"]
+
+    return service
+
+def render_compose(services: dict[str, dict], volumes: dict[str, dict], networks: Optional[dict] = None) -> str:
+    """
+    Serializa un proyecto de compose a YAML.
+
+    Args:
+        services: Nombre del servicio -> definición
+        volumes: Nombre del volumen -> definición
+        networks: Redes opcionales del proyecto
+
+    Returns:
+        str: Contenido del docker-compose.yml
+    """
+    # PyYAML solo hace falta al generar archivos; no se carga en cada arranque
+    import yaml
+
+    document = {"services": services}
+    if volumes:
+        document["volumes"] = volumes
+    if networks:
+        document["networks"] = networks
+    return yaml.safe_dump(document, sort_keys=False, default_flow_style=False, allow_unicode=True)
+
+def connection_urls(profile: EngineProfile, credentials: dict[str, str], host_port: int) -> dict:
+    """
+    Genera URLs de conexión según los usuarios que define el perfil.
+
+    Args:
+        profile: Perfil del motor
+        credentials: Valores de root_password, database, user, user_password, root_user
+        host_port: Puerto publicado en el host
+
+    Returns:
+        dict: URLs por tipo de usuario ("root", "user") o un mensaje "info"
+    """
+    if profile.url_scheme is None:
+        return {"info": f"{profile.name} no soportado aún para URLs automáticas."}
+
+    base = f"localhost:{host_port}"
+    database = credentials.get("database", "")
+
+    if profile.root_user is None and not profile.has_app_user:
+        return {"default": f"{profile.url_scheme}://{base}/0"}
+
+    urls = {}
+    if profile.root_user:
+        urls["root"] = f"{profile.url_scheme}://{profile.root_user}:{credentials.get('root_password')}@{base}/{database}"
+    if profile.has_app_user:
+        urls["user"] = f"{profile.url_scheme}://{credentials.get('user')}:{credentials.get('user_password')}@{base}/{database}"
+    return urls
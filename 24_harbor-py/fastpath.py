@@ -0,0 +1,90 @@
+"""
+Vía rápida para los comandos no interactivos de Harbor.
+
+`harbor --version`, `harbor list --json` y `harbor ports` se usan desde
+completado de shell, prompts y scripts, donde cada milisegundo de arranque
+cuenta. Este módulo los resuelve solo con la librería estándar y los
+módulos ligeros de Harbor, sin importar typer, Rich ni PyYAML ni mostrar
+el banner. Cualquier otra invocación (o estos comandos con opciones que la
+vía rápida no entiende) sigue por el CLI completo.
+"""
+
+import sys
+
+from settings import __version__
+
+# Rango por defecto de `harbor ports`
+PORTS_DEFAULT_FROM = 3000
+PORTS_DEFAULT_TO = 28000
+
+def print_version():
+    """Imprime la versión del CLI."""
+    print(f"🐳 Harbor CLI versión {__version__}")
+    print("Administrador de bases de datos temporales con Docker")
+
+def print_projects_json():
+    """Imprime los proyectos del registro como JSON, sin consultar Docker."""
+    import json
+    from registry import ProjectRegistry
+    from settings import HARBOR_VOLUMES_DIR
+
+    projects = ProjectRegistry(HARBOR_VOLUMES_DIR).load()
+    print(json.dumps(list(projects.values()), indent=2, ensure_ascii=False))
+
+def print_ports(start: int = PORTS_DEFAULT_FROM, end: int = PORTS_DEFAULT_TO):
+    """Imprime los puertos ocupados en el rango y quién los usa, en texto plano."""
+    from ports import collect_port_usage
+    from settings import HARBOR_VOLUMES_DIR
+
+    usage = collect_port_usage(HARBOR_VOLUMES_DIR)
+
+    print(f"{'PUERTO':>6}  ORIGEN")
+    for port in sorted(p for p in usage.used if start <= p <= end):
+        print(f"{port:>6}  {usage.owner(port) or 'host'}")
+
+    if usage.host is None:
+        print("/proc/net/tcp no disponible: solo se muestran puertos de Docker y Harbor", file=sys.stderr)
+
+# Sin `typing` a propósito: importarlo cuesta más que el resto de este módulo
+def _parse_ports_args(args: list[str]) -> tuple[int, int] | None:
+    """Interpreta --from/--to de `harbor ports`; None si hay algo más."""
+    bounds = {"--from": PORTS_DEFAULT_FROM, "--to": PORTS_DEFAULT_TO}
+    rest = list(args)
+    while rest:
+        option = rest.pop(0)
+        if "=" in option:
+            option, value = option.split("=", 1)
+        elif rest:
+            value = rest.pop(0)
+        else:
+            return None
+        if option not in bounds or not value.isdigit():
+            return None
+        bounds[option] = int(value)
+    return bounds["--from"], bounds["--to"]
+
+def run_fast_path(argv: list[str]) -> int | None:
+    """
+    Ejecuta el comando si tiene vía rápida.
+
+    Args:
+        argv: Argumentos de la línea de comandos sin el nombre del programa
+
+    Returns:
+        int con el código de salida, o None si el comando debe ir al CLI completo
+    """
+    if argv in (["--version"], ["-v"]):
+        print_version()
+        return 0
+
+    if argv == ["list", "--json"]:
+        print_projects_json()
+        return 0
+
+    if argv[:1] == ["ports"]:
+        bounds = _parse_ports_args(argv[1:])
+        if bounds is not None:
+            print_ports(*bounds)
+            return 0
+
+    return None
@@ -0,0 +1,110 @@
+"""
+Descarga y caché local de imágenes para Harbor.
+
+`docker compose up` descarga la imagen implícitamente la primera vez, lo
+que parece un cuelgue detrás de la barra de progreso. Este módulo consulta
+la caché local de imágenes con una sola petición y descarga por la API de
+Docker (POST /images/create), que informa del progreso de cada capa.
+Sin acceso al socket se recurre a `docker pull`.
+"""
+
+import subprocess
+from typing import Callable, Optional
+
+from docker_api import DockerUnavailableError, api_request, api_stream
+
+# Segundos máximos sin noticias de una descarga (capas grandes en redes lentas)
+PULL_TIMEOUT = 300
+
+# Estados con los que Docker da una capa por terminada
+LAYER_DONE_STATUSES = ("Pull complete", "Already exists")
+
+class ImagePullError(Exception):
+    """Error al descargar una imagen."""
+
+def normalize_ref(image: str) -> str:
+    """
+    Completa el tag de una referencia de imagen (postgres -> postgres:latest).
+
+    Con digest (repo@sha256:...) el tag sobra: Docker lo ignora, así que se
+    quita para que la referencia coincida con RepoDigests.
+    """
+    if "@" in image:
+        repository, _, digest = image.partition("@")
+        registry, slash, name = repository.rpartition("/")
+        return f"{registry}{slash}{name.split(':', 1)[0]}@{digest}"
+    # El puerto de un registro (localhost:5000/pg) no es un tag: solo cuenta el último tramo
+    name = image.rsplit("/", 1)[-1]
+    if ":" in name:
+        return image
+    return f"{image}:latest"
+
+def split_ref(ref: str) -> tuple[str, str]:
+    """Separa una referencia completa en (repositorio, tag o digest)."""
+    ref = normalize_ref(ref)
+    if "@" in ref:
+        repository, _, digest = ref.partition("@")
+        return repository, digest
+    repository, _, tag = ref.rpartition(":")
+    return repository, tag
+
+def local_image_tags() -> set[str]:
+    """
+    Referencias repo:tag y repo@digest presentes en la caché local, con una sola consulta.
+
+    Raises:
+        DockerUnavailableError: Si Docker no responde ni por el socket ni por la CLI
+    """
+    try:
+        images = api_request("GET", "/images/json") or []
+        return {
+            ref for image in images
+            for ref in (image.get("RepoTags") or []) + (image.get("RepoDigests") or [])
+        }
+    except DockerUnavailableError:
+        pass
+
+    try:
+        result = subprocess.run(
+            ["docker", "images", "--digests", "--format", "{{.Repository}}:{{.Tag}} {{.Repository}}@{{.Digest}}"],
+            capture_output=True, text=True, check=True
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        raise DockerUnavailableError(f"No se pudo ejecutar docker images: {e}") from e
+    return set(result.stdout.split())
+
+def is_cached(ref: str, tags: Optional[set[str]] = None) -> bool:
+    """Indica si la imagen ya está en la caché local."""
+    return normalize_ref(ref) in (tags if tags is not None else local_image_tags())
+
+def pull_image(ref: str, on_event: Optional[Callable[[dict], None]] = None):
+    """
+    Descarga una imagen, informando del progreso de cada capa.
+
+    Args:
+        ref: Referencia de la imagen (ej: postgres:16)
+        on_event: Función llamada con cada evento de progreso de la API
+                  ({"id": capa, "status": ..., "progressDetail": {...}})
+
+    Raises:
+        ImagePullError: Si el registro o Docker devuelven error
+    """
+    repository, tag = split_ref(ref)
+    try:
+        for event in api_stream("POST", "/images/create", {"fromImage": repository, "tag": tag}, timeout=PULL_TIMEOUT):
+            if event.get("error"):
+                raise ImagePullError(event["error"])
+            if on_event is not None:
+                on_event(event)
+        return
+    except DockerUnavailableError:
+        pass
+
+    # Sin socket: la CLI no da progreso por capa, pero usa las credenciales de `docker login`
+    try:
+        subprocess.run(["docker", "pull", "-q", normalize_ref(ref)], capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        error = (e.stderr or str(e)).strip().splitlines()
+        raise ImagePullError(error[-1] if error else str(e)) from e
+    except FileNotFoundError as e:
+        raise ImagePullError("Docker no está instalado o no está en PATH") from e
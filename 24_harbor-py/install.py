@@ -22,7 +22,7 @@ def install_dependencies():
     """Instala las dependencias necesarias."""
     print("\n📦 Instalando dependencias...")
 
-    dependencies = ["pyinstaller", "typer", "rich"]
+    dependencies = ["pyinstaller", "typer", "rich", "pyyaml"]
 
     for dep in dependencies:
         try:
@@ -0,0 +1,118 @@
+"""
+Métricas en vivo de los contenedores de Harbor.
+
+Cada contenedor tiene una única conexión abierta al endpoint de stats de la
+API de Docker (`stream=true`), leída por un hilo propio. Docker envía una
+muestra por segundo y el monitor guarda la última de cada contenedor, de
+modo que la vista solo lee memoria y nunca vuelve a lanzar `docker stats`.
+"""
+
+import csv
+import threading
+from typing import Optional, Callable
+from datetime import datetime
+
+from docker_api import ContainerStats, DockerUnavailableError, api_stream, parse_stats
+
+# Columnas del CSV exportado por `harbor top --csv`
+CSV_COLUMNS = [
+    "timestamp", "project", "container", "cpu_percent", "memory_bytes", "memory_limit",
+    "block_read_bytes", "block_write_bytes", "net_rx_bytes", "net_tx_bytes",
+]
+
+class StatsMonitor:
+    """
+    Mantiene un flujo de stats abierto por contenedor y su última muestra.
+
+    Uso:
+        monitor = StatsMonitor()
+        monitor.sync({"<id>": "proyecto"})
+        monitor.latest()   # id -> (proyecto, ContainerStats)
+        monitor.stop()
+    """
+
+    def __init__(self, on_sample: Optional[Callable[[str, ContainerStats], None]] = None):
+        self.on_sample = on_sample
+        self._lock = threading.Lock()
+        self._samples: dict[str, tuple[str, ContainerStats]] = {}
+        self._threads: dict[str, threading.Thread] = {}
+        self._errors: dict[str, str] = {}
+        self._stopped = threading.Event()
+
+    def sync(self, containers: dict[str, str]):
+        """
+        Abre flujos para los contenedores nuevos; los que terminan se retiran solos.
+
+        Args:
+            containers: Id del contenedor -> proyecto Harbor
+        """
+        with self._lock:
+            for container_id, project in containers.items():
+                thread = self._threads.get(container_id)
+                if thread is not None and thread.is_alive():
+                    continue
+                thread = threading.Thread(target=self._follow, args=(container_id, project), daemon=True)
+                self._threads[container_id] = thread
+                thread.start()
+
+    def _follow(self, container_id: str, project: str):
+        """Lee el flujo de stats de un contenedor hasta que se detenga."""
+        try:
+            for data in api_stream("GET", f"/containers/{container_id}/stats", {"stream": "true"}):
+                if self._stopped.is_set():
+                    return
+                # La primera muestra no trae precpu_stats: el % de CPU aún no es válido
+                if not (data.get("precpu_stats") or {}).get("system_cpu_usage"):
+                    continue
+                sample = parse_stats(data)
+                with self._lock:
+                    self._samples[container_id] = (project, sample)
+                    self._errors.pop(container_id, None)
+                if self.on_sample is not None:
+                    self.on_sample(project, sample)
+        except DockerUnavailableError as e:
+            with self._lock:
+                self._errors[container_id] = str(e)
+        finally:
+            with self._lock:
+                self._samples.pop(container_id, None)
+
+    def latest(self) -> dict[str, tuple[str, ContainerStats]]:
+        """Copia de la última muestra de cada contenedor activo."""
+        with self._lock:
+            return dict(self._samples)
+
+    def errors(self) -> dict[str, str]:
+        """Errores de los flujos que se cerraron por fallo de la API."""
+        with self._lock:
+            return dict(self._errors)
+
+    def stop(self):
+        """Deja de procesar muestras; los hilos son daemon y terminan con el proceso."""
+        self._stopped.set()
+
+class CsvSampleWriter:
+    """Escribe cada muestra como una fila CSV, seguro entre hilos."""
+
+    def __init__(self, file):
+        self._file = file
+        self._lock = threading.Lock()
+        self._writer = csv.writer(file)
+        self._writer.writerow(CSV_COLUMNS)
+
+    def __call__(self, project: str, sample: ContainerStats):
+        row = [
+            sample.read_at or datetime.now().isoformat(timespec="seconds"),
+            project,
+            sample.name,
+            f"{sample.cpu_percent:.2f}",
+            sample.memory,
+            sample.memory_limit,
+            sample.block_read,
+            sample.block_write,
+            sample.net_rx,
+            sample.net_tx,
+        ]
+        with self._lock:
+            self._writer.writerow(row)
+            self._file.flush()
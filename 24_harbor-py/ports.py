@@ -0,0 +1,169 @@
+"""
+Asignador de puertos del host para Harbor.
+
+Reúne en una sola pasada todos los puertos ocupados de la máquina:
+- Sockets TCP en escucha leídos de /proc/net/tcp y /proc/net/tcp6
+  (incluye servicios nativos como un Postgres instalado en el sistema)
+- Puertos publicados por contenedores Docker (snapshot de docker_api)
+- Puertos ya asignados a proyectos Harbor (registro de proyectos)
+
+Con esa información se elige un puerto libre sin tener que probar
+`docker compose up` hasta que uno funcione.
+"""
+
+import socket
+from typing import Optional, Iterable
+from pathlib import Path
+from dataclasses import dataclass, field
+
+from docker_api import DockerSnapshot, DockerUnavailableError, get_snapshot
+from registry import ProjectRegistry
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+# Tablas de sockets TCP del kernel (IPv4 e IPv6)
+PROC_TCP_FILES = ("/proc/net/tcp", "/proc/net/tcp6")
+
+# Estado TCP_LISTEN en las tablas de /proc/net/tcp
+TCP_LISTEN_STATE = "0A"
+
+# Cantidad de puertos consecutivos que se revisan a partir del puerto base
+DEFAULT_SEARCH_RANGE = 100
+
+# =============================================================================
+# FUENTES DE PUERTOS OCUPADOS
+# =============================================================================
+
+def read_listening_ports(proc_files: Iterable[str] = PROC_TCP_FILES) -> Optional[set[int]]:
+    """
+    Lee los puertos TCP en escucha desde las tablas del kernel.
+
+    Args:
+        proc_files: Rutas de las tablas a leer
+
+    Returns:
+        set[int] con los puertos en escucha, o None si /proc no está disponible
+        (por ejemplo en macOS)
+    """
+    ports = set()
+    readable = False
+
+    for proc_file in proc_files:
+        try:
+            with open(proc_file) as f:
+                lines = f.readlines()[1:]  # Quitar cabecera
+        except OSError:
+            continue
+
+        readable = True
+        for line in lines:
+            fields = line.split()
+            # fields[1] = "0100007F:1538" (ip:puerto en hex), fields[3] = estado
+            if len(fields) > 3 and fields[3] == TCP_LISTEN_STATE:
+                ports.add(int(fields[1].rsplit(":", 1)[1], 16))
+
+    return ports if readable else None
+
+def read_harbor_ports(volumes_dir: Path) -> dict[int, str]:
+    """
+    Recoge los puertos asignados a proyectos Harbor existentes.
+
+    Se leen del registro de proyectos, que indexa los *_info.json de cada
+    proyecto en un único archivo.
+
+    Args:
+        volumes_dir: Directorio harbor_volumenes
+
+    Returns:
+        dict[int, str]: Puerto -> nombre del proyecto que lo tiene asignado
+    """
+    if not volumes_dir.exists():
+        return {}
+    return ProjectRegistry(volumes_dir).ports()
+
+def can_bind(port: int) -> bool:
+    """Comprueba si el puerto se puede abrir en el host (respaldo sin /proc)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("0.0.0.0", port))
+            return True
+        except OSError:
+            return False
+
+# =============================================================================
+# VISTA COMBINADA Y ASIGNACIÓN
+# =============================================================================
+
+@dataclass
+class PortUsage:
+    """Puertos ocupados en el host agrupados por origen."""
+    host: Optional[set[int]] = None
+    docker: set[int] = field(default_factory=set)
+    harbor: dict[int, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.used = (self.host or set()) | self.docker | set(self.harbor)
+
+    def owner(self, port: int) -> Optional[str]:
+        """Describe quién ocupa un puerto, o None si está libre."""
+        if port in self.harbor:
+            return f"harbor:{self.harbor[port]}"
+        if port in self.docker:
+            return "docker"
+        if self.host is not None and port in self.host:
+            return "host"
+        return None
+
+    def is_free(self, port: int) -> bool:
+        """Indica si el puerto está libre según las tres fuentes."""
+        if port in self.used:
+            return False
+        # Sin /proc no sabemos de servicios nativos: se prueba a abrir el puerto
+        return self.host is not None or can_bind(port)
+
+    def reserve(self, port: int, project_name: str):
+        """Marca un puerto como asignado para que la siguiente búsqueda lo salte."""
+        self.harbor[port] = project_name
+        self.used.add(port)
+
+def collect_port_usage(volumes_dir: Path, snapshot: Optional[DockerSnapshot] = None) -> PortUsage:
+    """
+    Construye la vista de puertos ocupados leyendo cada fuente una sola vez.
+
+    Args:
+        volumes_dir: Directorio harbor_volumenes con los *_info.json
+        snapshot: Snapshot de Docker ya obtenido (se consulta uno si falta)
+
+    Returns:
+        PortUsage: Puertos ocupados por el host, Docker y proyectos Harbor
+    """
+    if snapshot is None:
+        try:
+            snapshot = get_snapshot()
+        except DockerUnavailableError:
+            snapshot = None
+
+    return PortUsage(
+        host=read_listening_ports(),
+        docker=snapshot.used_ports if snapshot else set(),
+        harbor=read_harbor_ports(volumes_dir),
+    )
+
+def allocate_port(base_port: int, usage: PortUsage, search_range: int = DEFAULT_SEARCH_RANGE) -> Optional[int]:
+    """
+    Elige el primer puerto libre a partir de un puerto base.
+
+    Args:
+        base_port: Puerto preferido
+        usage: Vista de puertos ocupados
+        search_range: Cantidad de puertos consecutivos a revisar
+
+    Returns:
+        int con el puerto libre, o None si todo el rango está ocupado
+    """
+    for port in range(base_port, min(base_port + search_range, 65536)):
+        if usage.is_free(port):
+            return port
+    return None
@@ -0,0 +1,219 @@
+"""
+Sondas de disponibilidad para las bases de datos de Harbor.
+
+Que el puerto acepte conexiones no significa que la base de datos esté
+lista: docker-proxy acepta la conexión aunque el contenedor siga
+inicializando. Por eso cada motor se prueba con su propio handshake
+(paquete de arranque de Postgres, saludo de MySQL, PING de Redis, hello
+de MongoDB) usando asyncio, con reintentos y espera exponencial.
+"""
+
+import time
+import struct
+import asyncio
+from typing import Optional
+from dataclasses import dataclass
+
+from settings import DEFAULT_WAIT_TIMEOUT
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+# Espera inicial y máxima entre intentos (segundos)
+INITIAL_BACKOFF = 0.1
+MAX_BACKOFF = 2.0
+
+# Tiempo máximo de un intento individual
+ATTEMPT_TIMEOUT = 3.0
+
+class NotReadyError(Exception):
+    """El servidor respondió, pero todavía no acepta clientes."""
+
+# =============================================================================
+# HANDSHAKES POR MOTOR
+# =============================================================================
+
+async def _probe_postgres(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, user: str, database: str):
+    """Envía un StartupMessage (protocolo 3.0) y espera la petición de autenticación."""
+    params = f"user\0{user}\0database\0{database}\0\0".encode()
+    writer.write(struct.pack("!ii", len(params) + 8, 196608) + params)
+    await writer.drain()
+
+    header = await reader.readexactly(5)
+    if header[:1] == b"R":
+        return
+
+    if header[:1] == b"E":
+        body = await reader.read(struct.unpack("!i", header[1:])[0] - 4)
+        # 57P03 = cannot_connect_now ("the database system is starting up")
+        if b"C57P03" in body:
+            raise NotReadyError("Postgres sigue iniciando")
+        # Cualquier otro error (rol inexistente, etc.) implica servidor activo
+        return
+
+    raise NotReadyError(f"Respuesta inesperada de Postgres: {header!r}")
+
+async def _probe_mysql(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, user: str, database: str):
+    """Lee el paquete de saludo inicial que MySQL/MariaDB envían al conectar."""
+    header = await reader.readexactly(4)
+    payload = await reader.readexactly(int.from_bytes(header[:3], "little"))
+
+    # 0x0a = protocolo v10 (saludo), 0xff = paquete de error
+    if payload[:1] != b"\x0a":
+        raise NotReadyError(f"MySQL respondió con error: {payload[3:].decode(errors='replace')}")
+
+async def _probe_redis(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, user: str, database: str):
+    """Envía PING y espera +PONG (o un error de autenticación, que también indica servidor activo)."""
+    writer.write(b"*1\r\n$4\r\nPING\r\n")
+    await writer.drain()
+
+    line = await reader.readline()
+    if line.startswith(b"+PONG") or line.startswith(b"-NOAUTH"):
+        return
+    raise NotReadyError(f"Redis respondió: {line.decode(errors='replace').strip()}")
+
+def _bson_hello() -> bytes:
+    """Documento BSON {hello: 1, $db: "admin"} codificado a mano."""
+    elements = (
+        b"\x10hello\x00" + struct.pack("<i", 1)
+        + b"\x02$db\x00" + struct.pack("<i", 6) + b"admin\x00"
+    )
+    return struct.pack("<i", len(elements) + 5) + elements + b"\x00"
+
+async def _probe_mongo(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, user: str, database: str):
+    """Envía el comando hello como OP_MSG y comprueba que la respuesta traiga ok: 1."""
+    body = struct.pack("<I", 0) + b"\x00" + _bson_hello()
+    writer.write(struct.pack("<iiii", 16 + len(body), 1, 0, 2013) + body)
+    await writer.drain()
+
+    header = await reader.readexactly(16)
+    length, _, _, op_code = struct.unpack("<iiii", header)
+    reply = await reader.readexactly(length - 16)
+
+    ok_index = reply.find(b"\x01ok\x00")
+    if op_code != 2013 or ok_index < 0 or struct.unpack("<d", reply[ok_index + 4:ok_index + 12])[0] != 1.0:
+        raise NotReadyError("MongoDB no respondió ok al comando hello")
+
+async def _probe_tcp(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, user: str, database: str):
+    """Para motores sin handshake conocido basta con que la conexión se abra."""
+
+PROBES = {
+    "postgres": _probe_postgres,
+    "mysql": _probe_mysql,
+    "mariadb": _probe_mysql,
+    "redis": _probe_redis,
+    "mongo": _probe_mongo,
+}
+
+# =============================================================================
+# ESPERA CON BACKOFF
+# =============================================================================
+
+@dataclass
+class ReadinessResult:
+    """Resultado de esperar a que una base de datos esté lista."""
+    name: str
+    ready: bool
+    seconds: float
+    attempts: int
+    error: str = ""
+
+async def probe_once(engine: str, port: int, host: str = "127.0.0.1", user: str = "harbor", database: str = "postgres"):
+    """
+    Realiza un único intento de handshake contra la base de datos.
+
+    Raises:
+        OSError, NotReadyError, asyncio.IncompleteReadError, asyncio.TimeoutError:
+            Si el servidor todavía no está listo
+    """
+    probe = PROBES.get(engine, _probe_tcp)
+
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), ATTEMPT_TIMEOUT)
+    try:
+        await asyncio.wait_for(probe(reader, writer, user, database), ATTEMPT_TIMEOUT)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+async def wait_until_ready(
+    name: str,
+    engine: str,
+    port: int,
+    host: str = "127.0.0.1",
+    user: str = "harbor",
+    database: str = "postgres",
+    timeout: float = DEFAULT_WAIT_TIMEOUT
+) -> ReadinessResult:
+    """
+    Reintenta el handshake con espera exponencial hasta que responda o venza el plazo.
+
+    Args:
+        name: Nombre del proyecto (solo para el resultado)
+        engine: Motor de base de datos (postgres, mysql, mongo, redis, mariadb...)
+        port: Puerto del host donde está publicado
+        host: Host a sondear
+        user: Usuario para el paquete de arranque de Postgres
+        database: Base de datos para el paquete de arranque de Postgres
+        timeout: Segundos máximos de espera
+
+    Returns:
+        ReadinessResult: Si quedó lista, cuánto tardó y el último error visto
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    delay = INITIAL_BACKOFF
+    attempts = 0
+    last_error = ""
+
+    while True:
+        attempts += 1
+        try:
+            await probe_once(engine, port, host, user, database)
+            return ReadinessResult(name, True, time.monotonic() - start, attempts)
+        except asyncio.IncompleteReadError:
+            last_error = "El servidor cerró la conexión durante el handshake"
+        except asyncio.TimeoutError:
+            last_error = "Sin respuesta del servidor"
+        except (OSError, NotReadyError) as e:
+            last_error = str(e)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return ReadinessResult(name, False, time.monotonic() - start, attempts, last_error)
+
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, MAX_BACKOFF)
+
+async def _wait_many(targets: list[dict], timeout: float) -> list[ReadinessResult]:
+    return await asyncio.gather(*(wait_until_ready(timeout=timeout, **target) for target in targets))
+
+def wait_for_projects(targets: list[dict], timeout: float = DEFAULT_WAIT_TIMEOUT) -> list[ReadinessResult]:
+    """
+    Espera en paralelo a que varias bases de datos estén listas.
+
+    Args:
+        targets: Diccionarios con los argumentos de wait_until_ready
+                 (name, engine, port y opcionalmente host, user, database)
+        timeout: Segundos máximos de espera por proyecto
+
+    Returns:
+        list[ReadinessResult]: Un resultado por proyecto, en el mismo orden
+    """
+    return asyncio.run(_wait_many(targets, timeout))
+
+def readiness_target(info: dict) -> Optional[dict]:
+    """Construye el objetivo de espera a partir del *_info.json de un proyecto."""
+    if "port" not in info or "image" not in info:
+        return None
+
+    return {
+        "name": info.get("project_name", ""),
+        "engine": info["image"],
+        "port": int(info["port"]),
+        "user": info.get("system_user", "harbor"),
+        "database": info.get("database", "postgres"),
+    }
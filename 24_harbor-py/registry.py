@@ -0,0 +1,240 @@
+"""
+Registro persistente de proyectos Harbor.
+
+Un único archivo registry.json en harbor_volumenes indexa todos los
+proyectos (imagen, puerto, estado, fechas) para que `list`, la asignación
+de puertos y los comandos masivos se resuelvan con una sola lectura en vez
+de recorrer carpetas y abrir cada *_info.json.
+
+El archivo se escribe de forma atómica (archivo temporal + rename) y las
+modificaciones se serializan con un flock, así que es seguro usarlo desde
+hilos paralelos o varios procesos de Harbor a la vez.
+"""
+
+import os
+import json
+import fcntl
+import threading
+from typing import Optional, Iterator
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+REGISTRY_FILE = "registry.json"
+REGISTRY_LOCK_FILE = ".registry.lock"
+
+# Versión del formato del archivo, por si cambia en el futuro
+REGISTRY_VERSION = 1
+
+# Estados posibles de un proyecto
+STATUS_CREATED = "created"
+STATUS_RUNNING = "running"
+STATUS_STOPPED = "stopped"
+STATUS_REMOVED = "removed"
+# Detenido por una caída (lo detecta `harbor watch`)
+STATUS_CRASHED = "crashed"
+
+def now_iso() -> str:
+    """Fecha y hora actual en formato ISO, con precisión de segundos."""
+    return datetime.now().isoformat(timespec="seconds")
+
+# =============================================================================
+# REGISTRO
+# =============================================================================
+
+class ProjectRegistry:
+    """
+    Índice de proyectos Harbor respaldado por un archivo JSON.
+
+    Cada registro contiene los datos del *_info.json del proyecto más los
+    campos status, created_at, updated_at y last_started.
+    """
+
+    # Serializa las transacciones entre hilos del mismo proceso
+    _thread_lock = threading.Lock()
+
+    def __init__(self, volumes_dir: Path):
+        self.volumes_dir = Path(volumes_dir)
+        self.path = self.volumes_dir / REGISTRY_FILE
+        self.lock_path = self.volumes_dir / REGISTRY_LOCK_FILE
+
+    # -------------------------------------------------------------------------
+    # Lectura y escritura del archivo
+    # -------------------------------------------------------------------------
+
+    def _read(self) -> Optional[dict]:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data.get("projects", {})
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Un registro corrupto se reconstruye desde los *_info.json
+            return None
+
+    def _write(self, projects: dict):
+        # tempfile solo hace falta al escribir; `list --json` y `ports` solo leen
+        import tempfile
+
+        self.volumes_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.volumes_dir, prefix=".registry.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": REGISTRY_VERSION, "projects": projects}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self) -> dict[str, dict]:
+        """
+        Devuelve todos los proyectos con una sola lectura del archivo.
+
+        Si el registro no existe todavía, se genera una vez a partir de los
+        *_info.json existentes (migración desde versiones anteriores).
+        """
+        projects = self._read()
+        if projects is None:
+            if not self.volumes_dir.exists():
+                return {}
+            with self.transaction() as projects:
+                pass
+        return projects
+
+    @contextmanager
+    def transaction(self) -> Iterator[dict[str, dict]]:
+        """
+        Abre el registro para modificarlo de forma exclusiva.
+
+        Uso:
+            with registry.transaction() as projects:
+                projects["demo"]["status"] = "running"
+        """
+        self.volumes_dir.mkdir(parents=True, exist_ok=True)
+        with self._thread_lock, open(self.lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                projects = self._read()
+                if projects is None:
+                    projects = self._scan_info_files()
+                yield projects
+                self._write(projects)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _scan_info_files(self) -> dict[str, dict]:
+        """Reconstruye el registro leyendo los *_info.json de cada proyecto."""
+        projects = {}
+        if not self.volumes_dir.exists():
+            return projects
+
+        for project_dir in self.volumes_dir.glob("contenedor_*"):
+            project_name = project_dir.name.replace("contenedor_", "", 1)
+            info_path = project_dir / f"{project_name}_info.json"
+            try:
+                with open(info_path) as f:
+                    info = json.load(f)
+            except (OSError, ValueError):
+                if not (project_dir / "docker-compose.yml").exists():
+                    continue
+                info = {"project_name": project_name}
+
+            stamp = datetime.fromtimestamp(project_dir.stat().st_mtime).isoformat(timespec="seconds")
+            projects[project_name] = {
+                **info,
+                "status": STATUS_CREATED,
+                "created_at": stamp,
+                "updated_at": stamp,
+                "last_started": None,
+            }
+
+        return projects
+
+    # -------------------------------------------------------------------------
+    # Modificaciones
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _apply(projects: dict[str, dict], project_name: str, fields: dict) -> dict:
+        """Crea o actualiza un proyecto dentro de una transacción abierta."""
+        record = projects.setdefault(project_name, {
+            "project_name": project_name,
+            "status": STATUS_CREATED,
+            "created_at": now_iso(),
+            "last_started": None,
+        })
+        record.update(fields)
+        record["updated_at"] = now_iso()
+        return record
+
+    def upsert(self, project_name: str, fields: dict) -> dict:
+        """Crea o actualiza un proyecto y devuelve el registro resultante."""
+        with self.transaction() as projects:
+            return dict(self._apply(projects, project_name, fields))
+
+    def upsert_many(self, records: dict[str, dict]):
+        """Crea o actualiza varios proyectos en una sola escritura."""
+        with self.transaction() as projects:
+            for project_name, fields in records.items():
+                self._apply(projects, project_name, fields)
+
+    def set_status(self, project_names: list[str], status: str):
+        """Actualiza el estado de varios proyectos en una sola escritura."""
+        with self.transaction() as projects:
+            stamp = now_iso()
+            for project_name in project_names:
+                record = projects.get(project_name)
+                if record is None:
+                    continue
+                record["status"] = status
+                record["updated_at"] = stamp
+                if status == STATUS_RUNNING:
+                    record["last_started"] = stamp
+
+    def remove(self, project_name: str):
+        """Elimina un proyecto del registro."""
+        with self.transaction() as projects:
+            projects.pop(project_name, None)
+
+    # -------------------------------------------------------------------------
+    # Consultas
+    # -------------------------------------------------------------------------
+
+    def get(self, project_name: str) -> Optional[dict]:
+        """Busca un proyecto por nombre."""
+        return self.load().get(project_name)
+
+    def find(self, image: Optional[str] = None, port: Optional[int] = None, status: Optional[str] = None) -> list[dict]:
+        """
+        Filtra proyectos por imagen, puerto y/o estado.
+
+        Args:
+            image: Nombre de la imagen (ej: postgres)
+            port: Puerto del host asignado
+            status: Estado (created, running, stopped, removed)
+
+        Returns:
+            list[dict]: Registros que cumplen todos los criterios indicados
+        """
+        return [
+            record for record in self.load().values()
+            if (image is None or record.get("image") == image)
+            and (port is None or record.get("port") == port)
+            and (status is None or record.get("status") == status)
+        ]
+
+    def ports(self) -> dict[int, str]:
+        """Puerto -> nombre de proyecto para todos los proyectos registrados (incluidos los servicios de un stack)."""
+        ports = {}
+        for name, record in self.load().items():
+            if record.get("port") is not None:
+                ports[int(record["port"])] = name
+            for service in record.get("services", {}).values():
+                if service.get("port") is not None:
+                    ports[int(service["port"])] = name
+        return ports
@@ -0,0 +1,195 @@
+"""
+Carga de datos (seed) en las bases de datos de Harbor.
+
+Los archivos se envían al cliente del motor dentro del contenedor por la
+entrada estándar de `docker exec -i`, leyendo en bloques para no cargarlos
+completos en memoria. Cada tipo de archivo usa la vía de carga masiva del
+motor:
+
+- .sql  -> psql / mysql / mariadb leyendo de stdin
+- .csv  -> COPY ... FROM STDIN (Postgres), LOAD DATA LOCAL INFILE (MySQL/MariaDB)
+- .json / .csv en MongoDB -> mongoimport
+- .js   -> mongosh
+
+Los archivos comprimidos con gzip (.sql.gz, .csv.gz...) se descomprimen al vuelo.
+"""
+
+import gzip
+import time
+import tempfile
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+# Tamaño de bloque al enviar archivos al contenedor
+CHUNK_SIZE = 1024 * 1024
+
+class SeedError(Exception):
+    """Error al cargar un archivo en la base de datos."""
+
+@dataclass
+class SeedResult:
+    """
+    Resultado de cargar un archivo.
+
+    `lines` cuenta líneas, no filas: un INSERT o un documento JSON pueden
+    ocupar varias. Por eso la velocidad se mide en bytes por segundo.
+    """
+    path: Path
+    method: str
+    lines: int
+    bytes: int
+    seconds: float
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+# =============================================================================
+# COMANDOS POR MOTOR
+# =============================================================================
+
+def file_kind(path: Path) -> str:
+    """Tipo lógico del archivo ignorando la compresión (sql, csv, json, js)."""
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes = suffixes[:-1]
+    return suffixes[-1].lstrip(".") if suffixes else ""
+
+def table_name(path: Path) -> str:
+    """Nombre de tabla/colección por defecto: el nombre del archivo sin extensiones."""
+    return path.name.split(".")[0]
+
+def _quote_identifier(name: str, quote: str) -> str:
+    return quote + name.replace(quote, quote * 2) + quote
+
+def build_seed_command(record: dict, path: Path, table: str) -> tuple[list[str], str]:
+    """
+    Construye el comando `docker exec -i` que carga un archivo en el proyecto.
+
+    Args:
+        record: Registro del proyecto (imagen, contenedor, credenciales)
+        path: Archivo a cargar
+        table: Tabla o colección destino para CSV/JSON
+
+    Returns:
+        tuple: (argumentos del comando, nombre del método de carga)
+
+    Raises:
+        SeedError: Si el motor no admite ese tipo de archivo
+    """
+    engine = record.get("image", "")
+    container = record["container_name"]
+    database = record.get("database", "")
+    kind = file_kind(path)
+    exec_cmd = ["docker", "exec", "-i"]
+
+    if engine == "postgres":
+        psql = exec_cmd + [container, "psql", "-v", "ON_ERROR_STOP=1", "-q",
+                           "-U", record.get("system_user", "postgres"), "-d", database]
+        if kind == "sql":
+            return psql, "psql"
+        if kind == "csv":
+            quoted = _quote_identifier(table, '"')
+            copy = f"COPY {quoted} FROM STDIN WITH (FORMAT csv, HEADER true)"
+            return psql + ["-c", copy], "COPY"
+
+    elif engine in ("mysql", "mariadb"):
+        client = "mariadb" if engine == "mariadb" else "mysql"
+        base = exec_cmd + ["-e", f"MYSQL_PWD={record.get('root_password', '')}", container, client, "-uroot"]
+        if kind == "sql":
+            return base + [database], client
+        if kind == "csv":
+            quoted = _quote_identifier(table, "`")
+            load = (
+                "SET GLOBAL local_infile=1; "
+                f"LOAD DATA LOCAL INFILE '/dev/stdin' INTO TABLE {quoted} "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                "LINES TERMINATED BY '\\n' IGNORE 1 LINES"
+            )
+            return base + ["--local-infile=1", database, "-e", load], "LOAD DATA"
+
+    elif engine == "mongo":
+        # MongoDB solo crea el usuario root (MONGO_INITDB_ROOT_USERNAME)
+        auth = ["-u", "root", "-p", record.get("root_password", ""),
+                "--authenticationDatabase", "admin"]
+        if kind == "js":
+            return exec_cmd + [container, "mongosh", "--quiet", *auth, database], "mongosh"
+        if kind in ("json", "csv"):
+            import_cmd = exec_cmd + [container, "mongoimport", *auth, "--db", database, "--collection", table]
+            if kind == "csv":
+                import_cmd += ["--type", "csv", "--headerline"]
+            elif _is_json_array(path):
+                import_cmd += ["--jsonArray"]
+            return import_cmd, "mongoimport"
+
+    raise SeedError(f"{engine or 'imagen desconocida'} no admite archivos .{kind or '?'}")
+
+def _open(path: Path):
+    """Abre el archivo en binario, descomprimiendo gzip al vuelo si hace falta."""
+    return gzip.open(path, "rb") if path.suffix.lower() == ".gz" else open(path, "rb")
+
+def _is_json_array(path: Path) -> bool:
+    """Indica si un JSON es un array (mongoimport necesita --jsonArray) o JSON por líneas."""
+    with _open(path) as f:
+        return f.read(64).lstrip()[:1] == b"["
+
+# =============================================================================
+# CARGA EN STREAMING
+# =============================================================================
+
+def seed_file(record: dict, path: Path, table: str = "") -> SeedResult:
+    """
+    Envía un archivo al contenedor por stdin y mide el rendimiento.
+
+    Args:
+        record: Registro del proyecto
+        path: Archivo a cargar (.sql, .csv, .json, .js, opcionalmente .gz)
+        table: Tabla o colección destino; por defecto el nombre del archivo
+
+    Returns:
+        SeedResult: Líneas enviadas (sin la cabecera CSV), bytes y tiempo empleado
+
+    Raises:
+        SeedError: Si el tipo no está soportado o el cliente devuelve error
+    """
+    command, method = build_seed_command(record, path, table or table_name(path))
+
+    start = time.monotonic()
+    lines = 0
+    sent = 0
+    # stderr va a un archivo temporal para que un cliente muy verboso no bloquee la tubería
+    errors = tempfile.TemporaryFile()
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=errors)
+    stdin = process.stdin
+    assert stdin is not None
+
+    try:
+        with _open(path) as f:
+            while chunk := f.read(CHUNK_SIZE):
+                stdin.write(chunk)
+                lines += chunk.count(b"\n")
+                sent += len(chunk)
+        stdin.close()
+    except BrokenPipeError:
+        # El cliente terminó antes de tiempo; el error real está en stderr
+        pass
+    except BaseException:
+        process.kill()
+        raise
+
+    returncode = process.wait()
+    errors.seek(0)
+    stderr = errors.read().decode(errors="replace").strip()
+    errors.close()
+    if returncode != 0:
+        raise SeedError(stderr.splitlines()[-1] if stderr else f"{method} terminó con código {process.returncode}")
+
+    # En CSV la primera línea es la cabecera
+    if file_kind(path) == "csv":
+        lines = max(lines - 1, 0)
+    return SeedResult(path, method, lines, sent, time.monotonic() - start)
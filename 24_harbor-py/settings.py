@@ -0,0 +1,30 @@
+"""
+Configuración básica de Harbor compartida por el CLI completo y la vía rápida.
+
+Solo usa la librería estándar para poder importarse sin coste en los
+comandos que no necesitan typer ni Rich. pathlib (que arrastra re, urllib
+e ipaddress) se carga la primera vez que alguien pide HARBOR_VOLUMES_DIR,
+así que `harbor --version` no lo paga.
+"""
+
+# Información de la aplicación
+__version__ = "2.0.0"
+
+# Valores por defecto que aparecen en las opciones del CLI. Viven aquí para
+# que harbor.py no tenga que importar readiness (asyncio) ni broker al arrancar.
+
+# Tiempo máximo por defecto hasta declarar que la base no arrancó (segundos)
+DEFAULT_WAIT_TIMEOUT = 60.0
+
+# Segundos sin peticiones antes de que el broker se apague solo
+BROKER_IDLE_TIMEOUT = 900
+
+# Segundos máximos de una consulta
+QUERY_TIMEOUT = 60
+
+def __getattr__(name: str):
+    # Directorio centralizado donde se almacenan todos los proyectos
+    if name == "HARBOR_VOLUMES_DIR":
+        from pathlib import Path
+        return Path.home() / "Documentos" / "harbor_volumenes"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,255 @@
+"""
+Snapshots de volúmenes para Harbor.
+
+Guarda el contenido de un volumen Docker como un tarball comprimido y lo
+restaura en un volumen nuevo, para que una base de datos de pruebas
+arranque ya poblada en segundos en lugar de volver a ejecutar el seed.
+
+Todo fluye por tuberías: `tar` dentro de un contenedor auxiliar escribe en
+stdout y el compresor lee de ahí, sin archivo temporal del tamaño completo.
+Se usa zstd si está instalado y gzip (de la librería estándar) si no.
+"""
+
+import json
+import gzip
+import shutil
+import subprocess
+from typing import Optional
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+# Imagen mínima con tar para leer y escribir volúmenes
+HELPER_IMAGE = "busybox:stable"
+
+# Tamaño de bloque al copiar entre procesos
+CHUNK_SIZE = 1024 * 1024
+
+ZSTD_SUFFIX = ".tar.zst"
+GZIP_SUFFIX = ".tar.gz"
+
+class SnapshotError(Exception):
+    """Error al crear o restaurar un snapshot."""
+
+@dataclass
+class SnapshotInfo:
+    """Metadatos guardados junto a cada snapshot."""
+    name: str
+    path: Path
+    project_name: str
+    image: str
+    version: str
+    created_at: str
+    size: int
+
+# =============================================================================
+# UTILIDADES
+# =============================================================================
+
+def has_zstd() -> bool:
+    """Indica si el binario zstd está disponible."""
+    return shutil.which("zstd") is not None
+
+def find_snapshot(snapshots_dir: Path, name: str) -> Optional[Path]:
+    """Busca el archivo de un snapshot por nombre, con cualquier compresión."""
+    for suffix in (ZSTD_SUFFIX, GZIP_SUFFIX):
+        path = snapshots_dir / f"{name}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+def _copy_stream(source, target):
+    """Copia un flujo en bloques sin cargarlo completo en memoria."""
+    while chunk := source.read(CHUNK_SIZE):
+        target.write(chunk)
+
+def _feed_process(source, process: subprocess.Popen, what: str):
+    """
+    Copia un flujo al stdin de un proceso y lo cierra.
+
+    Si el proceso termina antes de leerlo todo (imagen que falta, volumen
+    inválido...), la escritura falla con BrokenPipeError: se espera al proceso
+    y se lanza SnapshotError con su stderr, que explica el motivo real.
+    """
+    stdin = process.stdin
+    assert stdin is not None, "el proceso debe abrirse con stdin=PIPE"
+    while True:
+        # Los errores al leer el snapshot se propagan tal cual; solo se atrapa la escritura
+        chunk = source.read(CHUNK_SIZE)
+        try:
+            if not chunk:
+                stdin.close()
+                return
+            stdin.write(chunk)
+        except OSError as e:
+            error = e
+            break
+
+    try:
+        stdin.close()
+    except OSError:
+        pass
+    _wait(process, what)
+    raise SnapshotError(f"{what} terminó antes de recibir todo el snapshot ({error})") from error
+
+def _wait(process: subprocess.Popen, what: str):
+    """Espera a un proceso de la tubería y convierte su fallo en SnapshotError."""
+    stderr = process.stderr.read().decode(errors="replace").strip() if process.stderr else ""
+    if process.wait() != 0:
+        raise SnapshotError(f"{what} falló: {stderr or f'código {process.returncode}'}")
+
+# =============================================================================
+# CREAR Y RESTAURAR
+# =============================================================================
+
+def create_snapshot(snapshots_dir: Path, name: str, volume: str, project_info: dict) -> SnapshotInfo:
+    """
+    Guarda el contenido de un volumen como tarball comprimido.
+
+    Args:
+        snapshots_dir: Carpeta donde se guardan los snapshots
+        name: Nombre del snapshot
+        volume: Volumen Docker a copiar
+        project_info: Datos del proyecto (imagen, versión...) para los metadatos
+
+    Returns:
+        SnapshotInfo: Metadatos del snapshot creado
+
+    Raises:
+        SnapshotError: Si docker, tar o el compresor fallan
+    """
+    snapshots_dir.mkdir(parents=True, exist_ok=True)
+    suffix = ZSTD_SUFFIX if has_zstd() else GZIP_SUFFIX
+    path = snapshots_dir / f"{name}{suffix}"
+    partial = path.with_name(path.name + ".partial")
+
+    tar = subprocess.Popen(
+        ["docker", "run", "--rm", "-v", f"{volume}:/data:ro", HELPER_IMAGE, "tar", "-C", "/data", "-cf", "-", "."],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    assert tar.stdout is not None
+
+    try:
+        if suffix == ZSTD_SUFFIX:
+            compressor = subprocess.Popen(
+                ["zstd", "-q", "-T0", "-f", "-o", str(partial)],
+                stdin=tar.stdout, stderr=subprocess.PIPE
+            )
+            tar.stdout.close()  # El compresor es ahora el único lector
+            _wait(compressor, "zstd")
+        else:
+            with gzip.open(partial, "wb", compresslevel=6) as f:
+                _copy_stream(tar.stdout, f)
+        _wait(tar, "tar del volumen")
+    except BaseException:
+        tar.kill()
+        partial.unlink(missing_ok=True)
+        raise
+
+    partial.replace(path)
+
+    info = SnapshotInfo(
+        name=name,
+        path=path,
+        project_name=project_info.get("project_name", ""),
+        image=project_info.get("image", ""),
+        version=project_info.get("version", ""),
+        created_at=datetime.now().isoformat(timespec="seconds"),
+        size=path.stat().st_size,
+    )
+    _write_metadata(snapshots_dir, info)
+    return info
+
+def restore_snapshot(snapshots_dir: Path, name: str, volume: str, labels: Optional[dict] = None):
+    """
+    Crea un volumen y vuelca en él el contenido de un snapshot.
+
+    Args:
+        snapshots_dir: Carpeta donde se guardan los snapshots
+        name: Nombre del snapshot
+        volume: Volumen Docker destino (se crea si no existe)
+        labels: Etiquetas para el volumen nuevo
+
+    Raises:
+        SnapshotError: Si el snapshot no existe o la restauración falla
+    """
+    path = find_snapshot(snapshots_dir, name)
+    if path is None:
+        raise SnapshotError(f"No existe el snapshot '{name}' en {snapshots_dir}")
+
+    label_args = [arg for key, value in (labels or {}).items() for arg in ("--label", f"{key}={value}")]
+    try:
+        subprocess.run(["docker", "volume", "create", *label_args, volume], check=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        raise SnapshotError(f"No se pudo crear el volumen {volume}: {e.stderr.decode(errors='replace').strip()}") from e
+
+    untar = subprocess.Popen(
+        ["docker", "run", "--rm", "-i", "-v", f"{volume}:/data", HELPER_IMAGE, "tar", "-C", "/data", "-xf", "-"],
+        stdin=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    assert untar.stdin is not None
+
+    try:
+        if path.name.endswith(ZSTD_SUFFIX):
+            if not has_zstd():
+                raise SnapshotError("El snapshot usa zstd pero el binario zstd no está instalado")
+            decompressor = subprocess.Popen(
+                ["zstd", "-q", "-d", "-c", str(path)],
+                stdout=untar.stdin, stderr=subprocess.PIPE
+            )
+            untar.stdin.close()  # El descompresor es ahora el único escritor
+            try:
+                _wait(decompressor, "zstd")
+            except SnapshotError:
+                # Si el contenedor terminó antes, su error explica el fallo de zstd
+                _wait(untar, "tar en el volumen")
+                raise
+        else:
+            try:
+                with gzip.open(path, "rb") as f:
+                    _feed_process(f, untar, "tar en el volumen")
+            except (gzip.BadGzipFile, EOFError) as e:
+                raise SnapshotError(f"El snapshot {path.name} está dañado: {e}") from e
+        _wait(untar, "tar en el volumen")
+    except BaseException:
+        untar.kill()
+        raise
+
+def list_snapshots(snapshots_dir: Path) -> list[SnapshotInfo]:
+    """Devuelve los snapshots guardados, del más reciente al más antiguo."""
+    snapshots = []
+    for meta_path in snapshots_dir.glob("*.json"):
+        try:
+            with open(meta_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        path = find_snapshot(snapshots_dir, data.get("name", meta_path.stem))
+        if path is not None:
+            snapshots.append(SnapshotInfo(**{**data, "path": path}))
+
+    return sorted(snapshots, key=lambda s: s.created_at, reverse=True)
+
+def read_metadata(snapshots_dir: Path, name: str) -> Optional[dict]:
+    """Lee los metadatos de un snapshot, o None si no existen."""
+    try:
+        with open(snapshots_dir / f"{name}.json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_metadata(snapshots_dir: Path, info: SnapshotInfo):
+    data = {
+        "name": info.name,
+        "project_name": info.project_name,
+        "image": info.image,
+        "version": info.version,
+        "created_at": info.created_at,
+        "size": info.size,
+    }
+    with open(snapshots_dir / f"{info.name}.json", "w") as f:
+        json.dump(data, f, indent=4)
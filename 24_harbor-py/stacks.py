@@ -0,0 +1,176 @@
+"""
+Stacks de Harbor: varios motores en un único proyecto de compose.
+
+Un stack se describe en un archivo TOML:
+
+    name = "pagos"            # opcional, por defecto el nombre del archivo
+    password = "secreto"      # opcional, contraseña del usuario en todos los motores
+    ttl = "2d"                # opcional, como `harbor new --ttl`
+
+    [services.db]
+    image = "postgres"
+    version = "16"
+
+    [services.cache]
+    image = "redis"
+    fast = true
+
+    [services.docs]
+    image = "mongo"
+    memory = "512m"
+
+Todos los servicios van en un solo docker-compose.yml y comparten una red,
+así que se alcanzan entre sí por el nombre del servicio (db, cache, docs).
+"""
+
+import tomllib
+from typing import Optional
+from pathlib import Path
+from dataclasses import dataclass
+
+from engines import get_profile, build_service, render_compose
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+# Claves admitidas en cada [services.<nombre>]
+SERVICE_KEYS = {"image", "version", "port", "fast", "memory", "cpus"}
+
+class StackError(Exception):
+    """Error en la definición de un stack."""
+
+@dataclass
+class ServiceSpec:
+    """Un servicio declarado en el archivo del stack."""
+    name: str
+    image: str
+    version: str = "latest"
+    port: Optional[int] = None
+    fast: bool = False
+    memory: Optional[str] = None
+    cpus: Optional[float] = None
+
+    @property
+    def preferred_port(self) -> int:
+        """Puerto del host con el que empieza la búsqueda."""
+        return self.port or get_profile(self.image).default_port
+
+@dataclass
+class StackSpec:
+    """Definición completa de un stack."""
+    name: str
+    services: list[ServiceSpec]
+    password: str = "password"
+    ttl: Optional[str] = None
+
+# =============================================================================
+# LECTURA DEL ARCHIVO
+# =============================================================================
+
+def load_stack(path: Path) -> StackSpec:
+    """
+    Lee y valida un archivo de stack.
+
+    Args:
+        path: Archivo TOML con la definición
+
+    Returns:
+        StackSpec: Stack con sus servicios en el orden del archivo
+
+    Raises:
+        StackError: Si el archivo no existe, no es TOML válido o le faltan datos
+    """
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except OSError as e:
+        raise StackError(f"No se pudo leer {path}: {e.strerror}") from e
+    except tomllib.TOMLDecodeError as e:
+        raise StackError(f"{path} no es TOML válido: {e}") from e
+
+    services_data = data.get("services")
+    if not isinstance(services_data, dict) or not services_data:
+        raise StackError(f"{path} no define ningún [services.<nombre>]")
+
+    services = []
+    for name, options in services_data.items():
+        if not isinstance(options, dict) or not options.get("image"):
+            raise StackError(f"El servicio '{name}' necesita una clave image")
+
+        unknown = set(options) - SERVICE_KEYS
+        if unknown:
+            raise StackError(f"Claves desconocidas en '{name}': {', '.join(sorted(unknown))}")
+
+        # `version = 16` en TOML es un entero; la etiqueta de la imagen siempre es texto
+        service = ServiceSpec(name=name, **{**options, "version": str(options.get("version", "latest"))})
+        if not service.preferred_port:
+            raise StackError(f"'{name}' usa {service.image}, sin puerto conocido: indica port = ...")
+        services.append(service)
+
+    return StackSpec(
+        name=str(data.get("name") or path.stem),
+        services=services,
+        password=str(data.get("password", "password")),
+        ttl=data.get("ttl"),
+    )
+
+# =============================================================================
+# GENERACIÓN DEL COMPOSE
+# =============================================================================
+
+def network_name(stack_name: str) -> str:
+    """Nombre de la red compartida por los servicios del stack."""
+    return f"{stack_name}_net"
+
+def build_stack_compose(
+    stack: StackSpec,
+    ports: dict[str, int],
+    credentials: dict[str, str],
+    labels: dict[str, str]
+) -> tuple[str, dict[str, dict]]:
+    """
+    Genera el docker-compose.yml de un stack completo.
+
+    Args:
+        stack: Definición del stack
+        ports: Servicio -> puerto del host ya asignado
+        credentials: Credenciales comunes a todos los servicios
+        labels: Etiquetas de Harbor para contenedores, volúmenes y red
+
+    Returns:
+        tuple: (contenido YAML, servicio -> datos para el registro)
+    """
+    services = {}
+    volumes = {}
+    records = {}
+
+    for spec in stack.services:
+        profile = get_profile(spec.image, spec.port)
+        container_name = f"{stack.name}_{spec.name}"
+        volume_name = None if spec.fast else f"{stack.name}_{spec.name}_data"
+
+        service = build_service(
+            profile, spec.version, container_name, credentials, ports[spec.name], labels,
+            volume_name=volume_name, fast=spec.fast, memory=spec.memory, cpus=spec.cpus
+        )
+        service["networks"] = ["harbor"]
+        services[spec.name] = service
+
+        if volume_name:
+            volumes[volume_name] = {"name": volume_name, "labels": dict(labels)}
+
+        records[spec.name] = {
+            "image": spec.image,
+            "version": spec.version,
+            "container_name": container_name,
+            "port": ports[spec.name],
+            "container_port": profile.container_port,
+            "volume": volume_name,
+            "fast": spec.fast,
+            "memory": spec.memory,
+            "cpus": spec.cpus,
+        }
+
+    networks = {"harbor": {"name": network_name(stack.name), "labels": dict(labels)}}
+    return render_compose(services, volumes, networks), records
@@ -0,0 +1,118 @@
+"""
+Configuración común de las pruebas de Harbor.
+
+Los módulos de Harbor se importan por nombre (como hace harbor.py), así que
+se añade la carpeta del proyecto al path. El fixture `fake_docker` levanta
+un servidor HTTP en un socket Unix temporal que imita la API de Docker
+Engine y apunta DOCKER_HOST a él.
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import socketserver
+import http.server
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import docker_api  # noqa: E402
+from registry import ProjectRegistry  # noqa: E402
+
+class FakeDockerHandler(http.server.BaseHTTPRequestHandler):
+    """Responde cada petición con la ruta registrada en el servidor."""
+
+    protocol_version = "HTTP/1.1"
+    server: "FakeDockerServer"
+
+    def address_string(self):
+        return "unix"
+
+    def _reply(self):
+        self.server.requests.append((self.command, self.path))
+        status, body = self.server.route(self.command, self.path)
+
+        if isinstance(body, list) and self.path.startswith(self.server.stream_prefixes):
+            # Endpoints de streaming: un objeto JSON por línea, sin Content-Length
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for item in body:
+                self.wfile.write(json.dumps(item).encode() + b"\n")
+            self.close_connection = True
+            return
+
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    do_GET = _reply
+    do_POST = _reply
+    do_DELETE = _reply
+
+    def log_message(self, *args):
+        pass
+
+class FakeDockerServer(socketserver.ThreadingUnixStreamServer):
+    """API de Docker falsa: ruta -> (estado HTTP, cuerpo JSON)."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        super().__init__(socket_path, FakeDockerHandler)
+        self.routes: dict[str, tuple[int, object]] = {}
+        self.requests: list[tuple[str, str]] = []
+        # Rutas que se responden como flujo (un JSON por línea), como /events
+        self.stream_prefixes = ("/events",)
+
+    def route(self, method: str, path: str) -> tuple[int, object]:
+        # Gana el prefijo más largo registrado; el resto responde 404
+        matches = [prefix for prefix in self.routes if path.startswith(prefix)]
+        if not matches:
+            return 404, {"message": f"no route for {path}"}
+        return self.routes[max(matches, key=len)]
+
+@pytest.fixture
+def fake_docker(monkeypatch):
+    """Servidor de la API de Docker en un socket temporal, con DOCKER_HOST apuntando a él."""
+    # Los sockets Unix tienen un límite de ~100 caracteres: se evita tmp_path
+    directory = tempfile.mkdtemp(prefix="harbor-docker-")
+    socket_path = f"{directory}/docker.sock"
+    server = FakeDockerServer(socket_path)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("DOCKER_HOST", f"unix://{socket_path}")
+    monkeypatch.setattr(docker_api, "_snapshot_cache", None)
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+@pytest.fixture
+def no_docker(monkeypatch, tmp_path):
+    """Docker inaccesible: el socket no existe y la CLI no está instalada."""
+    monkeypatch.setenv("DOCKER_HOST", f"unix://{tmp_path}/missing.sock")
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.setattr(docker_api, "_snapshot_cache", None)
+
+@pytest.fixture
+def harbor_registry(monkeypatch, tmp_path):
+    """Registro de proyectos de harbor.py en un directorio temporal."""
+    import harbor
+
+    registry = ProjectRegistry(tmp_path)
+    monkeypatch.setattr(harbor, "registry", registry)
+    monkeypatch.setattr(harbor, "HARBOR_VOLUMES_DIR", tmp_path)
+    return registry
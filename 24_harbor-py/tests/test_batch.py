@@ -0,0 +1,87 @@
+"""Pruebas de los manifiestos de lote (batch.py)."""
+
+import pytest
+
+from batch import BatchError, load_batch, matrix_project_name
+
+def write_manifest(tmp_path, text: str, name: str = "ci.yml"):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+# =============================================================================
+# EXPANSIÓN DE LA MATRIZ
+# =============================================================================
+
+def test_matrix_expands_image_by_version(tmp_path):
+    spec = load_batch(write_manifest(tmp_path, """
+matrix:
+  image: [postgres, mysql]
+  version: ["15", "16"]
+"""))
+
+    assert [project.name for project in spec.projects] == [
+        "ci-postgres-15", "ci-postgres-16", "ci-mysql-15", "ci-mysql-16",
+    ]
+    assert spec.password == "password"
+
+def test_defaults_apply_to_matrix_and_projects(tmp_path):
+    spec = load_batch(write_manifest(tmp_path, """
+prefix: job
+password: secreto
+ttl: 2h
+fast: true
+memory: 256m
+
+matrix:
+  image: redis
+
+projects:
+  - name: legado
+    image: postgres
+    version: 12
+    memory: 512m
+"""))
+
+    cache, legacy = spec.projects
+    assert (cache.name, cache.version, cache.fast, cache.memory) == ("job-redis-latest", "latest", True, "256m")
+    assert (legacy.name, legacy.version, legacy.fast, legacy.memory) == ("legado", "12", True, "512m")
+    assert (spec.password, spec.ttl) == ("secreto", "2h")
+
+def test_matrix_project_name_is_sanitized():
+    assert matrix_project_name("ci", "bitnami/postgresql", "16.1") == "ci-postgresql-16-1"
+    assert matrix_project_name("ci", "redis", "7 alpine") == "ci-redis-7-alpine"
+
+# =============================================================================
+# ERRORES
+# =============================================================================
+
+@pytest.mark.parametrize("text, message", [
+    ("prefix: ci\n", "ningún proyecto"),
+    ("- postgres\n", "debe ser un mapa"),
+    ("matrix:\n  image: postgres\nextra: 1\n", "Claves desconocidas"),
+    ("matrix:\n  version: ['16']\n", "al menos una lista image"),
+    ("matrix:\n  image: postgres\n  arch: arm\n", "solo admite"),
+    ("matrix:\n  image: [[postgres]]\n", "debe ser un valor"),
+    ("projects:\n  - image: postgres\n", "necesita una clave name"),
+    ("projects:\n  - name: a\n", "necesita una clave image"),
+    ("projects:\n  - name: a\n    image: mi/imagen\n", "sin puerto conocido"),
+    ("projects:\n  - name: a\n    image: postgres\n    replicas: 2\n", "replicas"),
+    ("matrix: [\n", "no es YAML válido"),
+])
+def test_load_batch_errors(tmp_path, text, message):
+    with pytest.raises(BatchError, match=message):
+        load_batch(write_manifest(tmp_path, text))
+
+def test_duplicate_names_are_rejected(tmp_path):
+    path = write_manifest(tmp_path, """
+matrix:
+  image: postgres
+  version: "16"
+projects:
+  - name: ci-postgres-16
+    image: postgres
+""")
+
+    with pytest.raises(BatchError, match="aparece dos veces"):
+        load_batch(path)
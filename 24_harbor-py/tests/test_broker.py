@@ -0,0 +1,190 @@
+"""Pruebas del broker de conexiones con sesiones falsas sobre un socket Unix temporal."""
+
+import shutil
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+import broker
+from broker import BrokerError, BrokerServer, RedisSession, send_request, run_query, _format_resp
+
+class FakeSession:
+    """Sesión que responde sin motor: "fallo" lanza BrokerError y el resto se devuelve tal cual."""
+
+    created: list["FakeSession"] = []
+
+    def __init__(self, record: dict):
+        self.record = record
+        self.queries = []
+        self.closed = False
+        FakeSession.created.append(self)
+
+    def execute(self, query: str, timeout: float = 60) -> str:
+        if query == "fallo":
+            raise BrokerError("El cliente terminó con código 2")
+        self.queries.append(query)
+        return query
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def socket_dir():
+    # Los sockets Unix tienen un límite de ~100 caracteres: se evita tmp_path
+    directory = tempfile.mkdtemp(prefix="harbor-broker-")
+    yield Path(directory)
+    shutil.rmtree(directory, ignore_errors=True)
+
+@pytest.fixture
+def running_broker(monkeypatch, socket_dir):
+    """Broker atendiendo en un hilo con sesiones falsas; se apaga al terminar la prueba."""
+    FakeSession.created = []
+    monkeypatch.setattr(broker, "create_session", FakeSession)
+    server = BrokerServer(socket_dir / "broker.sock")
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(timeout=5)
+
+RECORD = {"image": "postgres", "container_name": "demo_container", "port": 5433}
+
+def query(server: BrokerServer, text: str, record: dict = RECORD) -> dict:
+    return send_request(server.socket_path, {"op": "query", "record": record, "query": text}, timeout=5)
+
+# =============================================================================
+# PROTOCOLO
+# =============================================================================
+
+def test_ping(running_broker):
+    assert send_request(running_broker.socket_path, {"op": "ping"}) == {"ok": True, "output": "", "sessions": 0}
+
+def test_query_response_fields(running_broker):
+    response = query(running_broker, "SELECT 1;")
+
+    assert response["ok"]
+    assert response["output"] == "SELECT 1;"
+    assert response["error"] == ""
+    assert response["seconds"] >= 0
+
+def test_engine_errors_in_the_output_are_not_ok(running_broker):
+    response = query(running_broker, "ERROR:  relation \"t\" does not exist")
+
+    assert not response["ok"]
+    assert response["output"].startswith("ERROR")
+
+def test_session_errors_are_reported(running_broker):
+    response = query(running_broker, "fallo")
+
+    assert response == {"ok": False, "output": "", "error": "El cliente terminó con código 2", "seconds": response["seconds"]}
+
+def test_invalid_json_closes_without_answer(running_broker):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(str(running_broker.socket_path))
+        sock.sendall(b"no es json\n")
+        assert sock.recv(1024) == b""
+
+# =============================================================================
+# SESIONES
+# =============================================================================
+
+def test_sessions_are_reused_per_container(running_broker):
+    query(running_broker, "SELECT 1;")
+    query(running_broker, "SELECT 2;")
+    query(running_broker, "PING", {"image": "redis", "container_name": "cache", "port": 6380})
+
+    assert len(FakeSession.created) == 2
+    assert FakeSession.created[0].queries == ["SELECT 1;", "SELECT 2;"]
+    assert send_request(running_broker.socket_path, {"op": "ping"})["sessions"] == 2
+
+def test_changed_record_reopens_the_session(running_broker):
+    query(running_broker, "SELECT 1;")
+    query(running_broker, "SELECT 1;", {**RECORD, "port": 5434})
+
+    first, second = FakeSession.created
+    assert first.closed
+    assert not second.closed
+    assert second.record["port"] == 5434
+
+def test_shutdown_closes_sessions_and_removes_the_socket(monkeypatch, socket_dir):
+    FakeSession.created = []
+    monkeypatch.setattr(broker, "create_session", FakeSession)
+    server = BrokerServer(socket_dir / "broker.sock")
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+
+    query(server, "SELECT 1;")
+    assert send_request(server.socket_path, {"op": "shutdown"})["ok"]
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert FakeSession.created[0].closed
+    assert not server.socket_path.exists()
+
+def test_idle_timeout_stops_the_broker(monkeypatch, socket_dir):
+    monkeypatch.setattr(broker, "create_session", FakeSession)
+    server = BrokerServer(socket_dir / "broker.sock", idle_timeout=0.1)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert not server.socket_path.exists()
+
+# =============================================================================
+# CLIENTE
+# =============================================================================
+
+def test_run_query_uses_the_running_broker(running_broker):
+    # El comando de arranque no debe usarse: el broker ya escucha
+    result = run_query(running_broker.socket_path, {**RECORD, "extra": "ignorado"}, "SELECT 1;", ["false"], timeout=5)
+
+    assert result["output"] == "SELECT 1;"
+    assert "extra" not in FakeSession.created[0].record
+
+def test_run_query_fails_when_the_broker_never_starts(monkeypatch, socket_dir):
+    monkeypatch.setattr(broker, "BROKER_START_TIMEOUT", 0.2)
+
+    with pytest.raises(BrokerError, match="no arrancó"):
+        run_query(socket_dir / "broker.sock", RECORD, "SELECT 1;", ["true"], timeout=1)
+
+# =============================================================================
+# REDIS
+# =============================================================================
+
+def test_redis_session_speaks_resp():
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        port = listener.getsockname()[1]
+        received = []
+
+        def serve():
+            connection, _ = listener.accept()
+            with connection:
+                received.append(connection.recv(1024))
+                connection.sendall(b"*2\r\n$5\r\nhola \r\n$-1\r\n")
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        session = RedisSession({"port": port})
+        try:
+            output = session.execute('GET "con espacio"', timeout=5)
+        finally:
+            session.close()
+        thread.join(timeout=5)
+
+    assert received == [b"*2\r\n$3\r\nGET\r\n$11\r\ncon espacio\r\n"]
+    assert output == '1) "hola "\n2) (nil)'
+
+def test_format_resp():
+    assert _format_resp(broker.RedisStatusReply("OK")) == "OK"
+    assert _format_resp(broker.RedisErrorReply("WRONGTYPE")) == "(error) WRONGTYPE"
+    assert _format_resp(3) == "(integer) 3"
+    assert _format_resp([]) == "(empty array)"
+    assert _format_resp(["a", ["b"]]) == '1) "a"\n2)    1) "b"'
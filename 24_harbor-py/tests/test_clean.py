@@ -0,0 +1,75 @@
+"""Pruebas de la selección de `harbor clean`."""
+
+import subprocess
+from datetime import datetime, timedelta
+
+import pytest
+
+import harbor
+from docker_api import ContainerInfo, DockerSnapshot
+from harbor import select_clean_targets, clean_volume_names, remove_harbor_containers
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+def container(name: str, created: str = "", **labels) -> ContainerInfo:
+    return ContainerInfo(id=f"id-{name}", name=name, image="postgres:16", state="exited", status="", created=created, labels=labels)
+
+def harbor_container(name: str, project: str, created: str = "") -> ContainerInfo:
+    return container(name, created, **{"com.harbor.managed": "true", "com.harbor.project": project})
+
+def test_foreign_containers_are_never_selected():
+    snapshot = DockerSnapshot([
+        harbor_container("demo_container", "demo"),
+        container("legado_container"),
+        container("ajeno"),
+        # Otra herramienta con etiquetas propias
+        container("otro", **{"com.harbor.managed": "false"}),
+    ])
+
+    targets = select_clean_targets(snapshot, {"legado_container": "legado"}, now=NOW)
+
+    assert {name: project for name, (_, project) in targets.items()} == {
+        "demo_container": "demo",
+        "legado_container": "legado",
+    }
+
+def test_older_than_keeps_recent_and_undated_containers():
+    snapshot = DockerSnapshot([
+        harbor_container("viejo", "a", created="2024-05-01T12:00:00"),
+        harbor_container("nuevo", "b", created="2024-06-01T11:00:00"),
+        harbor_container("sin_fecha", "c"),
+    ])
+
+    targets = select_clean_targets(snapshot, {}, max_age=timedelta(days=2), now=NOW)
+
+    assert list(targets) == ["viejo"]
+
+def test_clean_volume_names_only_for_registered_projects():
+    projects = {
+        "demo": {"volume": "demo_data"},
+        "pagos": {"services": {"db": {"volume": "pagos_db_data"}, "cache": {"volume": None}}},
+    }
+
+    assert clean_volume_names(["demo", "pagos", "desconocido"], projects) == ["demo_data", "pagos_db_data"]
+    assert clean_volume_names([], projects) == []
+
+def test_remove_harbor_containers_uses_one_call_per_kind(monkeypatch):
+    calls = []
+    monkeypatch.setattr(harbor.subprocess, "run", lambda command, **kwargs: calls.append(command))
+
+    remove_harbor_containers([container("a"), container("b")], ["a_data", "b_data"])
+    remove_harbor_containers([], [])
+
+    assert calls == [
+        ["docker", "rm", "-f", "-v", "id-a", "id-b"],
+        ["docker", "volume", "rm", "-f", "a_data", "b_data"],
+    ]
+
+def test_remove_harbor_containers_propagates_docker_errors(monkeypatch):
+    def failing_run(command, **kwargs):
+        raise subprocess.CalledProcessError(1, command)
+
+    monkeypatch.setattr(harbor.subprocess, "run", failing_run)
+
+    with pytest.raises(subprocess.CalledProcessError):
+        remove_harbor_containers([container("a")], [])
@@ -0,0 +1,170 @@
+"""Pruebas del cliente de la API de Docker (docker_api.py)."""
+
+import json
+import subprocess
+from datetime import datetime
+
+import pytest
+
+import docker_api
+from docker_api import (
+    DockerUnavailableError, PortMapping, DockerSnapshot, api_request, get_snapshot,
+    parse_cli_ports, parse_cli_labels, parse_cli_created, _container_from_api, _container_from_cli
+)
+
+API_CONTAINER = {
+    "Id": "abc123",
+    "Names": ["/pg_container"],
+    "Image": "postgres:16",
+    "State": "running",
+    "Status": "Up 2 hours",
+    "Created": 1700000000,
+    "Ports": [
+        {"IP": "0.0.0.0", "PrivatePort": 5432, "PublicPort": 15432, "Type": "tcp"},
+        {"IP": "::", "PrivatePort": 5432, "PublicPort": 15432, "Type": "tcp"},
+        {"PrivatePort": 8080, "Type": "tcp"},
+    ],
+    "Labels": {"com.harbor.managed": "true", "com.harbor.project": "pg"},
+}
+
+# =============================================================================
+# PUERTOS DE `docker ps`
+# =============================================================================
+
+def test_parse_cli_ports_single_mapping():
+    assert parse_cli_ports("0.0.0.0:5432->5432/tcp") == [PortMapping(5432, 5432, "tcp")]
+
+def test_parse_cli_ports_deduplicates_ipv4_and_ipv6():
+    text = "0.0.0.0:5432->5432/tcp, :::5432->5432/tcp"
+    assert parse_cli_ports(text) == [PortMapping(5432, 5432, "tcp")]
+
+def test_parse_cli_ports_expands_ranges():
+    assert parse_cli_ports("0.0.0.0:8000-8002->9000-9002/tcp") == [
+        PortMapping(8000, 9000, "tcp"),
+        PortMapping(8001, 9001, "tcp"),
+        PortMapping(8002, 9002, "tcp"),
+    ]
+
+def test_parse_cli_ports_keeps_protocols_apart():
+    text = "0.0.0.0:53->53/tcp, 0.0.0.0:53->53/udp"
+    assert parse_cli_ports(text) == [PortMapping(53, 53, "tcp"), PortMapping(53, 53, "udp")]
+
+def test_parse_cli_ports_ignores_unpublished_ports():
+    assert parse_cli_ports("5432/tcp") == []
+    assert parse_cli_ports("") == []
+
+def test_parse_cli_labels():
+    assert parse_cli_labels("com.harbor.managed=true,com.harbor.project=pg,sin_valor") == {
+        "com.harbor.managed": "true",
+        "com.harbor.project": "pg",
+    }
+
+def test_parse_cli_created_keeps_unknown_text():
+    assert parse_cli_created("hace un rato") == "hace un rato"
+
+def test_parse_cli_created_converts_to_local_iso():
+    created = parse_cli_created("2024-01-01 10:00:00 +0000 UTC")
+    expected = datetime.fromisoformat("2024-01-01T10:00:00+00:00").astimezone().replace(tzinfo=None)
+    assert created == expected.isoformat(timespec="seconds")
+
+# =============================================================================
+# CONVERSIÓN DE CONTENEDORES
+# =============================================================================
+
+def test_container_from_api():
+    container = _container_from_api(API_CONTAINER)
+
+    assert container.id == "abc123"
+    assert container.name == "pg_container"
+    assert container.running
+    assert container.ports == [PortMapping(15432, 5432, "tcp")]
+    assert container.ports_text == "15432->5432/tcp"
+    assert container.labels["com.harbor.project"] == "pg"
+
+def test_container_from_api_with_missing_fields():
+    container = _container_from_api({"Id": "x", "State": "exited", "Ports": None, "Labels": None})
+
+    assert container.name == ""
+    assert not container.running
+    assert container.ports == []
+    assert container.labels == {}
+
+def test_container_created_at():
+    container = _container_from_api(API_CONTAINER)
+
+    assert container.created_at == datetime.fromtimestamp(1700000000)
+    assert _container_from_api({"Id": "x"}).created_at is None
+    assert _container_from_cli({"ID": "x", "CreatedAt": "hace un rato"}).created_at is None
+
+def test_container_from_cli_matches_api_shape():
+    container = _container_from_cli({
+        "ID": "abc123",
+        "Names": "pg_container",
+        "Image": "postgres:16",
+        "State": "running",
+        "Status": "Up 2 hours",
+        "Ports": "0.0.0.0:15432->5432/tcp, :::15432->5432/tcp",
+        "Labels": "com.harbor.project=pg",
+    })
+
+    assert container.ports == [PortMapping(15432, 5432, "tcp")]
+    assert container.labels == {"com.harbor.project": "pg"}
+
+def test_snapshot_port_index():
+    snapshot = DockerSnapshot([
+        _container_from_api(API_CONTAINER),
+        _container_from_api({"Id": "def", "Names": ["/old"], "Image": "mysql:8", "State": "exited"}),
+    ])
+
+    # Solo cuentan los puertos publicados en el host
+    assert snapshot.used_ports == {15432}
+    assert snapshot.is_port_used(15432)
+    assert not snapshot.is_port_used(5432)
+
+# =============================================================================
+# TRANSPORTE SOBRE EL SOCKET
+# =============================================================================
+
+def test_get_snapshot_uses_the_socket_once(fake_docker):
+    fake_docker.routes["/containers/json"] = (200, [API_CONTAINER])
+
+    first = get_snapshot()
+    second = get_snapshot()
+
+    assert first is second
+    assert first.source == "api"
+    assert first.used_ports == {15432}
+    assert fake_docker.requests == [("GET", "/containers/json?all=1")]
+
+def test_get_snapshot_refresh_queries_again(fake_docker):
+    fake_docker.routes["/containers/json"] = (200, [])
+    get_snapshot()
+    fake_docker.routes["/containers/json"] = (200, [API_CONTAINER])
+
+    assert get_snapshot(refresh=True).used_ports == {15432}
+    assert len(fake_docker.requests) == 2
+
+def test_get_snapshot_falls_back_to_cli(monkeypatch, no_docker):
+    line = json.dumps({"ID": "abc", "Names": "pg", "State": "running", "Ports": "0.0.0.0:5432->5432/tcp"})
+
+    def fake_run(command, **kwargs):
+        assert command[:2] == ["docker", "ps"]
+        return subprocess.CompletedProcess(command, 0, stdout=line + "\n", stderr="")
+
+    monkeypatch.setattr(docker_api.subprocess, "run", fake_run)
+    snapshot = get_snapshot(refresh=True)
+
+    assert snapshot.source == "cli"
+    assert snapshot.used_ports == {5432}
+
+def test_get_snapshot_without_docker_raises(no_docker):
+    with pytest.raises(DockerUnavailableError):
+        get_snapshot(refresh=True)
+
+def test_api_request_error_status(fake_docker):
+    with pytest.raises(DockerUnavailableError, match="404"):
+        api_request("GET", "/containers/nope/json")
+
+def test_api_request_empty_body(fake_docker):
+    fake_docker.routes["/containers/abc/start"] = (204, None)
+    assert api_request("POST", "/containers/abc/start") is None
@@ -0,0 +1,63 @@
+"""Pruebas de la vía rápida: `harbor.py` en un proceso aparte, sin typer, Rich ni PyYAML."""
+
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from registry import ProjectRegistry
+
+HARBOR = Path(__file__).resolve().parent.parent / "harbor.py"
+
+# Ejecuta harbor.py como __main__ y, al salir, informa de los módulos pesados cargados
+RUNNER = """
+import sys, json, runpy
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+finally:
+    heavy = sorted(name for name in ("typer", "rich", "yaml") if name in sys.modules)
+    print(json.dumps(heavy), file=sys.stderr)
+"""
+
+def run_harbor(home: Path, *args: str) -> tuple[subprocess.CompletedProcess, list[str]]:
+    """Lanza harbor.py con HOME temporal; devuelve el proceso y los módulos pesados importados."""
+    env = {**os.environ, "HOME": str(home)}
+    result = subprocess.run([sys.executable, "-c", RUNNER, str(HARBOR), *args],
+                            capture_output=True, text=True, env=env, timeout=30)
+    heavy = json.loads(result.stderr.strip().splitlines()[-1])
+    return result, heavy
+
+def test_version_skips_heavy_imports(tmp_path):
+    result, heavy = run_harbor(tmp_path, "--version")
+
+    assert result.returncode == 0
+    assert "Harbor CLI versión" in result.stdout
+    assert heavy == []
+
+def test_list_json_reads_the_registry_without_heavy_imports(tmp_path):
+    ProjectRegistry(tmp_path / "Documentos" / "harbor_volumenes").upsert("demo", {"port": 5433})
+
+    result, heavy = run_harbor(tmp_path, "list", "--json")
+
+    assert result.returncode == 0
+    projects = json.loads(result.stdout)
+    assert [(p["project_name"], p["port"]) for p in projects] == [("demo", 5433)]
+    assert heavy == []
+
+def test_list_json_without_projects(tmp_path):
+    result, heavy = run_harbor(tmp_path, "list", "--json")
+
+    assert json.loads(result.stdout) == []
+    assert heavy == []
+
+@pytest.mark.parametrize("args", [["--help"], ["list"]])
+def test_other_commands_use_the_full_cli(tmp_path, args):
+    pytest.importorskip("typer")
+
+    _, heavy = run_harbor(tmp_path, *args)
+
+    assert "typer" in heavy
@@ -0,0 +1,63 @@
+"""Pruebas de las referencias de imagen y la caché local (images.py)."""
+
+import pytest
+
+from images import ImagePullError, normalize_ref, split_ref, local_image_tags, is_cached, pull_image
+
+@pytest.mark.parametrize("image, expected", [
+    ("postgres", "postgres:latest"),
+    ("postgres:16", "postgres:16"),
+    ("bitnami/redis", "bitnami/redis:latest"),
+    # El puerto del registro no es un tag
+    ("localhost:5000/pg", "localhost:5000/pg:latest"),
+    ("localhost:5000/pg:16", "localhost:5000/pg:16"),
+    ("registry.example.com:5000/equipo/pg:16-alpine", "registry.example.com:5000/equipo/pg:16-alpine"),
+    # Con digest el tag sobra
+    ("postgres@sha256:abc123", "postgres@sha256:abc123"),
+    ("postgres:16@sha256:abc123", "postgres@sha256:abc123"),
+    ("localhost:5000/pg:16@sha256:abc123", "localhost:5000/pg@sha256:abc123"),
+])
+def test_normalize_ref(image, expected):
+    assert normalize_ref(image) == expected
+
+@pytest.mark.parametrize("ref, expected", [
+    ("postgres", ("postgres", "latest")),
+    ("mysql:8.0", ("mysql", "8.0")),
+    ("localhost:5000/pg", ("localhost:5000/pg", "latest")),
+    ("localhost:5000/pg:16", ("localhost:5000/pg", "16")),
+    ("postgres@sha256:abc123", ("postgres", "sha256:abc123")),
+    ("localhost:5000/pg:16@sha256:abc123", ("localhost:5000/pg", "sha256:abc123")),
+])
+def test_split_ref(ref, expected):
+    assert split_ref(ref) == expected
+
+def test_local_image_tags_includes_digests(fake_docker):
+    fake_docker.routes["/images/json"] = (200, [
+        {"RepoTags": ["postgres:16"], "RepoDigests": ["postgres@sha256:abc123"]},
+        # Imagen sin etiquetar
+        {"RepoTags": None, "RepoDigests": None},
+    ])
+
+    tags = local_image_tags()
+
+    assert tags == {"postgres:16", "postgres@sha256:abc123"}
+    assert is_cached("postgres:16", tags)
+    assert is_cached("postgres:16@sha256:abc123", tags)
+    assert not is_cached("postgres", tags)
+
+def test_pull_image_sends_repository_and_tag(fake_docker):
+    fake_docker.stream_prefixes = ("/images/create",)
+    fake_docker.routes["/images/create"] = (200, [{"id": "l1", "status": "Pull complete"}])
+    events = []
+
+    pull_image("localhost:5000/pg:16", events.append)
+
+    assert events == [{"id": "l1", "status": "Pull complete"}]
+    assert fake_docker.requests == [("POST", "/images/create?fromImage=localhost%3A5000%2Fpg&tag=16")]
+
+def test_pull_image_error_event(fake_docker):
+    fake_docker.stream_prefixes = ("/images/create",)
+    fake_docker.routes["/images/create"] = (200, [{"error": "manifest unknown"}])
+
+    with pytest.raises(ImagePullError, match="manifest unknown"):
+        pull_image("postgres:no-existe")
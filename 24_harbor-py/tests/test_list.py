@@ -0,0 +1,79 @@
+"""Pruebas de la selección y salida de `harbor list`."""
+
+import csv
+import json
+import io
+
+from docker_api import ContainerInfo, DockerSnapshot, PortMapping
+from harbor import select_list_containers, harbor_container_index, harbor_project_of, print_containers
+
+def container(name: str, image: str = "postgres:16", state: str = "running", **labels) -> ContainerInfo:
+    return ContainerInfo(id=f"id-{name}", name=name, image=image, state=state, status=state, labels=labels)
+
+SNAPSHOT = DockerSnapshot([
+    container("demo_container", **{"com.harbor.managed": "true", "com.harbor.project": "demo"}),
+    container("legado_container", image="mysql:8", state="exited"),
+    container("ajeno", image="redis:7"),
+])
+
+# Proyectos anteriores a las etiquetas: solo se reconocen por el registro
+INDEX = {"legado_container": "legado"}
+
+def test_select_all_containers_with_their_project():
+    containers, projects = select_list_containers(SNAPSHOT, INDEX)
+
+    assert [c.name for c in containers] == ["demo_container", "legado_container", "ajeno"]
+    assert projects == {"demo_container": "demo", "legado_container": "legado", "ajeno": ""}
+
+def test_select_filters_by_image_and_status():
+    containers, _ = select_list_containers(SNAPSHOT, INDEX, image="mysql")
+    assert [c.name for c in containers] == ["legado_container"]
+
+    containers, _ = select_list_containers(SNAPSHOT, INDEX, status="running")
+    assert [c.name for c in containers] == ["demo_container", "ajeno"]
+
+    containers, _ = select_list_containers(SNAPSHOT, INDEX, image="postgres", status="exited")
+    assert containers == []
+
+def test_select_harbor_only():
+    containers, _ = select_list_containers(SNAPSHOT, INDEX, harbor_only=True)
+
+    assert [c.name for c in containers] == ["demo_container", "legado_container"]
+
+def test_harbor_project_of_labelled_container_without_project():
+    labelled = container("suelto", **{"com.harbor.managed": "true"})
+
+    # Es de Harbor aunque no se sepa el proyecto: "" y no None
+    assert harbor_project_of(labelled, {}) == ""
+    assert harbor_project_of(container("ajeno"), {}) is None
+
+def test_harbor_container_index_includes_stack_services(harbor_registry):
+    harbor_registry.upsert("demo", {"container_name": "demo_container"})
+    harbor_registry.upsert("pagos", {"services": {
+        "db": {"container_name": "pagos_db"},
+        "cache": {"container_name": "pagos_cache"},
+    }})
+
+    assert harbor_container_index() == {"demo_container": "demo", "pagos_db": "pagos", "pagos_cache": "pagos"}
+
+def test_print_containers_json(capsys):
+    snapshot = DockerSnapshot([
+        ContainerInfo(id="a", name="demo_container", image="postgres:16", state="running", status="Up",
+                      ports=[PortMapping(5433, 5432)]),
+    ])
+
+    print_containers(snapshot.containers, {"demo_container": "demo"}, "json")
+    records = json.loads(capsys.readouterr().out)
+
+    assert records[0]["name"] == "demo_container"
+    assert records[0]["project"] == "demo"
+    assert records[0]["ports"] == [{"host_port": 5433, "container_port": 5432, "protocol": "tcp"}]
+
+def test_print_containers_csv(capsys):
+    containers, projects = select_list_containers(SNAPSHOT, INDEX, status="exited")
+
+    print_containers(containers, projects, "csv")
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+
+    assert rows[0] == ["id", "name", "image", "state", "status", "ports", "created", "project"]
+    assert rows[1] == ["id-legado_container", "legado_container", "mysql:8", "exited", "exited", "", "", "legado"]
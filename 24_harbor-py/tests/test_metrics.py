@@ -0,0 +1,115 @@
+"""Pruebas de las métricas en vivo: lectura de stats de Docker y exportación a CSV."""
+
+import io
+import csv
+
+import pytest
+
+from docker_api import ContainerStats, api_stream, parse_stats, _memory_usage
+from metrics import CSV_COLUMNS, CsvSampleWriter, StatsMonitor
+
+def stats_payload(memory_stats: dict, blkio: list) -> dict:
+    """Muestra de /containers/<id>/stats con dos lecturas de CPU."""
+    return {
+        "id": "abc",
+        "name": "/demo_container",
+        "read": "2024-06-01T12:00:01Z",
+        "cpu_stats": {"cpu_usage": {"total_usage": 300_000_000}, "system_cpu_usage": 2_000_000_000, "online_cpus": 2},
+        "precpu_stats": {"cpu_usage": {"total_usage": 100_000_000}, "system_cpu_usage": 1_000_000_000},
+        "memory_stats": memory_stats,
+        "blkio_stats": {"io_service_bytes_recursive": blkio},
+        "networks": {"eth0": {"rx_bytes": 100, "tx_bytes": 50}, "eth1": {"rx_bytes": 1, "tx_bytes": 2}},
+    }
+
+# Muestras reducidas de cgroup v1 y v2 tal como las devuelve Docker
+CGROUP_V1 = stats_payload(
+    {"usage": 10_000, "limit": 100_000, "stats": {"total_inactive_file": 4_000, "inactive_file": 1_000, "cache": 5_000}},
+    [{"major": 8, "minor": 0, "op": "Read", "value": 4096}, {"major": 8, "minor": 0, "op": "Write", "value": 1024},
+     {"major": 8, "minor": 0, "op": "Total", "value": 5120}],
+)
+CGROUP_V2 = stats_payload(
+    {"usage": 10_000, "limit": 100_000, "stats": {"inactive_file": 1_000, "active_file": 2_000}},
+    [{"major": 259, "minor": 0, "op": "read", "value": 4096}, {"major": 259, "minor": 0, "op": "write", "value": 1024}],
+)
+
+# =============================================================================
+# LECTURA DE STATS
+# =============================================================================
+
+def test_parse_stats_cgroup_v1():
+    sample = parse_stats(CGROUP_V1)
+
+    assert sample.container_id == "abc"
+    assert sample.name == "demo_container"
+    assert sample.cpu_percent == pytest.approx(40.0)
+    assert sample.memory == 6_000
+    assert sample.memory_limit == 100_000
+    assert sample.memory_percent == pytest.approx(6.0)
+    assert (sample.block_read, sample.block_write) == (4096, 1024)
+    assert (sample.net_rx, sample.net_tx) == (101, 52)
+    assert sample.read_at == "2024-06-01T12:00:01Z"
+
+def test_parse_stats_cgroup_v2():
+    sample = parse_stats(CGROUP_V2)
+
+    assert sample.memory == 9_000
+    assert (sample.block_read, sample.block_write) == (4096, 1024)
+
+def test_parse_stats_without_blkio_or_networks():
+    sample = parse_stats({**CGROUP_V2, "blkio_stats": None, "networks": None})
+
+    assert (sample.block_read, sample.block_write) == (0, 0)
+    assert (sample.net_rx, sample.net_tx) == (0, 0)
+
+def test_memory_usage_cgroup_v2():
+    assert _memory_usage({"usage": 1000, "stats": {"inactive_file": 300}}) == 700
+
+def test_memory_usage_cgroup_v1_prefers_total_inactive_file():
+    stats = {"total_inactive_file": 400, "inactive_file": 50}
+    assert _memory_usage({"usage": 1000, "stats": stats}) == 600
+
+def test_memory_usage_never_negative():
+    assert _memory_usage({"usage": 100, "stats": {"inactive_file": 500}}) == 100
+    assert _memory_usage({}) == 0
+
+# =============================================================================
+# FLUJOS
+# =============================================================================
+
+def test_api_stream_yields_each_line(fake_docker):
+    events = [{"Action": "start", "id": "a"}, {"Action": "die", "id": "a"}]
+    fake_docker.routes["/events"] = (200, events)
+
+    assert list(api_stream("GET", "/events", {"since": 1})) == events
+
+def test_monitor_skips_the_first_sample_and_reports_the_rest(fake_docker):
+    fake_docker.stream_prefixes = ("/containers/abc/stats",)
+    fake_docker.routes["/containers/abc/stats"] = (200, [{**CGROUP_V2, "precpu_stats": {}}, CGROUP_V1, CGROUP_V2])
+    received = []
+    monitor = StatsMonitor(on_sample=lambda project, sample: received.append((project, sample.memory)))
+
+    monitor.sync({"abc": "demo"})
+    monitor._threads["abc"].join(timeout=5)
+
+    assert received == [("demo", 6_000), ("demo", 9_000)]
+    # El flujo terminó: el contenedor ya no tiene muestra vigente
+    assert monitor.latest() == {}
+    assert monitor.errors() == {}
+
+# =============================================================================
+# CSV
+# =============================================================================
+
+def test_csv_writer_header_and_rows():
+    output = io.StringIO()
+    writer = CsvSampleWriter(output)
+
+    writer("demo", parse_stats(CGROUP_V1))
+    writer("otro", ContainerStats("x", "otro_container", 0.0, 1, 2, 3, 4, 5, 6))
+    rows = list(csv.reader(io.StringIO(output.getvalue())))
+
+    assert rows[0] == CSV_COLUMNS
+    assert rows[1] == ["2024-06-01T12:00:01Z", "demo", "demo_container", "40.00", "6000", "100000", "4096", "1024", "101", "52"]
+    # Sin fecha de lectura se usa la hora local
+    assert rows[2][0]
+    assert rows[2][1:] == ["otro", "otro_container", "0.00", "1", "2", "3", "4", "5", "6"]
@@ -0,0 +1,97 @@
+"""Pruebas del asignador de puertos (ports.py)."""
+
+import ports
+from ports import PortUsage, read_listening_ports, read_harbor_ports, collect_port_usage, allocate_port
+from docker_api import DockerSnapshot, ContainerInfo, PortMapping
+from registry import ProjectRegistry
+
+PROC_HEADER = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+
+def proc_line(port: int, state: str) -> str:
+    """Línea de /proc/net/tcp para un socket en 127.0.0.1:<port>."""
+    return f"   0: 0100007F:{port:04X} 00000000:0000 {state} 00000000:00000000 00:00000000 00000000  1000        0 1\n"
+
+# =============================================================================
+# FUENTES
+# =============================================================================
+
+def test_read_listening_ports_only_counts_listen_state(tmp_path):
+    tcp = tmp_path / "tcp"
+    tcp.write_text(PROC_HEADER + proc_line(5432, "0A") + proc_line(40000, "01"))
+    tcp6 = tmp_path / "tcp6"
+    tcp6.write_text(PROC_HEADER + proc_line(6379, "0A"))
+
+    assert read_listening_ports([str(tcp), str(tcp6)]) == {5432, 6379}
+
+def test_read_listening_ports_without_proc(tmp_path):
+    assert read_listening_ports([str(tmp_path / "no_existe")]) is None
+
+def test_read_harbor_ports_includes_stack_services(tmp_path):
+    registry = ProjectRegistry(tmp_path)
+    registry.upsert("solo", {"port": 5433})
+    registry.upsert("pagos", {"services": {"db": {"port": 5434}, "cache": {"port": 6380}}})
+
+    assert read_harbor_ports(tmp_path) == {5433: "solo", 5434: "pagos", 6380: "pagos"}
+
+def test_read_harbor_ports_without_volumes_dir(tmp_path):
+    assert read_harbor_ports(tmp_path / "no_existe") == {}
+
+def test_collect_port_usage_combines_sources(monkeypatch, tmp_path):
+    monkeypatch.setattr(ports, "read_listening_ports", lambda: {22})
+    ProjectRegistry(tmp_path).upsert("demo", {"port": 5433})
+    snapshot = DockerSnapshot([
+        ContainerInfo(id="a", name="otro", image="redis", state="running", status="", ports=[PortMapping(6379, 6379)]),
+    ])
+
+    usage = collect_port_usage(tmp_path, snapshot)
+
+    assert usage.used == {22, 5433, 6379}
+    assert usage.owner(22) == "host"
+    assert usage.owner(6379) == "docker"
+    assert usage.owner(5433) == "harbor:demo"
+    assert usage.owner(5434) is None
+
+def test_collect_port_usage_without_docker(monkeypatch, tmp_path, no_docker):
+    monkeypatch.setattr(ports, "read_listening_ports", lambda: set())
+
+    assert collect_port_usage(tmp_path).docker == set()
+
+# =============================================================================
+# ASIGNACIÓN
+# =============================================================================
+
+def test_allocate_port_returns_base_when_free():
+    assert allocate_port(5432, PortUsage(host=set())) == 5432
+
+def test_allocate_port_skips_every_source():
+    usage = PortUsage(host={5432}, docker={5433}, harbor={5434: "demo"})
+    assert allocate_port(5432, usage) == 5435
+
+def test_allocate_port_exhausted_range():
+    usage = PortUsage(host=set(range(5432, 5442)))
+    assert allocate_port(5432, usage, search_range=10) is None
+
+def test_allocate_port_stops_at_last_valid_port():
+    assert allocate_port(65535, PortUsage(host={65535})) is None
+
+def test_reserve_makes_consecutive_allocations_distinct():
+    usage = PortUsage(host=set())
+    first = allocate_port(5432, usage)
+    assert first is not None
+    usage.reserve(first, "a")
+    second = allocate_port(5432, usage)
+
+    assert (first, second) == (5432, 5433)
+    assert usage.owner(5432) == "harbor:a"
+
+def test_without_proc_each_candidate_is_bound(monkeypatch):
+    tried = []
+
+    def fake_can_bind(port):
+        tried.append(port)
+        return port != 5432
+
+    monkeypatch.setattr(ports, "can_bind", fake_can_bind)
+
+    assert allocate_port(5432, PortUsage(host=None)) == 5433
+    assert tried == [5432, 5433]
@@ -0,0 +1,157 @@
+"""Pruebas de las sondas de disponibilidad (readiness.py) contra servidores asyncio locales."""
+
+import socket
+import struct
+import asyncio
+
+import pytest
+
+import readiness
+from readiness import NotReadyError, probe_once, wait_until_ready, readiness_target
+
+async def run_against(handler, engine: str):
+    """Levanta un servidor con `handler` en un puerto libre y lanza la sonda del motor."""
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        await probe_once(engine, port)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+def probe(handler, engine: str):
+    asyncio.run(run_against(handler, engine))
+
+def reply_with(data: bytes, read_first: bool = True):
+    """Handler que (opcionalmente) lee la petición del cliente y responde `data`."""
+    async def handler(reader, writer):
+        if read_first:
+            await reader.read(1024)
+        writer.write(data)
+        await writer.drain()
+        writer.close()
+    return handler
+
+def postgres_error(code: str) -> bytes:
+    body = f"SFATAL\0C{code}\0Mmensaje\0\0".encode()
+    return b"E" + struct.pack("!i", len(body) + 4) + body
+
+def mysql_packet(payload: bytes) -> bytes:
+    return len(payload).to_bytes(3, "little") + b"\x00" + payload
+
+def mongo_reply(ok: float) -> bytes:
+    elements = b"\x01ok\x00" + struct.pack("<d", ok)
+    document = struct.pack("<i", len(elements) + 5) + elements + b"\x00"
+    body = struct.pack("<I", 0) + b"\x00" + document
+    return struct.pack("<iiii", 16 + len(body), 1, 1, 2013) + body
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+# =============================================================================
+# HANDSHAKES
+# =============================================================================
+
+def test_postgres_authentication_request_is_ready():
+    probe(reply_with(b"R" + struct.pack("!ii", 8, 0)), "postgres")
+
+def test_postgres_starting_up_is_not_ready():
+    with pytest.raises(NotReadyError, match="iniciando"):
+        probe(reply_with(postgres_error("57P03")), "postgres")
+
+def test_postgres_other_errors_mean_the_server_is_up():
+    # 28000 = rol inexistente: el servidor ya atiende clientes
+    probe(reply_with(postgres_error("28000")), "postgres")
+
+def test_mysql_greeting_is_ready():
+    probe(reply_with(mysql_packet(b"\x0a8.0.36\x00"), read_first=False), "mysql")
+
+def test_mysql_error_packet_is_not_ready():
+    error = mysql_packet(b"\xff\x10\x04Too many connections")
+    with pytest.raises(NotReadyError, match="Too many connections"):
+        probe(reply_with(error, read_first=False), "mariadb")
+
+@pytest.mark.parametrize("line", [b"+PONG\r\n", b"-NOAUTH Authentication required.\r\n"])
+def test_redis_pong_or_noauth_is_ready(line):
+    probe(reply_with(line), "redis")
+
+def test_redis_loading_is_not_ready():
+    with pytest.raises(NotReadyError, match="LOADING"):
+        probe(reply_with(b"-LOADING Redis is loading the dataset in memory\r\n"), "redis")
+
+def test_mongo_hello_ok():
+    probe(reply_with(mongo_reply(1.0)), "mongo")
+
+def test_mongo_hello_not_ok():
+    with pytest.raises(NotReadyError):
+        probe(reply_with(mongo_reply(0.0)), "mongo")
+
+def test_unknown_engine_only_needs_the_connection():
+    probe(reply_with(b"", read_first=False), "mi/imagen")
+
+def test_connection_closed_during_handshake():
+    with pytest.raises(asyncio.IncompleteReadError):
+        probe(reply_with(b"R"), "postgres")
+
+# =============================================================================
+# ESPERA CON BACKOFF
+# =============================================================================
+
+def test_wait_retries_until_ready(monkeypatch):
+    monkeypatch.setattr(readiness, "INITIAL_BACKOFF", 0.01)
+    answers = [b"-LOADING\r\n", b"-LOADING\r\n", b"+PONG\r\n"]
+
+    async def handler(reader, writer):
+        await reader.read(1024)
+        writer.write(answers.pop(0))
+        await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await wait_until_ready("demo", "redis", port, timeout=5)
+
+    result = asyncio.run(main())
+
+    assert result.ready
+    assert result.attempts == 3
+    assert result.name == "demo"
+
+def test_wait_times_out_when_the_server_never_answers(monkeypatch):
+    monkeypatch.setattr(readiness, "ATTEMPT_TIMEOUT", 0.05)
+    monkeypatch.setattr(readiness, "INITIAL_BACKOFF", 0.01)
+
+    async def handler(reader, writer):
+        await asyncio.sleep(1)
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await wait_until_ready("demo", "redis", port, timeout=0.2)
+
+    result = asyncio.run(main())
+
+    assert not result.ready
+    assert result.attempts >= 2
+    assert result.error == "Sin respuesta del servidor"
+    assert result.seconds < 1
+
+def test_wait_reports_refused_connections(monkeypatch):
+    monkeypatch.setattr(readiness, "INITIAL_BACKOFF", 0.01)
+
+    result = asyncio.run(wait_until_ready("demo", "postgres", free_port(), timeout=0.1))
+
+    assert not result.ready
+    assert result.error
+
+def test_readiness_target():
+    info = {"project_name": "demo", "image": "postgres", "port": "5433", "system_user": "ana", "database": "app"}
+
+    assert readiness_target(info) == {"name": "demo", "engine": "postgres", "port": 5433, "user": "ana", "database": "app"}
+    assert readiness_target({"image": "postgres"}) is None
@@ -0,0 +1,100 @@
+"""Pruebas del reaper de proyectos con tiempo de vida (TTL)."""
+
+import subprocess
+from datetime import datetime
+
+import harbor
+from docker_api import ContainerInfo, get_volume_sizes
+from harbor import project_expiry, select_expired_projects, existing_project_containers, reap_expired_projects
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+def api_container(name: str, state: str = "running") -> dict:
+    return {"Id": f"id-{name}", "Names": [f"/{name}"], "Image": "postgres:16", "State": state}
+
+# =============================================================================
+# SELECCIÓN
+# =============================================================================
+
+def test_project_expiry():
+    assert project_expiry({"ttl": "2d", "created_at": "2024-05-30T12:00:00"}) == NOW
+    assert project_expiry({"created_at": "2024-05-30T12:00:00"}) is None
+    assert project_expiry({"ttl": "dos días", "created_at": "2024-05-30T12:00:00"}) is None
+    assert project_expiry({"ttl": "2d", "created_at": "ayer"}) is None
+
+def test_select_expired_projects():
+    projects = {
+        "vencido": {"ttl": "1h", "created_at": "2024-06-01T10:00:00"},
+        "justo": {"ttl": "2h", "created_at": "2024-06-01T10:00:00"},
+        "vigente": {"ttl": "1d", "created_at": "2024-06-01T10:00:00"},
+        "permanente": {"created_at": "2020-01-01T00:00:00"},
+    }
+
+    assert sorted(select_expired_projects(projects, NOW)) == ["justo", "vencido"]
+
+def test_existing_project_containers_of_a_stack(harbor_registry):
+    record = harbor_registry.upsert("pagos", {"services": {
+        "db": {"container_name": "pagos_db"},
+        "cache": {"container_name": "pagos_cache"},
+    }})
+    containers = {"pagos_db": ContainerInfo(id="a", name="pagos_db", image="postgres", state="running", status="")}
+
+    assert [c.name for c in existing_project_containers("pagos", record, containers)] == ["pagos_db"]
+
+def test_get_volume_sizes(fake_docker):
+    fake_docker.routes["/system/df"] = (200, {"Volumes": [
+        {"Name": "pg_data", "UsageData": {"Size": 1024}},
+        {"Name": "sin_calcular", "UsageData": None},
+    ]})
+
+    assert get_volume_sizes() == {"pg_data": 1024, "sin_calcular": -1}
+
+# =============================================================================
+# ELIMINACIÓN
+# =============================================================================
+
+def expired_record(name: str) -> dict:
+    return {"container_name": f"{name}_container", "volume": f"{name}_data", "ttl": "1h", "created_at": "2000-01-01T00:00:00"}
+
+def test_reaper_counts_only_successful_removals(monkeypatch, fake_docker, harbor_registry, tmp_path):
+    harbor_registry.upsert_many({
+        "a": expired_record("a"),
+        "b": expired_record("b"),
+        "vigente": {"container_name": "vigente_container", "ttl": "1w", "created_at": datetime.now().isoformat()},
+    })
+    (tmp_path / "contenedor_a").mkdir()
+    fake_docker.routes["/containers/json"] = (200, [api_container("a_container"), api_container("b_container", "exited")])
+    fake_docker.routes["/system/df"] = (200, {"Volumes": [
+        {"Name": "a_data", "UsageData": {"Size": 1000}},
+        {"Name": "b_data", "UsageData": {"Size": 2000}},
+    ]})
+    fake_docker.routes["/containers/id-a_container/stats"] = (200, {"memory_stats": {"usage": 500, "stats": {"inactive_file": 100}}})
+
+    removed = []
+
+    def fake_remove(containers, volumes):
+        if volumes == ["b_data"]:
+            raise subprocess.CalledProcessError(1, ["docker", "rm"])
+        removed.append(([c.name for c in containers], volumes))
+
+    monkeypatch.setattr(harbor, "remove_harbor_containers", fake_remove)
+
+    assert reap_expired_projects() == (1, 1000, 400)
+    assert removed == [(["a_container"], ["a_data"])]
+    assert set(harbor_registry.load()) == {"b", "vigente"}
+    assert not (tmp_path / "contenedor_a").exists()
+
+def test_reaper_dry_run_removes_nothing(monkeypatch, fake_docker, harbor_registry):
+    harbor_registry.upsert("a", expired_record("a"))
+    fake_docker.routes["/containers/json"] = (200, [])
+    fake_docker.routes["/system/df"] = (200, {"Volumes": []})
+    monkeypatch.setattr(harbor, "remove_harbor_containers", lambda *args: None)
+
+    assert reap_expired_projects(dry_run=True) == (0, 0, 0)
+    assert "a" in harbor_registry.load()
+
+def test_reaper_without_expired_projects_does_not_query_docker(fake_docker, harbor_registry):
+    harbor_registry.upsert("permanente", {"container_name": "p"})
+
+    assert reap_expired_projects() == (0, 0, 0)
+    assert fake_docker.requests == []
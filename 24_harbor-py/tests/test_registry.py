@@ -0,0 +1,141 @@
+"""Pruebas del registro de proyectos (registry.py): escritura atómica y bloqueos."""
+
+import json
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import registry as registry_module
+from registry import ProjectRegistry, REGISTRY_FILE, STATUS_CREATED, STATUS_RUNNING, STATUS_STOPPED
+
+def _upsert_in_process(volumes_dir: str, prefix: str, count: int):
+    """Escribe proyectos desde otro proceso (el flock es lo único que los coordina)."""
+    registry = ProjectRegistry(Path(volumes_dir))
+    for index in range(count):
+        registry.upsert(f"{prefix}{index}", {"port": index})
+
+# =============================================================================
+# LECTURA Y ESCRITURA
+# =============================================================================
+
+def test_upsert_creates_record_with_timestamps(tmp_path):
+    registry = ProjectRegistry(tmp_path)
+    record = registry.upsert("demo", {"image": "postgres", "port": 5433})
+
+    assert record["project_name"] == "demo"
+    assert record["status"] == STATUS_CREATED
+    assert record["created_at"] and record["updated_at"]
+    assert registry.load()["demo"]["port"] == 5433
+
+def test_file_is_valid_json_and_no_temp_files_remain(tmp_path):
+    registry = ProjectRegistry(tmp_path)
+    registry.upsert_many({"a": {"port": 1}, "b": {"port": 2}})
+
+    data = json.loads((tmp_path / REGISTRY_FILE).read_text())
+    assert set(data["projects"]) == {"a", "b"}
+    assert list(tmp_path.glob(".registry.*.tmp")) == []
+
+def test_failed_write_keeps_previous_file(monkeypatch, tmp_path):
+    registry = ProjectRegistry(tmp_path)
+    registry.upsert("demo", {"port": 5433})
+    before = (tmp_path / REGISTRY_FILE).read_text()
+
+    def broken_dump(*args, **kwargs):
+        raise RuntimeError("disco lleno")
+
+    monkeypatch.setattr(registry_module.json, "dump", broken_dump)
+    with pytest.raises(RuntimeError):
+        registry.upsert("otro", {"port": 5434})
+
+    assert (tmp_path / REGISTRY_FILE).read_text() == before
+    assert list(tmp_path.glob(".registry.*.tmp")) == []
+
+def test_exception_inside_transaction_discards_changes(tmp_path):
+    registry = ProjectRegistry(tmp_path)
+    registry.upsert("demo", {"port": 5433})
+
+    with pytest.raises(ValueError):
+        with registry.transaction() as projects:
+            projects["demo"]["port"] = 1
+            raise ValueError
+
+    assert registry.load()["demo"]["port"] == 5433
+
+def test_set_status_and_remove(tmp_path):
+    registry = ProjectRegistry(tmp_path)
+    registry.upsert_many({"a": {}, "b": {}})
+
+    registry.set_status(["a", "no_existe"], STATUS_RUNNING)
+    registry.set_status(["b"], STATUS_STOPPED)
+    registry.remove("b")
+
+    projects = registry.load()
+    assert projects["a"]["status"] == STATUS_RUNNING
+    assert projects["a"]["last_started"] is not None
+    assert "b" not in projects
+
+def test_find_filters(tmp_path):
+    registry = ProjectRegistry(tmp_path)
+    registry.upsert_many({
+        "pg": {"image": "postgres", "port": 5433},
+        "my": {"image": "mysql", "port": 3307},
+    })
+
+    assert [r["project_name"] for r in registry.find(image="mysql")] == ["my"]
+    assert [r["project_name"] for r in registry.find(port=5433)] == ["pg"]
+    assert registry.find(image="postgres", port=3307) == []
+
+# =============================================================================
+# MIGRACIÓN DESDE *_info.json
+# =============================================================================
+
+def write_info(volumes_dir, project_name: str, info: dict):
+    project_dir = volumes_dir / f"contenedor_{project_name}"
+    project_dir.mkdir(parents=True)
+    (project_dir / f"{project_name}_info.json").write_text(json.dumps(info))
+
+def test_registry_is_built_from_info_files(tmp_path):
+    write_info(tmp_path, "demo", {"project_name": "demo", "image": "postgres", "port": 5433})
+
+    projects = ProjectRegistry(tmp_path).load()
+
+    assert projects["demo"]["port"] == 5433
+    assert projects["demo"]["status"] == STATUS_CREATED
+    assert (tmp_path / REGISTRY_FILE).exists()
+
+def test_corrupt_registry_is_rebuilt(tmp_path):
+    write_info(tmp_path, "demo", {"project_name": "demo", "port": 5433})
+    (tmp_path / REGISTRY_FILE).write_text("{ no es json")
+
+    assert ProjectRegistry(tmp_path).load()["demo"]["port"] == 5433
+
+def test_load_without_volumes_dir(tmp_path):
+    assert ProjectRegistry(tmp_path / "no_existe").load() == {}
+
+# =============================================================================
+# CONCURRENCIA
+# =============================================================================
+
+def test_parallel_threads_do_not_lose_updates(tmp_path):
+    registry = ProjectRegistry(tmp_path)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda index: registry.upsert(f"p{index}", {"port": index}), range(40)))
+
+    assert len(registry.load()) == 40
+
+def test_parallel_processes_do_not_lose_updates(tmp_path):
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_upsert_in_process, args=(str(tmp_path), prefix, 10))
+        for prefix in ("a", "b", "c", "d")
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert len(ProjectRegistry(tmp_path).load()) == 40
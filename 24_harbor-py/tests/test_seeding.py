@@ -0,0 +1,51 @@
+"""Pruebas de la carga de archivos (seeding.py) con un cliente local en lugar de `docker exec`."""
+
+import gzip
+
+import pytest
+
+import seeding
+from seeding import SeedError, seed_file
+
+RECORD = {"image": "postgres", "container_name": "demo_container", "database": "demo"}
+
+@pytest.fixture
+def local_client(monkeypatch):
+    """Sustituye el cliente del motor por un comando local que lee stdin."""
+    def use(command: list[str]):
+        monkeypatch.setattr(seeding, "build_seed_command", lambda record, path, table: (command, "psql"))
+    return use
+
+def test_seed_counts_lines_and_bytes(tmp_path, local_client):
+    local_client(["cat"])
+    path = tmp_path / "seed.sql"
+    path.write_bytes(b"INSERT INTO t VALUES\n(1),\n(2);\n")
+
+    result = seed_file(RECORD, path)
+
+    assert result.lines == 3
+    assert result.bytes == path.stat().st_size
+    assert result.bytes_per_second > 0
+
+def test_seed_csv_excludes_the_header_and_decompresses(tmp_path, local_client):
+    local_client(["cat"])
+    path = tmp_path / "usuarios.csv.gz"
+    path.write_bytes(gzip.compress(b"id,nombre\n1,ana\n2,luis\n"))
+
+    result = seed_file(RECORD, path)
+
+    assert result.lines == 2
+    assert result.bytes == len(b"id,nombre\n1,ana\n2,luis\n")
+
+def test_seed_reports_the_client_error(tmp_path, local_client):
+    # El cliente falla sin leer stdin: la tubería se rompe y el error sale de stderr
+    local_client(["sh", "-c", "echo 'ERROR: relation \"t\" does not exist' >&2; exit 3"])
+    path = tmp_path / "seed.sql"
+    path.write_bytes(b"x" * (seeding.CHUNK_SIZE * 2))
+
+    with pytest.raises(SeedError, match='relation "t" does not exist'):
+        seed_file(RECORD, path)
+
+def test_build_seed_command_rejects_unsupported_files(tmp_path):
+    with pytest.raises(SeedError, match="no admite archivos .js"):
+        seeding.build_seed_command(RECORD, tmp_path / "script.js", "script")
@@ -0,0 +1,118 @@
+"""Pruebas de los snapshots de volúmenes (sin Docker: solo archivos y procesos simulados)."""
+
+import io
+import json
+import subprocess
+from typing import cast
+
+import pytest
+
+from snapshots import SnapshotError, SnapshotInfo, find_snapshot, list_snapshots, read_metadata, _feed_process
+
+def write_snapshot(snapshots_dir, name: str, suffix: str, created_at: str, **extra):
+    (snapshots_dir / f"{name}{suffix}").write_bytes(b"datos")
+    metadata = {"name": name, "project_name": "demo", "image": "postgres", "version": "16",
+                "created_at": created_at, "size": 5, **extra}
+    (snapshots_dir / f"{name}.json").write_text(json.dumps(metadata))
+
+class BrokenStdin:
+    """stdin de un proceso que ya terminó: acepta un bloque y luego falla."""
+
+    def __init__(self, accepted: int = 1):
+        self.accepted = accepted
+        self.written = []
+        self.closed = False
+
+    def write(self, chunk):
+        if len(self.written) >= self.accepted:
+            raise BrokenPipeError(32, "Broken pipe")
+        self.written.append(chunk)
+
+    def close(self):
+        self.closed = True
+
+class FakeProcess:
+    def __init__(self, stdin, returncode: int = 0, stderr: bytes = b""):
+        self.stdin = stdin
+        self.stderr = io.BytesIO(stderr)
+        self.returncode = returncode
+
+    def wait(self):
+        return self.returncode
+
+def fake_process(stdin, returncode: int = 0, stderr: bytes = b"") -> subprocess.Popen:
+    return cast(subprocess.Popen, FakeProcess(stdin, returncode, stderr))
+
+# =============================================================================
+# BÚSQUEDA Y METADATOS
+# =============================================================================
+
+@pytest.mark.parametrize("suffix", [".tar.zst", ".tar.gz"])
+def test_find_snapshot_with_either_suffix(tmp_path, suffix):
+    (tmp_path / f"base{suffix}").write_bytes(b"")
+
+    assert find_snapshot(tmp_path, "base") == tmp_path / f"base{suffix}"
+    assert find_snapshot(tmp_path, "otro") is None
+
+def test_find_snapshot_prefers_zstd(tmp_path):
+    (tmp_path / "base.tar.gz").write_bytes(b"")
+    (tmp_path / "base.tar.zst").write_bytes(b"")
+
+    assert find_snapshot(tmp_path, "base") == tmp_path / "base.tar.zst"
+
+def test_list_snapshots_newest_first(tmp_path):
+    write_snapshot(tmp_path, "antiguo", ".tar.gz", "2024-01-01T10:00:00")
+    write_snapshot(tmp_path, "reciente", ".tar.zst", "2024-03-01T10:00:00")
+    write_snapshot(tmp_path, "medio", ".tar.gz", "2024-02-01T10:00:00")
+
+    snapshots = list_snapshots(tmp_path)
+
+    assert [s.name for s in snapshots] == ["reciente", "medio", "antiguo"]
+    assert snapshots[0] == SnapshotInfo(
+        name="reciente", path=tmp_path / "reciente.tar.zst", project_name="demo",
+        image="postgres", version="16", created_at="2024-03-01T10:00:00", size=5,
+    )
+
+def test_list_snapshots_skips_broken_or_orphan_metadata(tmp_path):
+    write_snapshot(tmp_path, "valido", ".tar.gz", "2024-01-01T10:00:00")
+    (tmp_path / "roto.json").write_text("{no es json")
+    # Metadatos sin tarball: el snapshot se borró a mano
+    (tmp_path / "huerfano.json").write_text(json.dumps({"name": "huerfano"}))
+
+    assert [s.name for s in list_snapshots(tmp_path)] == ["valido"]
+
+def test_read_metadata(tmp_path):
+    write_snapshot(tmp_path, "base", ".tar.gz", "2024-01-01T10:00:00")
+
+    assert (read_metadata(tmp_path, "base") or {})["project_name"] == "demo"
+    assert read_metadata(tmp_path, "otro") is None
+
+# =============================================================================
+# TUBERÍAS
+# =============================================================================
+
+def test_feed_process_copies_everything_and_closes(monkeypatch):
+    monkeypatch.setattr("snapshots.CHUNK_SIZE", 4)
+    stdin = BrokenStdin(accepted=10)
+
+    _feed_process(io.BytesIO(b"0123456789"), fake_process(stdin), "tar")
+
+    assert b"".join(stdin.written) == b"0123456789"
+    assert stdin.closed
+
+def test_feed_process_broken_pipe_reports_the_process_error(monkeypatch):
+    monkeypatch.setattr("snapshots.CHUNK_SIZE", 4)
+    stdin = BrokenStdin(accepted=1)
+    process = fake_process(stdin, returncode=125, stderr=b"Unable to find image 'busybox:stable'")
+
+    # El error real es el del proceso, no el BrokenPipeError de la escritura
+    with pytest.raises(SnapshotError, match="Unable to find image"):
+        _feed_process(io.BytesIO(b"0123456789"), process, "tar en el volumen")
+
+    assert stdin.closed
+
+def test_feed_process_broken_pipe_with_successful_exit(monkeypatch):
+    monkeypatch.setattr("snapshots.CHUNK_SIZE", 4)
+
+    with pytest.raises(SnapshotError, match="terminó antes de recibir todo el snapshot"):
+        _feed_process(io.BytesIO(b"0123456789"), fake_process(BrokenStdin(accepted=0)), "tar")
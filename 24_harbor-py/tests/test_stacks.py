@@ -0,0 +1,131 @@
+"""Pruebas de los archivos de stack (stacks.py)."""
+
+import yaml
+import pytest
+
+from stacks import StackError, load_stack, build_stack_compose, network_name
+from harbor import get_project_record, project_services
+
+def write_stack(tmp_path, text: str, name: str = "pagos.toml"):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+# =============================================================================
+# LECTURA DEL ARCHIVO
+# =============================================================================
+
+def test_load_stack_keeps_file_order_and_defaults(tmp_path):
+    path = write_stack(tmp_path, """
+password = "secreto"
+ttl = "2d"
+
+[services.db]
+image = "postgres"
+version = "16"
+
+[services.cache]
+image = "redis"
+fast = true
+""")
+
+    stack = load_stack(path)
+
+    assert stack.name == "pagos"
+    assert stack.password == "secreto"
+    assert stack.ttl == "2d"
+    assert [service.name for service in stack.services] == ["db", "cache"]
+    assert stack.services[0].version == "16"
+    assert stack.services[1].version == "latest"
+    assert stack.services[1].fast
+    assert stack.services[1].preferred_port == 6379
+
+def test_load_stack_numeric_version_is_text(tmp_path):
+    stack = load_stack(write_stack(tmp_path, "[services.db]\nimage = 'postgres'\nversion = 16\n"))
+
+    assert stack.services[0].version == "16"
+
+def test_load_stack_explicit_name_and_port(tmp_path):
+    path = write_stack(tmp_path, """
+name = "otro"
+
+[services.api]
+image = "mi/imagen"
+port = 8080
+""")
+
+    stack = load_stack(path)
+
+    assert stack.name == "otro"
+    assert stack.password == "password"
+    assert stack.services[0].preferred_port == 8080
+
+@pytest.mark.parametrize("text, message", [
+    ("name = 'x'\n", "ningún"),
+    ("[services.db]\nversion = '16'\n", "necesita una clave image"),
+    ("[services.db]\nimage = 'postgres'\nreplicas = 2\n", "replicas"),
+    ("[services.api]\nimage = 'mi/imagen'\n", "sin puerto conocido"),
+    ("[services.db\n", "no es TOML válido"),
+])
+def test_load_stack_errors(tmp_path, text, message):
+    with pytest.raises(StackError, match=message):
+        load_stack(write_stack(tmp_path, text))
+
+def test_load_stack_missing_file(tmp_path):
+    with pytest.raises(StackError, match="No se pudo leer"):
+        load_stack(tmp_path / "no_existe.toml")
+
+# =============================================================================
+# GENERACIÓN DEL COMPOSE
+# =============================================================================
+
+def test_build_stack_compose(tmp_path):
+    stack = load_stack(write_stack(tmp_path, """
+[services.db]
+image = "postgres"
+version = "16"
+
+[services.cache]
+image = "redis"
+fast = true
+"""))
+    labels = {"com.harbor.project": "pagos"}
+    credentials = {"root_password": "r", "database": "pagos", "user": "u", "user_password": "p"}
+
+    content, records = build_stack_compose(stack, {"db": 5433, "cache": 6380}, credentials, labels)
+    document = yaml.safe_load(content)
+
+    assert list(document["services"]) == ["db", "cache"]
+    assert document["services"]["db"]["ports"] == ["5433:5432"]
+    assert document["services"]["db"]["networks"] == ["harbor"]
+    assert document["networks"]["harbor"]["name"] == network_name("pagos") == "pagos_net"
+    # Solo el servicio con datos en disco tiene volumen
+    assert list(document["volumes"]) == ["pagos_db_data"]
+    assert "volumes" not in document["services"]["cache"]
+
+    assert records["db"]["container_name"] == "pagos_db"
+    assert records["db"]["port"] == 5433
+    assert records["db"]["container_port"] == 5432
+    assert records["cache"]["volume"] is None
+
+# =============================================================================
+# REGISTRO
+# =============================================================================
+
+def test_get_project_record_of_a_stack_service(harbor_registry):
+    harbor_registry.upsert("pagos", {"password": "secreto", "services": {"db": {"container_name": "pagos_db"}}})
+
+    record = get_project_record("pagos/db") or {}
+    assert record["password"] == "secreto"
+    assert record["container_name"] == "pagos_db"
+    assert record["project_name"] == "pagos/db"
+    assert "services" not in record
+    assert get_project_record("pagos/cache") is None
+    # Servicio de un stack que no existe
+    assert get_project_record("otro/db") is None
+
+def test_project_services(harbor_registry):
+    record = harbor_registry.upsert("pagos", {"services": {"db": {"port": 5433}, "cache": {"port": 6380}}})
+
+    assert [name for name, _ in project_services("pagos", record)] == ["pagos/db", "pagos/cache"]
+    assert project_services("solo", {"port": 5432}) == [("solo", {"port": 5432})]
@@ -0,0 +1,64 @@
+"""Pruebas de la compactación de bases de datos (vacuum.py)."""
+
+import subprocess
+
+import pytest
+
+import vacuum
+from vacuum import VACUUM_ENGINES, VacuumError, build_vacuum_command, vacuum_database
+
+def record(image: str) -> dict:
+    return {"image": image, "container_name": "demo_container", "database": "demo",
+            "system_user": "ana", "root_password": "secreto"}
+
+def test_postgres_vacuum_full():
+    command, method = build_vacuum_command(record("postgres"))
+
+    assert method == "VACUUM FULL"
+    assert command[:4] == ["docker", "exec", "demo_container", "psql"]
+    assert command[-2:] == ["-c", "VACUUM FULL ANALYZE"]
+    assert ["-U", "ana", "-d", "demo"] == command[command.index("-U"):command.index("-U") + 4]
+
+@pytest.mark.parametrize("image, client", [("mysql", "mysqlcheck"), ("mariadb", "mariadb-check")])
+def test_mysql_family_optimize(image, client):
+    command, method = build_vacuum_command(record(image))
+
+    assert method == "OPTIMIZE TABLE"
+    assert command == ["docker", "exec", "-e", "MYSQL_PWD=secreto", "demo_container",
+                       client, "-uroot", "--optimize", "demo"]
+
+def test_mongo_compact():
+    command, method = build_vacuum_command(record("mongo"))
+
+    assert method == "compact"
+    assert command[2:4] == ["demo_container", "mongosh"]
+    assert command[-2:] == ["--eval", vacuum.MONGO_COMPACT_SCRIPT]
+
+def test_every_supported_engine_has_a_command():
+    for engine in VACUUM_ENGINES:
+        build_vacuum_command(record(engine))
+
+def test_redis_has_nothing_to_compact():
+    with pytest.raises(VacuumError, match="Redis"):
+        build_vacuum_command(record("redis"))
+
+@pytest.mark.parametrize("image, message", [("mi/imagen", "mi/imagen no tiene"), ("", "imagen desconocida")])
+def test_unknown_engine(image, message):
+    with pytest.raises(VacuumError, match=message):
+        build_vacuum_command(record(image))
+
+def test_vacuum_database_reports_the_client_error(monkeypatch):
+    monkeypatch.setattr(vacuum.subprocess, "run", lambda command, **kwargs: subprocess.CompletedProcess(
+        command, 1, "", "psql: error: connection refused\nFATAL: database \"demo\" does not exist\n"))
+
+    with pytest.raises(VacuumError, match='database "demo" does not exist'):
+        vacuum_database(record("postgres"))
+
+def test_vacuum_database_returns_the_output(monkeypatch):
+    monkeypatch.setattr(vacuum.subprocess, "run", lambda command, **kwargs: subprocess.CompletedProcess(
+        command, 0, "bytes liberados: 4096\n", ""))
+
+    result = vacuum_database(record("mongo"))
+
+    assert result.method == "compact"
+    assert result.output == "bytes liberados: 4096"
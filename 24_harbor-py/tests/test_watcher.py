@@ -0,0 +1,165 @@
+"""Pruebas del vigilante de eventos (watcher.py)."""
+
+import itertools
+from typing import Optional
+
+import pytest
+
+import watcher as watcher_module
+from watcher import ProjectWatcher, restart_delay, RESTART_BACKOFF_MAX, RESTART_MAX_ATTEMPTS
+from registry import ProjectRegistry, STATUS_RUNNING, STATUS_STOPPED, STATUS_CRASHED
+
+MANAGED_LABEL = "com.harbor.managed"
+PROJECT_LABEL = "com.harbor.project"
+
+_nanos = itertools.count(1)
+
+def event(action: str, container: str = "demo_container", project: Optional[str] = "demo", **attributes) -> dict:
+    """Evento de contenedor con la forma que envía /events."""
+    if project:
+        attributes[PROJECT_LABEL] = project
+    return {
+        "id": f"id-{container}",
+        "Action": action,
+        "time": 1700000000,
+        "timeNano": next(_nanos),
+        "Actor": {"ID": f"id-{container}", "Attributes": {"name": container, **attributes}},
+    }
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = ProjectRegistry(tmp_path)
+    registry.upsert("demo", {"container_name": "demo_container", "port": 5433})
+    return registry
+
+@pytest.fixture
+def watcher(registry):
+    return ProjectWatcher(registry, MANAGED_LABEL, PROJECT_LABEL, log=lambda message: None)
+
+# =============================================================================
+# ESPERA EXPONENCIAL
+# =============================================================================
+
+def test_restart_delay_doubles_up_to_the_maximum():
+    assert [restart_delay(streak) for streak in (1, 2, 3, 4)] == [2, 4, 8, 16]
+    assert restart_delay(0) == 2
+    assert restart_delay(50) == RESTART_BACKOFF_MAX
+
+# =============================================================================
+# CLASIFICACIÓN DE EVENTOS
+# =============================================================================
+
+def test_start_marks_project_running(watcher, registry):
+    assert watcher.handle(event("start")) is not None
+
+    record = registry.get("demo")
+    assert record["status"] == STATUS_RUNNING
+    assert record["last_started"] is not None
+
+def test_kill_then_die_is_a_requested_stop(watcher, registry):
+    watcher.handle(event("start"))
+    assert watcher.handle(event("kill", signal="15")) is None
+    watcher.handle(event("die", exitCode="137"))
+
+    record = registry.get("demo")
+    assert record["status"] == STATUS_STOPPED
+    assert record["last_exit_code"] == 137
+    assert "crash_count" not in record
+
+def test_die_with_error_code_is_a_crash(watcher, registry):
+    watcher.handle(event("start"))
+    message = watcher.handle(event("die", exitCode="1"))
+
+    record = registry.get("demo")
+    assert "se cayó" in message
+    assert record["status"] == STATUS_CRASHED
+    assert record["crash_count"] == 1
+    assert record["last_crash"] is not None
+
+def test_die_after_oom_is_a_crash_even_with_code_zero(watcher, registry):
+    watcher.handle(event("start"))
+    watcher.handle(event("oom"))
+    watcher.handle(event("die", exitCode="0"))
+
+    assert registry.get("demo")["status"] == STATUS_CRASHED
+
+def test_clean_exit_is_a_stop(watcher, registry):
+    watcher.handle(event("die", exitCode="0"))
+
+    assert registry.get("demo")["status"] == STATUS_STOPPED
+
+def test_repeated_event_is_applied_once(watcher, registry):
+    crash = event("die", exitCode="1")
+    watcher.handle(crash)
+
+    assert watcher.handle(crash) is None
+    assert registry.get("demo")["crash_count"] == 1
+
+def test_event_without_project_label_is_ignored(watcher, registry):
+    before = registry.get("demo")
+
+    assert watcher.handle(event("die", project=None, exitCode="1")) is None
+    assert registry.get("demo") == before
+
+def test_health_status(watcher, registry):
+    watcher.handle(event("health_status: healthy"))
+
+    assert registry.get("demo")["health"] == "healthy"
+
+def test_stack_service_crash_keeps_project_running(registry, watcher):
+    registry.upsert("pagos", {"services": {
+        "db": {"container_name": "pagos_db"},
+        "cache": {"container_name": "pagos_cache"},
+    }})
+    watcher.reconcile({"pagos_db": ("pagos", True), "pagos_cache": ("pagos", True)})
+
+    watcher.handle(event("die", container="pagos_cache", project="pagos", exitCode="1"))
+
+    record = registry.get("pagos")
+    assert record["status"] == STATUS_RUNNING
+    assert record["services"]["cache"]["status"] == STATUS_CRASHED
+    assert record["services"]["cache"]["crash_count"] == 1
+    assert "status" not in record["services"]["db"]
+
+def test_reconcile_marks_stopped_projects(registry, watcher):
+    registry.set_status(["demo"], STATUS_RUNNING)
+
+    watcher.reconcile({"demo_container": ("demo", False)})
+
+    assert registry.get("demo")["status"] == STATUS_STOPPED
+
+# =============================================================================
+# REINICIO
+# =============================================================================
+
+def test_crash_schedules_restart_with_backoff(monkeypatch, registry):
+    timers = []
+
+    class FakeTimer:
+        def __init__(self, delay, function, args):
+            timers.append((delay, args))
+            self.daemon = False
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(watcher_module.threading, "Timer", FakeTimer)
+    logs = []
+    project_watcher = ProjectWatcher(registry, MANAGED_LABEL, PROJECT_LABEL, restart=True, log=logs.append)
+
+    for _ in range(RESTART_MAX_ATTEMPTS + 1):
+        assert project_watcher.handle(event("die", exitCode="1")) is None
+
+    assert [delay for delay, _ in timers] == [restart_delay(n) for n in range(1, RESTART_MAX_ATTEMPTS + 1)]
+    assert timers[0][1] == ("id-demo_container", "demo_container", "demo")
+    assert "no se reinicia más" in logs[-1]
+
+def test_requested_stop_is_not_restarted(monkeypatch, registry):
+    scheduled = []
+    project_watcher = ProjectWatcher(registry, MANAGED_LABEL, PROJECT_LABEL, restart=True, log=lambda message: None)
+    monkeypatch.setattr(project_watcher, "_schedule_restart", lambda *args: scheduled.append(args))
+
+    project_watcher.handle(event("kill"))
+    project_watcher.handle(event("die", exitCode="143"))
+
+    assert scheduled == []
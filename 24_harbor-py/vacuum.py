@@ -0,0 +1,117 @@
+"""
+Compactación de las bases de datos de Harbor.
+
+Las bases de prueba de larga vida acumulan filas muertas y páginas libres
+que el motor no devuelve al sistema de archivos, así que el volumen solo
+crece. Cada motor tiene su propia forma de reescribir los datos compactos:
+
+- Postgres        -> VACUUM FULL ANALYZE
+- MySQL / MariaDB -> OPTIMIZE TABLE en todas las tablas (mysqlcheck --optimize)
+- MongoDB         -> compact en cada colección
+
+Todas bloquean las tablas o colecciones mientras se reescriben: están
+pensadas para bases de prueba, no para servidores con tráfico.
+"""
+
+import time
+import subprocess
+from dataclasses import dataclass
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+# Compactación de MongoDB: compact en cada colección, sumando lo liberado (MongoDB 7+)
+MONGO_COMPACT_SCRIPT = (
+    "let freed = 0;"
+    "db.getCollectionNames().forEach(c => { freed += db.runCommand({compact: c}).bytesFreed || 0; });"
+    "print(`bytes liberados: ${freed}`);"
+)
+
+# Motores con compactación soportada
+VACUUM_ENGINES = ("postgres", "mysql", "mariadb", "mongo")
+
+class VacuumError(Exception):
+    """Error al compactar una base de datos."""
+
+@dataclass
+class VacuumResult:
+    """Resultado de compactar una base de datos."""
+    method: str
+    seconds: float
+    output: str
+
+# =============================================================================
+# COMANDOS POR MOTOR
+# =============================================================================
+
+def build_vacuum_command(record: dict) -> tuple[list[str], str]:
+    """
+    Construye el comando `docker exec` que compacta la base de datos del proyecto.
+
+    Args:
+        record: Registro del proyecto (imagen, contenedor, credenciales)
+
+    Returns:
+        tuple: (argumentos del comando, nombre del método de compactación)
+
+    Raises:
+        VacuumError: Si el motor no tiene compactación soportada
+    """
+    engine = record.get("image", "")
+    container = record["container_name"]
+    database = record.get("database", "")
+    exec_cmd = ["docker", "exec"]
+
+    if engine == "postgres":
+        return exec_cmd + [container, "psql", "-v", "ON_ERROR_STOP=1", "-q",
+                           "-U", record.get("system_user", "postgres"), "-d", database,
+                           "-c", "VACUUM FULL ANALYZE"], "VACUUM FULL"
+
+    if engine in ("mysql", "mariadb"):
+        # Las imágenes recientes de MariaDB ya no incluyen los alias mysql*
+        client = "mariadb-check" if engine == "mariadb" else "mysqlcheck"
+        return exec_cmd + ["-e", f"MYSQL_PWD={record.get('root_password', '')}", container,
+                           client, "-uroot", "--optimize", database], "OPTIMIZE TABLE"
+
+    if engine == "mongo":
+        return exec_cmd + [container, "mongosh", "--quiet",
+                           "-u", "root", "-p", record.get("root_password", ""),
+                           "--authenticationDatabase", "admin", database,
+                           "--eval", MONGO_COMPACT_SCRIPT], "compact"
+
+    if engine == "redis":
+        raise VacuumError("Redis guarda un volcado RDB que ya se escribe compacto; no hay nada que compactar")
+
+    raise VacuumError(f"{engine or 'imagen desconocida'} no tiene compactación soportada")
+
+# =============================================================================
+# EJECUCIÓN
+# =============================================================================
+
+def vacuum_database(record: dict) -> VacuumResult:
+    """
+    Compacta la base de datos de un proyecto dentro de su contenedor.
+
+    Args:
+        record: Registro del proyecto
+
+    Returns:
+        VacuumResult: Método usado, tiempo empleado y salida del cliente
+
+    Raises:
+        VacuumError: Si el motor no está soportado o el cliente devuelve error
+    """
+    command, method = build_vacuum_command(record)
+
+    start = time.monotonic()
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except FileNotFoundError as e:
+        raise VacuumError("Docker no está instalado o no está en PATH") from e
+
+    if result.returncode != 0:
+        stderr = result.stderr.strip()
+        raise VacuumError(stderr.splitlines()[-1] if stderr else f"{method} terminó con código {result.returncode}")
+
+    return VacuumResult(method, time.monotonic() - start, result.stdout.strip())
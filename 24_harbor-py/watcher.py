@@ -0,0 +1,327 @@
+"""
+Vigilancia de los contenedores de Harbor a través de los eventos de Docker.
+
+`harbor watch` mantiene una única conexión abierta a /events, filtrada por
+la etiqueta de Harbor. Cada arranque, parada, caída u OOM se refleja al
+momento en registry.json (estado, last_started, contador de caídas), así
+que `list --json` y el resto de consultas leen un estado al día sin volver
+a lanzar `docker ps`.
+
+Una caída es un `die` con código de salida distinto de 0 que no viene
+precedido de un `kill` (docker stop, compose down...), o cualquier `die`
+tras un `oom`. Con restart=True el vigilante vuelve a arrancar los
+contenedores caídos con espera exponencial, salvo que Docker ya lo haya
+hecho por su política de reinicio.
+"""
+
+import json
+import time
+import threading
+from typing import Optional, Callable
+from datetime import datetime
+from collections import deque
+
+from docker_api import DockerUnavailableError, api_request, api_stream
+from registry import ProjectRegistry, STATUS_RUNNING, STATUS_STOPPED, STATUS_CRASHED, now_iso
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+# Eventos de contenedor que interesan al vigilante
+WATCHED_ACTIONS = ["start", "die", "kill", "oom", "destroy", "health_status"]
+
+# Segundos tras un `kill` en los que un `die` se considera una parada pedida
+KILL_GRACE_SECONDS = 30
+
+# Espera antes de reiniciar: 2s, 4s, 8s... hasta el máximo
+RESTART_BACKOFF_BASE = 2
+RESTART_BACKOFF_MAX = 300
+
+# Caídas seguidas tras las que el vigilante deja de reiniciar
+RESTART_MAX_ATTEMPTS = 6
+
+# Segundos en marcha a partir de los cuales se olvidan las caídas anteriores
+STABLE_SECONDS = 120
+
+# Espera máxima entre reconexiones si se pierde el flujo de eventos
+RECONNECT_MAX_SECONDS = 30
+
+# Eventos recientes recordados para no contar dos veces al reconectar
+SEEN_EVENTS = 512
+
+def restart_delay(streak: int) -> float:
+    """Segundos de espera antes del reinicio número `streak` de una racha de caídas."""
+    return min(RESTART_BACKOFF_BASE * 2 ** max(streak - 1, 0), RESTART_BACKOFF_MAX)
+
+# =============================================================================
+# VIGILANTE
+# =============================================================================
+
+class ProjectWatcher:
+    """
+    Aplica los eventos de Docker al registro de proyectos.
+
+    Uso:
+        watcher = ProjectWatcher(registry, "com.harbor.managed", "com.harbor.project")
+        watcher.reconcile({"demo_container": ("demo", True)})
+        watcher.run()   # bloquea hasta Ctrl+C
+    """
+
+    def __init__(
+        self,
+        registry: ProjectRegistry,
+        managed_label: str,
+        project_label: str,
+        restart: bool = False,
+        log: Callable[[str], None] = print
+    ):
+        self.registry = registry
+        self.managed_label = managed_label
+        self.project_label = project_label
+        self.restart = restart
+        self.log = log
+        self._lock = threading.Lock()
+        # Contenedor -> (proyecto, corriendo)
+        self._containers: dict[str, tuple[str, bool]] = {}
+        self._started_at: dict[str, float] = {}
+        self._killed_at: dict[str, float] = {}
+        self._oom: set[str] = set()
+        self._streaks: dict[str, int] = {}
+        self._seen: deque = deque(maxlen=SEEN_EVENTS)
+
+    # -------------------------------------------------------------------------
+    # Estado
+    # -------------------------------------------------------------------------
+
+    def reconcile(self, containers: dict[str, tuple[str, bool]]):
+        """
+        Parte del estado real antes de escuchar eventos, con una sola escritura.
+
+        Args:
+            containers: Nombre del contenedor -> (proyecto, si está corriendo)
+        """
+        with self._lock:
+            self._containers = dict(containers)
+            now = time.monotonic()
+            self._started_at = {name: now for name, (_, running) in containers.items() if running}
+
+        running_projects = {project for project, running in containers.values() if running}
+        known_projects = {project for project, _ in containers.values()}
+
+        with self.registry.transaction() as projects:
+            stamp = now_iso()
+            for project_name in known_projects:
+                record = projects.get(project_name)
+                if record is None:
+                    continue
+                if project_name in running_projects:
+                    status = STATUS_RUNNING
+                elif record.get("status") == STATUS_CRASHED:
+                    status = STATUS_CRASHED
+                else:
+                    status = STATUS_STOPPED
+                if record.get("status") != status:
+                    record["status"] = status
+                    record["updated_at"] = stamp
+
+    def _project_running(self, project_name: str) -> bool:
+        """Indica si algún contenedor del proyecto sigue corriendo."""
+        return any(running for project, running in self._containers.values() if project == project_name)
+
+    def _update_record(
+        self,
+        project_name: str,
+        container_name: str,
+        fields: dict,
+        container_status: Optional[str] = None,
+        crashed: bool = False
+    ):
+        """
+        Actualiza el proyecto y, en un stack, también el servicio del contenedor.
+
+        Args:
+            project_name: Proyecto dueño del contenedor
+            container_name: Contenedor del evento
+            fields: Campos a guardar en el proyecto
+            container_status: Estado propio del contenedor; en un stack puede
+                              diferir del proyecto si otros servicios siguen en marcha
+            crashed: Si el evento es una caída (incrementa crash_count)
+        """
+        with self.registry.transaction() as projects:
+            record = projects.get(project_name)
+            if record is None:
+                return
+
+            targets = [record]
+            for service in (record.get("services") or {}).values():
+                if service.get("container_name") == container_name:
+                    targets.append(service)
+
+            for target in targets:
+                target.update(fields)
+                if crashed:
+                    target["crash_count"] = target.get("crash_count", 0) + 1
+            for service in targets[1:]:
+                if container_status is not None:
+                    service["status"] = container_status
+            record["updated_at"] = now_iso()
+
+    # -------------------------------------------------------------------------
+    # Eventos
+    # -------------------------------------------------------------------------
+
+    def handle(self, event: dict) -> Optional[str]:
+        """
+        Aplica un evento de contenedor al registro.
+
+        Args:
+            event: Evento tal como lo envía /events
+
+        Returns:
+            str: Descripción del cambio para mostrar, o None si no hubo cambios
+        """
+        key = (event.get("id"), event.get("Action"), event.get("timeNano"))
+        if key in self._seen:
+            return None
+        self._seen.append(key)
+
+        actor = event.get("Actor") or {}
+        attributes = actor.get("Attributes") or {}
+        container_id = actor.get("ID") or event.get("id", "")
+        container = attributes.get("name", container_id[:12])
+        project = attributes.get(self.project_label)
+        action = event.get("Action", "")
+        if not project:
+            return None
+
+        stamp = datetime.fromtimestamp(event.get("time") or time.time()).isoformat(timespec="seconds")
+
+        with self._lock:
+            if action == "start":
+                self._containers[container] = (project, True)
+                self._started_at[container] = time.monotonic()
+                self._killed_at.pop(container, None)
+                self._oom.discard(container)
+                fields = {"status": STATUS_RUNNING, "last_started": stamp}
+                container_status = STATUS_RUNNING
+                message = f"▶️ {project} ({container}) arrancó"
+                crashed = False
+
+            elif action == "kill":
+                self._killed_at[container] = time.monotonic()
+                return None
+
+            elif action == "oom":
+                self._oom.add(container)
+                return f"💥 {project} ({container}) se quedó sin memoria"
+
+            elif action == "die":
+                self._containers[container] = (project, False)
+                exit_code = int(attributes.get("exitCode") or 0)
+                killed_at = self._killed_at.pop(container, None)
+                requested = killed_at is not None and time.monotonic() - killed_at < KILL_GRACE_SECONDS
+                crashed = container in self._oom or (exit_code != 0 and not requested)
+                self._oom.discard(container)
+
+                container_status = STATUS_CRASHED if crashed else STATUS_STOPPED
+                status = STATUS_RUNNING if self._project_running(project) else container_status
+                fields = {"status": status, "last_exit_code": exit_code}
+                if crashed:
+                    fields["last_crash"] = stamp
+                    message = f"[red]💀 {project} ({container}) se cayó con código {exit_code}[/red]"
+                else:
+                    message = f"⏹️ {project} ({container}) se detuvo"
+
+            elif action == "destroy":
+                self._containers.pop(container, None)
+                self._started_at.pop(container, None)
+                self._streaks.pop(container, None)
+                return None
+
+            elif action.startswith("health_status"):
+                health = action.split(":", 1)[-1].strip()
+                fields = {"health": health}
+                container_status = None
+                message = f"🩺 {project} ({container}) {health}"
+                crashed = False
+
+            else:
+                return None
+
+        self._update_record(project, container, fields, container_status, crashed)
+
+        if action == "die" and crashed and self.restart:
+            # La caída se muestra antes que el reinicio que provoca
+            self.log(message)
+            self._schedule_restart(container_id, container, project)
+            return None
+        return message
+
+    # -------------------------------------------------------------------------
+    # Reinicio con espera exponencial
+    # -------------------------------------------------------------------------
+
+    def _schedule_restart(self, container_id: str, container: str, project: str):
+        """Programa el reinicio de un contenedor caído según su racha de caídas."""
+        with self._lock:
+            started_at = self._started_at.get(container)
+            if started_at is not None and time.monotonic() - started_at >= STABLE_SECONDS:
+                self._streaks[container] = 0
+            streak = self._streaks.get(container, 0) + 1
+            self._streaks[container] = streak
+
+        if streak > RESTART_MAX_ATTEMPTS:
+            self.log(f"[red]🛑 {project} ({container}): {RESTART_MAX_ATTEMPTS} caídas seguidas, no se reinicia más[/red]")
+            return
+
+        delay = restart_delay(streak)
+        self.log(f"🔁 {project} ({container}): reinicio {streak}/{RESTART_MAX_ATTEMPTS} en {delay:.0f}s")
+        timer = threading.Timer(delay, self._restart, args=(container_id, container, project))
+        timer.daemon = True
+        timer.start()
+
+    def _restart(self, container_id: str, container: str, project: str):
+        """Arranca el contenedor si Docker no lo ha hecho ya por su política de reinicio."""
+        try:
+            state = (api_request("GET", f"/containers/{container_id}/json") or {}).get("State") or {}
+            if state.get("Running") or state.get("Restarting"):
+                return
+            api_request("POST", f"/containers/{container_id}/start")
+        except DockerUnavailableError as e:
+            self.log(f"[red]❌ {project} ({container}): no se pudo reiniciar: {e}[/red]")
+
+    # -------------------------------------------------------------------------
+    # Flujo de eventos
+    # -------------------------------------------------------------------------
+
+    def run(self, since: Optional[int] = None):
+        """
+        Escucha /events hasta que se interrumpa, reconectando si se pierde el flujo.
+
+        Args:
+            since: Marca de tiempo Unix desde la que pedir eventos (por defecto, ahora)
+        """
+        filters = json.dumps({
+            "type": ["container"],
+            "label": [f"{self.managed_label}=true"],
+            "event": WATCHED_ACTIONS,
+        })
+        since = since or int(time.time())
+        delay = 1
+
+        while True:
+            try:
+                # Sin timeout: puede pasar mucho tiempo sin ningún evento
+                for event in api_stream("GET", "/events", {"since": since, "filters": filters}, timeout=None):
+                    since = event.get("time") or since
+                    delay = 1
+                    message = self.handle(event)
+                    if message:
+                        self.log(message)
+                self.log("[yellow]⚠️ Docker cerró el flujo de eventos, reconectando...[/yellow]")
+            except DockerUnavailableError as e:
+                self.log(f"[yellow]⚠️ {e}; reintentando en {delay}s[/yellow]")
+
+            time.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)